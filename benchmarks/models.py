@@ -0,0 +1,64 @@
+"""
+Benchmark the construction of large Files, validated or trusted
+
+Usage: python benchmarks/models.py [--documents 200] [--fields 50] [--repeat 5]
+"""
+import argparse
+import timeit
+
+from parble import ParbleSDK
+
+
+def field(i: int) -> dict:
+    return dict(
+        page=i % 10,
+        coordinates=[i, i + 1, i + 100, i + 20],
+        text=f"text {i}",
+        value=f"value {i}",
+        confidence=90,
+        automated=True,
+    )
+
+
+def document(i: int, fields: int) -> dict:
+    return dict(
+        automated=True,
+        classification=dict(automated=True, document_type="invoice", confidence=94.5, start_page=i, end_page=i + 1),
+        header_fields={f"field_{j}": field(j) for j in range(fields)},
+        tables={},
+    )
+
+
+def payload(documents: int, fields: int) -> dict:
+    return dict(
+        id="631bafa2b9753d4ce1e210d0",
+        timings=dict(upload="2022-11-19 09:42:51", done="2022-11-19 09:42:59"),
+        filename="Example.pdf",
+        automated=True,
+        number_of_pages=documents,
+        documents=[document(i, fields) for i in range(documents)],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--fields", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sdk = ParbleSDK("https://api.parble.com/v1/", "benchmark")
+    data = payload(args.documents, args.fields)
+    print(f"File with {args.documents} documents of {args.fields} fields")
+
+    results = {}
+    for validate in (True, False):
+        results[validate] = min(
+            timeit.repeat(lambda: sdk.files.create(validate=validate, **data), number=1, repeat=args.repeat)
+        )
+        print(f"{'validated' if validate else 'trusted':>10}: {results[validate] * 1000:8.1f} ms")
+    print(f"{'speed-up':>10}: {results[True] / results[False]:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
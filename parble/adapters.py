@@ -0,0 +1,166 @@
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import List, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool, PoolManager
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """
+    Snapshot of the connection pool usage of a session
+    """
+
+    opened: int  # connections established (new TCP/TLS handshakes)
+    reused: int  # requests served by an already open connection
+    idle: int  # open connections currently waiting in the pools
+
+
+class _PoolCounters:
+    """
+    Thread-safe counters shared by all the pools of an adapter
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+
+    def record(self, reused: bool):
+        with self._lock:
+            if reused:
+                self.reused += 1
+            else:
+                self.opened += 1
+
+
+def _is_open(conn) -> bool:
+    return getattr(conn, "sock", None) is not None
+
+
+class _TrackingPoolMixin:
+    """
+    Connection pool mixin recording connection reuse and recycling idle connections.
+
+    Connections idle for longer than ``keep_alive`` seconds are closed before being handed out,
+    so requests don't fail on sockets the server (or a load balancer) already dropped.
+    """
+
+    counters: Optional[_PoolCounters] = None
+    keep_alive: Optional[float] = None
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout=timeout)
+        if _is_open(conn) and self.keep_alive is not None:
+            released = getattr(conn, "_parble_released", None)
+            if released is not None and time.monotonic() - released > self.keep_alive:
+                conn.close()
+        if self.counters is not None:
+            self.counters.record(_is_open(conn))
+        return conn
+
+    def _put_conn(self, conn):
+        if conn is not None:
+            conn._parble_released = time.monotonic()
+        return super()._put_conn(conn)
+
+    def idle_connections(self) -> int:
+        pool = self.pool
+        if pool is None:
+            return 0
+        with pool.mutex:
+            return sum(1 for conn in pool.queue if conn is not None and _is_open(conn))
+
+
+class TrackingHTTPConnectionPool(_TrackingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class TrackingHTTPSConnectionPool(_TrackingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class TrackingPoolManager(PoolManager):
+    """
+    Pool manager creating tracking pools bound to shared counters
+
+    The pools created are kept in a weak set rather than read from the urllib3 pool container, whose layout is
+    private and differs between urllib3 versions. The pools it evicts are closed, and hold no idle connections.
+    """
+
+    def __init__(self, *args, counters: _PoolCounters, keep_alive: Optional[float] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.counters = counters
+        self.keep_alive = keep_alive
+        self.pool_classes_by_scheme = {"http": TrackingHTTPConnectionPool, "https": TrackingHTTPSConnectionPool}
+        self._tracked_lock = threading.Lock()
+        self._tracked: "weakref.WeakSet[_TrackingPoolMixin]" = weakref.WeakSet()
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        pool.counters = self.counters
+        pool.keep_alive = self.keep_alive
+        with self._tracked_lock:
+            self._tracked.add(pool)
+        return pool
+
+    def tracked_pools(self) -> List[_TrackingPoolMixin]:
+        """
+        Return the tracking pools created by this manager which are still alive
+        """
+        with self._tracked_lock:
+            return list(self._tracked)
+
+
+class ParbleHTTPAdapter(HTTPAdapter):
+    """
+    HTTP Adapter with a tunable connection pool and usage statistics.
+
+    Args:
+        pool_connections: number of host pools to keep
+        pool_maxsize: maximum number of connections kept open per host
+        pool_block: block when no connection is available instead of opening an extra one
+        keep_alive: idle time in seconds after which a pooled connection is recycled, None to keep it forever
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["_keep_alive"]
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: Optional[float] = None,
+        **kwargs,
+    ):
+        self._counters = _PoolCounters()
+        self._keep_alive = keep_alive
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block, **kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = TrackingPoolManager(
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            counters=self._counters,
+            keep_alive=self._keep_alive,
+            **pool_kwargs,
+        )
+
+    def __setstate__(self, state):
+        # HTTPAdapter re-creates its pool manager when unpickled, counters start over
+        self._counters = _PoolCounters()
+        super().__setstate__(state)
+
+    def stats(self) -> PoolStats:
+        """
+        Return the current usage statistics of the adapter pools
+        """
+        idle = sum(p.idle_connections() for p in self.poolmanager.tracked_pools())
+        return PoolStats(opened=self._counters.opened, reused=self._counters.reused, idle=idle)
@@ -0,0 +1,2 @@
+from .client import AsyncParbleAPIClient
+from .sdk import AsyncParbleSDK
@@ -0,0 +1,105 @@
+from parble.aio.session import AsyncBaseSession
+from parble.resources.files import AsyncFilesResource
+from parble.settings import Settings
+from parble.singleflight import AsyncSingleFlight
+
+
+class AsyncParbleAPIClient:
+    """
+    Low level asyncio REST API Client
+    This thin layer exposes the API resources, just like :py:class:`parble.ParbleAPIClient`
+    """
+
+    def __init__(self, url=None, api_key=None, transport=None, **settings):
+        self.settings = Settings(url=url, api_key=api_key, **settings)
+        self._client = AsyncBaseSession(self.settings, transport=transport)
+        self.flights = AsyncSingleFlight.from_settings(self.settings)
+        self.files = AsyncFilesResource(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Close the underlying connections
+        """
+        await self._client.aclose()
+
+    def circuit_stats(self):
+        """
+        Return the state of the circuit breaker of the underlying session, for health checks
+
+        Returns:
+            Circuit state and failure statistics, None when the circuit breaker is disabled
+        """
+        return self._client.circuit_stats()
+
+    def flight_stats(self):
+        """
+        Return the statistics of the coalesced requests
+
+        Returns:
+            Calls made and calls coalesced, None when request coalescing is disabled
+        """
+        return self.flights.stats() if self.flights is not None else None
+
+    def upload_slot(self):
+        """
+        Async context manager limiting the number of concurrent uploads to ``max_concurrent_uploads``
+        """
+        return self._client.upload_slot()
+
+    async def get(self, url, **kwargs):
+        """
+        Send a GET request
+
+        Args:
+            url: absolute or relative resource uri
+            **kwargs:
+
+        Returns:
+            API Response
+        """
+        return await self._client.get(url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        """
+        Send a POST request
+
+        Args:
+            url: absolute or relative resource uri
+            **kwargs:
+
+        Returns:
+            API Response
+        """
+        return await self._client.post(url, **kwargs)
+
+    async def patch(self, url, **kwargs):
+        """
+        Send a PATCH request
+
+        Args:
+            url: absolute or relative resource uri
+            **kwargs:
+
+        Returns:
+            API Response
+        """
+        return await self._client.patch(url, **kwargs)
+
+    async def delete(self, url, **kwargs):
+        """
+        Send a DELETE request
+
+        Args:
+            url: absolute or relative resource uri
+            **kwargs:
+
+        Returns:
+            API Response
+        """
+        return await self._client.delete(url, **kwargs)
@@ -0,0 +1,191 @@
+import asyncio
+import typing as t
+from io import BytesIO
+from pathlib import Path
+
+from pydantic import constr
+
+from parble.aio.client import AsyncParbleAPIClient
+from parble.dedup import content_hash
+from parble.exceptions import NotFoundError
+from parble.models import File
+from parble.sdk import BaseFiles, guess_content_type
+
+
+class AsyncParbleSDK:
+    """
+    High Level asyncio SDK Class
+
+    This class exposes the primitives of :py:class:`parble.ParbleSDK` as coroutines,
+    built on top of the :py:class:`AsyncParbleAPIClient`.
+
+    Files returned by this SDK are bound to it: their PDF content must be fetched with
+    ``await sdk.files.get_pdf(file.id)`` rather than the blocking ``File.pdf`` property.
+    """
+
+    def __init__(self, url=None, api_key=None, transport=None, validate: t.Optional[bool] = None, **settings):
+        if validate is not None:
+            settings["validate_models"] = validate
+        self.client = AsyncParbleAPIClient(url=url, api_key=api_key, transport=transport, **settings)
+        self.files = self.Files(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Close the underlying connections
+        """
+        if self.files.cache is not None:
+            self.files.cache.close()
+        if self.files.uploads is not None:
+            self.files.uploads.close()
+        await self.client.aclose()
+
+    class Files(BaseFiles):
+        """
+        Files helper to upload, get processed elements, etc
+        """
+
+        async def _upload_key(self, fp: t.BinaryIO, inbox_id: t.Optional[str]) -> t.Optional[t.Tuple[str, str]]:
+            """
+            Hash the content to upload in the default executor, not to block the event loop
+            """
+            if not self._indexes(fp):
+                return None
+            digest = await asyncio.get_running_loop().run_in_executor(None, content_hash, fp)
+            return self._index_key(inbox_id, digest)
+
+        async def _reuse(self, key: t.Optional[t.Tuple[str, str]], validate: t.Optional[bool]) -> t.Optional[File]:
+            """
+            Return the File a content was already uploaded as, None when it is new or the File was deleted
+            """
+            previous = self._previous_upload(key)
+            if previous is None:
+                return None
+            try:
+                file = await self.get(previous.file_id, validate=validate)
+            except NotFoundError:
+                self.uploads.forget(previous.file_id)
+                return None
+            return self._reused(key, previous, file)
+
+        async def _post(
+            self,
+            file: t.BinaryIO,
+            file_name: str,
+            file_type: str,
+            inbox_id: t.Optional[str],
+            validate: t.Optional[bool],
+        ) -> File:
+            key = await self._upload_key(file, inbox_id)
+            existing = await self._reuse(key, validate)
+            if existing is not None:
+                return existing
+            res = await self._sdk.client.files.post(file, file_name, inbox_id=inbox_id, content_type=file_type)
+            self._record_upload(key, res)
+            self._store(res)
+            return self.create(validate=validate, **res)
+
+        async def post(
+            self,
+            path: t.Union[str, Path],
+            inbox_id: constr(regex=r"^[a-f0-9]{24}$") = None,
+            validate: t.Optional[bool] = None,
+        ) -> File:
+            """
+            Upload and process the file at the given local path
+
+            Args:
+                path: local path of the file to upload
+                inbox_id: optional uuid of the inbox to upload to
+                validate: validate the response, defaults to the ``validate_models`` setting
+
+            Returns:
+                Processed File response
+            """
+            if not isinstance(path, Path):
+                path = Path(path)
+
+            with open(path.absolute(), "rb") as f:
+                return await self._post(f, path.name, guess_content_type(path), inbox_id, validate)
+
+        async def post_file(
+            self,
+            file: t.BinaryIO,
+            file_name: str,
+            file_type="application/octet-stream",
+            inbox_id: constr(regex=r"^[a-f0-9]{24}$") = None,
+            validate: t.Optional[bool] = None,
+        ) -> File:
+            """
+            Upload and process the given file-like
+
+            Args:
+                file: File-like object
+                file_name: Filename to be used
+                inbox_id: optional uuid of the inbox to upload to
+                file_type: Content Type of the file
+                validate: validate the response, defaults to the ``validate_models`` setting
+
+            Returns:
+                Processed File data
+            """
+            return await self._post(file, file_name, file_type, inbox_id, validate)
+
+        async def get(self, file_id: str, validate: t.Optional[bool] = None, lazy: t.Optional[bool] = None) -> File:
+            """
+            Retrieve the given File payload
+
+            With the ``coalesce_requests`` setting, concurrent calls for the same File share a single request
+            and get the same File.
+
+            Args:
+                file_id: File ID to get
+                validate: validate the response, defaults to the ``validate_models`` setting
+                lazy: build the documents only when they are accessed, defaults to the ``lazy_documents`` setting
+
+            Returns:
+                Matching File
+            """
+            flights = self._sdk.client.flights
+            if flights is None:
+                return await self._get(file_id, validate, lazy)
+            return await flights.do(("file", file_id, validate, lazy), lambda: self._get(file_id, validate, lazy))
+
+        async def _get(self, file_id: str, validate: t.Optional[bool], lazy: t.Optional[bool]) -> File:
+            res = self._cached(file_id)
+            if res is None:
+                if self._sdk.client.flights is not None:
+                    # within the flight of get: the request isn't coalesced a second time
+                    res = await self._sdk.client.files.get(file_id, coalesce=False)
+                else:
+                    res = await self._sdk.client.files.get(file_id)
+                self._store(res)
+            return self.create(validate=validate, lazy=lazy, **res)
+
+        async def get_pdf(self, file_id: str) -> t.BinaryIO:
+            """
+            Retrieve the given File PDF content
+
+            Args:
+                file_id: File ID to get
+
+            Returns:
+                File-like PDF content
+            """
+            res = await self._sdk.client.files.get(file_id, content_type="application/pdf")
+            return BytesIO(res)
+
+        async def delete(self, file_id: str) -> None:
+            """
+            Delete the given File
+
+            Args:
+                file_id: File ID to delete
+            """
+            await self._sdk.client.files.delete(file_id)
+            self._forget(file_id)
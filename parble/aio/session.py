@@ -0,0 +1,153 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+from urllib.parse import urljoin
+
+from parble._version import __version__
+from parble.circuitbreaker import CircuitBreaker, CircuitStats
+from parble.exceptions import APICallError, CallTimeoutError, handlers
+from parble.ratelimit import rate_limiter_from_settings
+from parble.retry import RetryPolicy
+from parble.settings import Settings
+
+try:
+    import httpx
+except ImportError as e:  # no cov
+    raise ImportError("The asyncio client requires httpx, install it with: pip install 'parble[async]'") from e
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRetryPolicy(RetryPolicy):
+    """
+    Retry policy classifying httpx transport errors
+    """
+
+    def is_retryable_error(self, method: str, exc: BaseException) -> bool:
+        if method.upper() in self.idempotent_methods:
+            return isinstance(exc, httpx.TransportError)
+        return isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout))
+
+
+class AsyncBaseSession(httpx.AsyncClient):
+    """
+    Base asyncio HTTP session with shared behavior for the API Calls.
+
+    Mirrors :py:class:`parble.session.BaseSession`: base url support, custom headers, connection pooling,
+    retries, rate limiting and common error handling.
+    """
+
+    def __init__(self, settings: Settings, **kwargs):
+        self._settings = settings
+        kwargs.setdefault(
+            "limits",
+            httpx.Limits(
+                max_connections=settings.pool_maxsize if settings.pool_block else None,
+                max_keepalive_connections=settings.pool_maxsize,
+                keepalive_expiry=settings.keep_alive_timeout,
+            ),
+        )
+        super().__init__(timeout=settings.default_timeout, follow_redirects=True, **kwargs)
+        self.initialize()
+
+    def initialize(self):
+        """
+        Initialize the session by setting the headers to use
+        """
+        self.headers["X-API-Key"] = self._settings.api_key.get_secret_value()
+        self.headers["Accept"] = "application/json"
+        self.headers["User-Agent"] = f"parble-python/{__version__}"
+
+        self.retry_policy = AsyncRetryPolicy.from_settings(self._settings)
+        self.rate_limiter = rate_limiter_from_settings(self._settings)
+        self.circuit_breaker = CircuitBreaker.from_settings(self._settings)
+        self._upload_slots = None
+
+    def circuit_stats(self) -> Optional[CircuitStats]:
+        """
+        Return the state of the circuit breaker, None when it is disabled
+        """
+        if self.circuit_breaker is None:
+            return None
+        return self.circuit_breaker.stats()
+
+    @asynccontextmanager
+    async def upload_slot(self):
+        """
+        Async context manager holding one of the ``max_concurrent_uploads`` slots of this session
+        """
+        if not self._settings.max_concurrent_uploads:
+            yield
+            return
+        if self._upload_slots is None:
+            # created lazily to be bound to the running event loop
+            self._upload_slots = asyncio.Semaphore(self._settings.max_concurrent_uploads)
+        async with self._upload_slots:
+            yield
+
+    def build_url(self, url: str) -> str:
+        """
+        Join the base URL with the provided URI
+
+        Args:
+            url: resource part to add to the base url
+
+        Returns:
+            Full concatenated URL
+        """
+        return urljoin(str(self._settings.url), url)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            resp = await super().request(method, self.build_url(url), **kwargs)
+        except httpx.TimeoutException as exc:
+            if breaker is not None:
+                breaker.record_failure(timeout=True)
+            raise CallTimeoutError from exc
+        except httpx.HTTPError as exc:
+            if breaker is not None:
+                breaker.record_failure()
+            raise APICallError from exc
+        if breaker is not None:
+            if resp.is_server_error:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        if resp.is_error:
+            self.parse_error(resp)
+        return resp
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        """
+        Send the request, retrying transient failures according to the retry policy
+        """
+        state = self.retry_policy.start()
+        while True:
+            if self.rate_limiter is not None:
+                # the bucket only reserves the token, the wait happens on the event loop
+                await asyncio.sleep(self.rate_limiter.reserve())
+            try:
+                resp = await super().send(request, **kwargs)
+            except httpx.TransportError as exc:
+                delay = state.next_delay(request.method, error=exc)
+                if delay is None:
+                    raise
+                logger.debug("%s %s failed (%r), retrying in %.2fs", request.method, request.url, exc, delay)
+            else:
+                delay = state.next_delay(request.method, response=resp)
+                if delay is None:
+                    return resp
+                logger.debug(
+                    "%s %s returned %s, retrying in %.2fs", request.method, request.url, resp.status_code, delay
+                )
+                await resp.aclose()
+
+            await asyncio.sleep(delay)
+
+    def parse_error(self, resp: httpx.Response):
+        exc = handlers.get(resp.status_code, APICallError)
+        raise exc(f"{resp.status_code} Error: {resp.reason_phrase} for url: {resp.url}")
@@ -0,0 +1,202 @@
+"""
+Vectorized statistics over many Files, for QA reports
+
+:py:class:`CorpusStats` accumulates the statistics of batches of Files with NumPy kernels over the columns of
+:py:mod:`parble.export`. Accumulators are mergeable: shards computed in parallel workers (they are picklable) can be
+combined into the statistics of the whole corpus.
+
+Requires NumPy: ``pip install 'parble[numpy]'``.
+"""
+import typing as t
+
+from parble.export import _numpy, to_columns
+from parble.models import File
+
+np = _numpy()
+
+
+def _add_padded(a: "np.ndarray", b: "np.ndarray") -> "np.ndarray":
+    """
+    Sum two 1D arrays of possibly different lengths
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    result = a.copy()
+    result[: len(b)] += b
+    return result
+
+
+class CorpusStats:
+    """
+    Mergeable accumulator of statistics over Files
+
+    - automation rate and mean classification confidence per document type
+    - histogram of the field confidences per field name, with ``bins`` bins between 0 and 100
+    - field density per page: average number of fields on each page index (0-based) of the files
+
+    Args:
+        bins: number of bins of the confidence histograms
+    """
+
+    def __init__(self, bins: int = 10):
+        self.bins = bins
+        self.files = 0
+        # per document type: documents, automated documents, sum of the classification confidences
+        self._documents: t.Dict[str, "np.ndarray"] = {}
+        self._histograms: t.Dict[str, "np.ndarray"] = {}
+        self._page_fields = np.zeros(0, dtype=np.int64)
+        self._page_files = np.zeros(0, dtype=np.int64)
+
+    @property
+    def bin_edges(self) -> "np.ndarray":
+        """
+        Edges of the confidence histograms bins
+        """
+        return np.linspace(0, 100, self.bins + 1)
+
+    @property
+    def documents(self) -> int:
+        """
+        Number of documents accumulated
+        """
+        return int(sum(stats[0] for stats in self._documents.values()))
+
+    @property
+    def fields(self) -> int:
+        """
+        Number of fields accumulated
+        """
+        return int(self._page_fields.sum())
+
+    def add(self, files: t.Iterable[File]) -> "CorpusStats":
+        """
+        Accumulate the statistics of a batch of Files
+
+        Args:
+            files: Files to accumulate, consumed once
+
+        Returns:
+            This accumulator
+        """
+        files = list(files)
+        self.files += len(files)
+
+        pages = np.array([file.number_of_pages for file in files], dtype=np.int64)
+        if len(pages):
+            # number of files having each page index: files with more pages than the index
+            per_count = np.bincount(pages)
+            self._page_files = _add_padded(self._page_files, len(pages) - np.cumsum(per_count)[:-1])
+
+        documents = to_columns(files, level="documents")
+        self._add_documents(
+            np.array(documents["document_type"], dtype=object),
+            np.array(documents["automated"], dtype=bool),
+            np.array(documents["confidence"], dtype=np.float64),
+        )
+        fields = to_columns(files, level="fields")
+        self._add_fields(
+            np.array(fields["name"], dtype=object),
+            np.array(fields["confidence"], dtype=np.float64),
+            np.array(fields["page"], dtype=np.int64),
+        )
+        return self
+
+    def _add_documents(self, types: "np.ndarray", automated: "np.ndarray", confidences: "np.ndarray"):
+        if not len(types):
+            return
+        names, inverse = np.unique(types, return_inverse=True)
+        size = len(names)
+        stats = np.stack(
+            [
+                np.bincount(inverse, minlength=size),
+                np.bincount(inverse, weights=automated, minlength=size),
+                np.bincount(inverse, weights=confidences, minlength=size),
+            ],
+            axis=1,
+        )
+        for name, row in zip(names, stats):
+            current = self._documents.get(name)
+            self._documents[name] = row if current is None else current + row
+
+    def _add_fields(self, names: "np.ndarray", confidences: "np.ndarray", pages: "np.ndarray"):
+        if not len(names):
+            return
+        unique, inverse = np.unique(names, return_inverse=True)
+        bins = np.clip(np.searchsorted(self.bin_edges, confidences, side="right") - 1, 0, self.bins - 1)
+        histograms = np.bincount(inverse * self.bins + bins, minlength=len(unique) * self.bins).reshape(-1, self.bins)
+        for name, histogram in zip(unique, histograms):
+            current = self._histograms.get(name)
+            self._histograms[name] = histogram if current is None else current + histogram
+        self._page_fields = _add_padded(self._page_fields, np.bincount(np.clip(pages, 0, None)))
+
+    def merge(self, other: "CorpusStats") -> "CorpusStats":
+        """
+        Accumulate the statistics of another accumulator, e.g. computed on another shard
+
+        Args:
+            other: accumulator with the same number of bins
+
+        Returns:
+            This accumulator
+        """
+        if other.bins != self.bins:
+            raise ValueError(f"Can't merge statistics with {other.bins} bins into statistics with {self.bins} bins")
+        self.files += other.files
+        for name, stats in other._documents.items():
+            current = self._documents.get(name)
+            self._documents[name] = stats.copy() if current is None else current + stats
+        for name, histogram in other._histograms.items():
+            current = self._histograms.get(name)
+            self._histograms[name] = histogram.copy() if current is None else current + histogram
+        self._page_fields = _add_padded(self._page_fields, other._page_fields)
+        self._page_files = _add_padded(self._page_files, other._page_files)
+        return self
+
+    def __add__(self, other: "CorpusStats") -> "CorpusStats":
+        return CorpusStats(self.bins).merge(self).merge(other)
+
+    def __iadd__(self, other: "CorpusStats") -> "CorpusStats":
+        return self.merge(other)
+
+    def automation_rates(self) -> t.Dict[str, float]:
+        """
+        Share of automated documents per document type
+        """
+        return {name: float(stats[1] / stats[0]) for name, stats in sorted(self._documents.items())}
+
+    def document_confidence(self) -> t.Dict[str, float]:
+        """
+        Mean classification confidence per document type
+        """
+        return {name: float(stats[2] / stats[0]) for name, stats in sorted(self._documents.items())}
+
+    def confidence_histograms(self) -> t.Dict[str, "np.ndarray"]:
+        """
+        Histogram of the field confidences per field name, over :py:attr:`bin_edges`
+        """
+        return {name: histogram.copy() for name, histogram in sorted(self._histograms.items())}
+
+    def field_density(self) -> "np.ndarray":
+        """
+        Average number of fields on each page index of the files
+        """
+        size = max(len(self._page_fields), len(self._page_files))
+        fields = np.zeros(size)
+        fields[: len(self._page_fields)] = self._page_fields
+        files = np.zeros(size)
+        files[: len(self._page_files)] = self._page_files
+        return np.divide(fields, files, out=np.zeros(size), where=files > 0)
+
+
+def corpus_stats(files: t.Iterable[File], bins: int = 10) -> CorpusStats:
+    """
+    Compute the statistics of Files
+
+    Args:
+        files: Files to analyze
+        bins: number of bins of the confidence histograms
+
+    Returns:
+        Accumulated statistics, which can be merged with other shards
+    """
+    return CorpusStats(bins).add(files)
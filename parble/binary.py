@@ -0,0 +1,357 @@
+"""
+Compact binary encoding of :py:class:`parble.models.File`
+
+A record is made of a header (magic bytes and format version), a table of the distinct strings of the File and the
+File itself, where every string is written as its index in the table: field names, document types and repeated values
+are stored once. Integers are written as variable length integers, so small values such as pages and coordinates take
+one or two bytes.
+
+A container is a stream of length prefixed records, to store many Files in one blob and read them back one by one.
+"""
+import struct
+import typing as t
+from datetime import datetime, timedelta, timezone
+
+from parble.models import File
+
+if t.TYPE_CHECKING:
+    from parble.sdk import ParbleSDK
+
+MAGIC = b"PRB"
+CONTAINER_MAGIC = b"PRBC"
+VERSION = 1
+
+_DOUBLE = struct.Struct("<d")
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# tags of the generic values, used for the free-form tables
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _DICT = range(8)
+
+# kinds of datetimes
+_NO_DATETIME, _NAIVE, _AWARE = range(3)
+
+
+class _Writer:
+    def __init__(self):
+        self.buf = bytearray()
+        self.strings: t.Dict[str, int] = {}
+
+    def uint(self, value: int):
+        while value > 0x7F:
+            self.buf.append((value & 0x7F) | 0x80)
+            value >>= 7
+        self.buf.append(value)
+
+    def int(self, value: int):
+        # zigzag encoding keeps small negative values small
+        self.uint(value * 2 if value >= 0 else -value * 2 - 1)
+
+    def bool(self, value: bool):
+        self.buf.append(1 if value else 0)
+
+    def float(self, value: float):
+        self.buf += _DOUBLE.pack(value)
+
+    def str(self, value: str):
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        self.uint(index)
+
+    def datetime(self, value: t.Optional[datetime]):
+        if value is None:
+            self.buf.append(_NO_DATETIME)
+            return
+        offset = value.utcoffset()
+        self.buf.append(_NAIVE if offset is None else _AWARE)
+        self.int((value.replace(tzinfo=None) - _EPOCH) // _MICROSECOND)
+        if offset is not None:
+            self.int(offset // _MICROSECOND)
+
+    def value(self, value: t.Any):
+        if value is None:
+            self.buf.append(_NONE)
+        elif value is True or value is False:
+            self.buf.append(_TRUE if value else _FALSE)
+        elif isinstance(value, int):
+            self.buf.append(_INT)
+            self.int(value)
+        elif isinstance(value, float):
+            self.buf.append(_FLOAT)
+            self.float(value)
+        elif isinstance(value, str):
+            self.buf.append(_STR)
+            self.str(value)
+        elif isinstance(value, (list, tuple)):
+            self.buf.append(_LIST)
+            self.uint(len(value))
+            for item in value:
+                self.value(item)
+        elif isinstance(value, dict):
+            self.buf.append(_DICT)
+            self.uint(len(value))
+            for key, item in value.items():
+                self.str(key)
+                self.value(item)
+        else:
+            raise TypeError(f"Object of type {type(value).__name__} can't be encoded")
+
+    def file(self, file: File):
+        self.str(file.id)
+        self.str(file.filename)
+        self.bool(file.automated)
+        self.uint(file.number_of_pages)
+        self.datetime(file.timings.upload)
+        self.datetime(file.timings.done)
+        self.uint(len(file.documents))
+        for doc in file.documents:
+            classification = doc.classification
+            self.bool(doc.automated)
+            self.bool(classification.automated)
+            self.str(classification.document_type)
+            self.float(classification.confidence)
+            self.int(classification.start_page)
+            self.int(classification.end_page)
+            self.uint(len(doc.header_fields))
+            for name, field in doc.header_fields.items():
+                self.str(name)
+                self.int(field.page)
+                self.uint(len(field.coordinates))
+                for coordinate in field.coordinates:
+                    self.int(int(coordinate))
+                self.str(field.text)
+                self.str(field.value)
+                self.int(int(field.confidence))
+                self.bool(field.automated)
+            self.value(doc.tables)
+
+    def record(self) -> bytes:
+        header = _Writer()
+        header.buf += MAGIC
+        header.buf.append(VERSION)
+        header.uint(len(self.strings))
+        for string in self.strings:
+            encoded = string.encode()
+            header.uint(len(encoded))
+            header.buf += encoded
+        return bytes(header.buf + self.buf)
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+        self.strings: t.List[str] = []
+
+    def uint(self) -> int:
+        data = self.data
+        result = shift = 0
+        while True:
+            byte = data[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def int(self) -> int:
+        value = self.uint()
+        return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+    def bool(self) -> bool:
+        self.pos += 1
+        return self.data[self.pos - 1] == 1
+
+    def float(self) -> float:
+        (value,) = _DOUBLE.unpack_from(self.data, self.pos)
+        self.pos += _DOUBLE.size
+        return value
+
+    def str(self) -> str:
+        return self.strings[self.uint()]
+
+    def datetime(self) -> t.Optional[datetime]:
+        kind = self.data[self.pos]
+        self.pos += 1
+        if kind == _NO_DATETIME:
+            return None
+        value = _EPOCH + self.int() * _MICROSECOND
+        if kind == _AWARE:
+            value = value.replace(tzinfo=timezone(self.int() * _MICROSECOND))
+        return value
+
+    def value(self) -> t.Any:
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == _NONE:
+            return None
+        if tag in (_FALSE, _TRUE):
+            return tag == _TRUE
+        if tag == _INT:
+            return self.int()
+        if tag == _FLOAT:
+            return self.float()
+        if tag == _STR:
+            return self.str()
+        if tag == _LIST:
+            return [self.value() for _ in range(self.uint())]
+        if tag == _DICT:
+            return {self.str(): self.value() for _ in range(self.uint())}
+        raise ValueError(f"Unknown value tag {tag}")
+
+    def header(self):
+        if len(self.data) < len(MAGIC) + 1 or self.data[: len(MAGIC)] != MAGIC:
+            raise ValueError("Not a Parble binary record")
+        version = self.data[len(MAGIC)]
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary format version {version}")
+        self.pos = len(MAGIC) + 1
+        for _ in range(self.uint()):
+            size = self.uint()
+            self.strings.append(bytes(self.data[self.pos : self.pos + size]).decode())
+            self.pos += size
+
+    def file(self) -> t.Dict[str, t.Any]:
+        attrs = {
+            "id": self.str(),
+            "filename": self.str(),
+            "automated": self.bool(),
+            "number_of_pages": self.uint(),
+            "timings": {"upload": self.datetime(), "done": self.datetime()},
+        }
+        documents = []
+        for _ in range(self.uint()):
+            doc = {
+                "automated": self.bool(),
+                "classification": {
+                    "automated": self.bool(),
+                    "document_type": self.str(),
+                    "confidence": self.float(),
+                    "start_page": self.int(),
+                    "end_page": self.int(),
+                },
+            }
+            fields = {}
+            for _ in range(self.uint()):
+                name = self.str()
+                fields[name] = {
+                    "page": self.int(),
+                    "coordinates": [self.int() for _ in range(self.uint())],
+                    "text": self.str(),
+                    "value": self.str(),
+                    "confidence": self.int(),
+                    "automated": self.bool(),
+                }
+            doc["header_fields"] = fields
+            doc["tables"] = self.value()
+            documents.append(doc)
+        attrs["documents"] = documents
+        return attrs
+
+
+def encode_file(file: File) -> bytes:
+    """
+    Encode a File to a compact binary record
+
+    Args:
+        file: File to encode
+
+    Returns:
+        Binary record
+    """
+    writer = _Writer()
+    writer.file(file)
+    return writer.record()
+
+
+def decode_file(data: bytes, sdk: t.Optional["ParbleSDK"] = None) -> File:
+    """
+    Decode a binary record written by :py:func:`encode_file`, binding the File to sdk
+
+    Args:
+        data: binary record
+        sdk: live SDK instance the File is bound to
+
+    Returns:
+        File object
+
+    Raises:
+        ValueError: when data is not a record of a supported format version, or is truncated
+    """
+    reader = _Reader(data)
+    try:
+        reader.header()
+        attrs = reader.file()
+    except (IndexError, struct.error) as exc:
+        raise ValueError("Truncated Parble binary record") from exc
+    if reader.pos != len(data):
+        raise ValueError("Truncated Parble binary record")
+    return File.construct_trusted(attrs, sdk=sdk)
+
+
+def dump_records(files: t.Iterable[File], fp: t.BinaryIO) -> int:
+    """
+    Write Files to a binary file-like as a container of length prefixed records
+
+    Args:
+        files: Files to write, consumed one by one
+        fp: binary file-like to write to
+
+    Returns:
+        Number of Files written
+    """
+    fp.write(CONTAINER_MAGIC)
+    fp.write(bytes([VERSION]))
+    count = 0
+    for file in files:
+        record = encode_file(file)
+        size = _Writer()
+        size.uint(len(record))
+        fp.write(size.buf)
+        fp.write(record)
+        count += 1
+    return count
+
+
+def _read_size(fp: t.BinaryIO) -> t.Optional[int]:
+    result = shift = 0
+    while True:
+        byte = fp.read(1)
+        if not byte:
+            if shift:
+                raise ValueError("Truncated container")
+            return None
+        result |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return result
+        shift += 7
+
+
+def load_records(fp: t.BinaryIO, sdk: t.Optional["ParbleSDK"] = None) -> t.Iterator[File]:
+    """
+    Read the Files of a container written by :py:func:`dump_records` one by one
+
+    Args:
+        fp: binary file-like to read from
+        sdk: live SDK instance the Files are bound to
+
+    Yields:
+        File objects
+
+    Raises:
+        ValueError: when fp is not a container of a supported format version
+    """
+    header = fp.read(len(CONTAINER_MAGIC) + 1)
+    if header[:-1] != CONTAINER_MAGIC:
+        raise ValueError("Not a Parble binary container")
+    if header[-1] != VERSION:
+        raise ValueError(f"Unsupported binary format version {header[-1]}")
+    while True:
+        size = _read_size(fp)
+        if size is None:
+            return
+        record = fp.read(size)
+        if len(record) != size:
+            raise ValueError("Truncated container")
+        yield decode_file(record, sdk=sdk)
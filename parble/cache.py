@@ -0,0 +1,194 @@
+import sqlite3
+import threading
+import time
+import typing as t
+from dataclasses import dataclass
+from pathlib import Path
+
+from parble.serialization import dumps, loads
+from parble.settings import Settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    namespace TEXT NOT NULL,
+    file_id TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (namespace, file_id)
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    Snapshot of a result cache
+    """
+
+    hits: int  # lookups answered by the cache, in this process
+    misses: int  # lookups not found or expired, in this process
+    stores: int
+    evictions: int
+    entries: int  # entries in the cache, across processes
+    size: int  # bytes of payload in the cache, across processes
+
+
+class ResultCache:
+    """
+    Persistent cache of the completed File payloads, in a SQLite database
+
+    The results of a File never change once it is processed: they are cached per tenant URL and File ID, so fetching
+    the same File again doesn't reach the API nor download its payload. Files still processing are never cached.
+
+    The least recently used entries are evicted when the payloads exceed ``max_size`` bytes, and entries older than
+    ``max_age`` seconds are expired. The database can be shared by several threads and processes.
+
+    Args:
+        path: path of the SQLite database, created if needed
+        max_size: maximum total size of the cached payloads in bytes, unbounded when None
+        max_age: seconds after which an entry expires, never when None
+        timeout: seconds to wait for a lock held by another process
+    """
+
+    def __init__(
+        self,
+        path: t.Union[str, Path],
+        max_size: t.Optional[int] = None,
+        max_age: t.Optional[float] = None,
+        timeout: float = 30.0,
+    ):
+        self.path = Path(path).expanduser()
+        self.max_size = max_size
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._stores = self._evictions = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=timeout, isolation_level=None, check_same_thread=False)
+        with self._lock:
+            # WAL lets readers of other processes go on while an entry is written
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> t.Optional["ResultCache"]:
+        """
+        Build the result cache configured in the settings, None when it is disabled
+        """
+        if settings.result_cache is None:
+            return None
+        return cls(
+            settings.result_cache, max_size=settings.result_cache_max_size, max_age=settings.result_cache_max_age
+        )
+
+    @staticmethod
+    def _now() -> float:
+        return time.time()
+
+    def get(self, namespace: str, file_id: str) -> t.Optional[t.Dict[str, t.Any]]:
+        """
+        Return the cached payload of a File, None when it isn't cached or expired
+
+        Args:
+            namespace: tenant of the File, e.g. its API URL
+            file_id: ID of the File
+        """
+        now = self._now()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload, created FROM results WHERE namespace = ? AND file_id = ?", (namespace, file_id)
+            ).fetchone()
+            if row is not None and self.max_age is not None and now - row[1] > self.max_age:
+                self._db.execute("DELETE FROM results WHERE namespace = ? AND file_id = ?", (namespace, file_id))
+                self._evictions += 1
+                row = None
+            if row is None:
+                self._misses += 1
+                return None
+            self._db.execute(
+                "UPDATE results SET accessed = ? WHERE namespace = ? AND file_id = ?", (now, namespace, file_id)
+            )
+            self._hits += 1
+        return loads(row[0])
+
+    def put(self, namespace: str, file_id: str, payload: t.Dict[str, t.Any]) -> bool:
+        """
+        Cache the payload of a File if it is processed
+
+        Args:
+            namespace: tenant of the File, e.g. its API URL
+            file_id: ID of the File
+            payload: attributes payload from the API
+
+        Returns:
+            Whether the payload was cached
+        """
+        if not (payload.get("timings") or {}).get("done"):
+            return False
+        data = dumps(payload)
+        if self.max_size is not None and len(data) > self.max_size:
+            return False
+        now = self._now()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                    (namespace, file_id, data, len(data), now, now),
+                )
+                self._evict(now)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._stores += 1
+        return True
+
+    def _evict(self, now: float):
+        if self.max_age is not None:
+            self._evictions += self._db.execute("DELETE FROM results WHERE created < ?", (now - self.max_age,)).rowcount
+        if self.max_size is None:
+            return
+        (size,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+        if size <= self.max_size:
+            return
+        evicted = []
+        for rowid, entry_size in self._db.execute("SELECT rowid, size FROM results ORDER BY accessed"):
+            evicted.append((rowid,))
+            size -= entry_size
+            if size <= self.max_size:
+                break
+        self._db.executemany("DELETE FROM results WHERE rowid = ?", evicted)
+        self._evictions += len(evicted)
+
+    def delete(self, namespace: str, file_id: str):
+        """
+        Remove a File from the cache, e.g. once it is deleted from the API
+        """
+        with self._lock:
+            self._db.execute("DELETE FROM results WHERE namespace = ? AND file_id = ?", (namespace, file_id))
+
+    def clear(self):
+        """
+        Remove every entry of the cache
+        """
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                stores=self._stores,
+                evictions=self._evictions,
+                entries=entries,
+                size=size,
+            )
+
+    def close(self):
+        with self._lock:
+            self._db.close()
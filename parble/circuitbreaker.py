@@ -0,0 +1,176 @@
+import enum
+import threading
+import time
+import typing as t
+from collections import deque
+from dataclasses import dataclass
+
+from parble.exceptions import CircuitOpenError
+from parble.settings import Settings
+
+
+class CircuitState(str, enum.Enum):
+    CLOSED = "closed"  # calls go through
+    OPEN = "open"  # calls fail fast
+    HALF_OPEN = "half_open"  # trial calls probe whether the API recovered
+
+
+@dataclass(frozen=True)
+class CircuitStats:
+    """
+    Snapshot of a circuit breaker, for health checks
+    """
+
+    state: CircuitState
+    calls: int  # calls recorded in the sliding window
+    failure_rate: float  # rate of failed calls in the sliding window
+    consecutive_timeouts: int
+    retry_in: t.Optional[float]  # seconds before the next trial call when open
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker around the API calls
+
+    The circuit opens when, over the last ``window`` seconds, at least ``min_calls`` calls were made and
+    ``failure_rate`` of them failed, or when ``consecutive_timeouts`` calls in a row timed out.
+    While open, calls fail immediately with :py:class:`parble.exceptions.CircuitOpenError`.
+    After ``reset_timeout`` seconds the circuit is half-open: a single trial call goes through,
+    closing the circuit if it succeeds or opening it again if it fails.
+
+    Failures are timeouts, connection errors and 5xx responses. Other responses, including client errors,
+    prove the API is responsive and count as successes.
+
+    Args:
+        failure_rate: rate of failed calls opening the circuit
+        min_calls: minimum number of calls in the window before the failure rate is considered
+        window: duration of the sliding window in seconds
+        consecutive_timeouts: number of timeouts in a row opening the circuit
+        reset_timeout: seconds to wait before probing the API again
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_calls: int = 10,
+        window: float = 60.0,
+        consecutive_timeouts: int = 3,
+        reset_timeout: float = 30.0,
+    ):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.consecutive_timeouts = consecutive_timeouts
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._calls: t.Deque[t.Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._timeouts = 0
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._trial_at: t.Optional[float] = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> t.Optional["CircuitBreaker"]:
+        """
+        Build the circuit breaker configured in the settings, None when it is disabled
+        """
+        if not settings.circuit_breaker:
+            return None
+        return cls(
+            failure_rate=settings.circuit_failure_rate,
+            min_calls=settings.circuit_min_calls,
+            window=settings.circuit_window,
+            consecutive_timeouts=settings.circuit_consecutive_timeouts,
+            reset_timeout=settings.circuit_reset_timeout,
+        )
+
+    @staticmethod
+    def _now() -> float:
+        return time.monotonic()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state(self._now())
+
+    def _current_state(self, now: float) -> CircuitState:
+        if self._state == CircuitState.OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = CircuitState.HALF_OPEN
+            self._trial_at = None
+        return self._state
+
+    def stats(self) -> CircuitStats:
+        with self._lock:
+            now = self._now()
+            self._prune(now)
+            state = self._current_state(now)
+            calls = len(self._calls)
+            return CircuitStats(
+                state=state,
+                calls=calls,
+                failure_rate=self._failures / calls if calls else 0.0,
+                consecutive_timeouts=self._timeouts,
+                retry_in=max(0.0, self._opened_at + self.reset_timeout - now) if state == CircuitState.OPEN else None,
+            )
+
+    def before_call(self):
+        """
+        Check whether a call can be made
+
+        Raises:
+            CircuitOpenError: when the circuit is open, or half-open with a trial call already in flight
+        """
+        with self._lock:
+            now = self._now()
+            state = self._current_state(now)
+            if state == CircuitState.CLOSED:
+                return
+            if state == CircuitState.HALF_OPEN:
+                # a trial call which never reported back doesn't block the circuit forever
+                if self._trial_at is None or now - self._trial_at >= self.reset_timeout:
+                    self._trial_at = now
+                    return
+            raise CircuitOpenError("Parble API circuit is open, failing fast")
+
+    def record_success(self):
+        with self._lock:
+            self._timeouts = 0
+            if self._state == CircuitState.HALF_OPEN:
+                self._close()
+            self._record(False)
+
+    def record_failure(self, timeout: bool = False):
+        with self._lock:
+            self._timeouts = self._timeouts + 1 if timeout else 0
+            if self._state == CircuitState.HALF_OPEN:
+                self._open()
+                return
+            self._record(True)
+            calls = len(self._calls)
+            if self._timeouts >= self.consecutive_timeouts or (
+                calls >= self.min_calls and self._failures / calls >= self.failure_rate
+            ):
+                self._open()
+
+    def _record(self, failed: bool):
+        now = self._now()
+        self._calls.append((now, failed))
+        self._failures += failed
+        self._prune(now)
+
+    def _prune(self, now: float):
+        while self._calls and now - self._calls[0][0] > self.window:
+            _, failed = self._calls.popleft()
+            self._failures -= failed
+
+    def _open(self):
+        self._state = CircuitState.OPEN
+        self._opened_at = self._now()
+        self._trial_at = None
+
+    def _close(self):
+        self._state = CircuitState.CLOSED
+        self._calls.clear()
+        self._failures = 0
+        self._timeouts = 0
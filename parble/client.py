@@ -1,6 +1,7 @@
 from parble.resources.files import FilesResource
 from parble.session import BaseSession
 from parble.settings import Settings
+from parble.singleflight import SingleFlight
 
 
 class ParbleAPIClient:
@@ -9,11 +10,63 @@ class ParbleAPIClient:
     This thin layer exposes the API resources
     """
 
-    def __init__(self, url=None, api_key=None):
-        self.settings = Settings(url=url, api_key=api_key)
+    def __init__(self, url=None, api_key=None, **settings):
+        self.settings = Settings(url=url, api_key=api_key, **settings)
         self._client = BaseSession(self.settings)
+        self.flights = SingleFlight.from_settings(self.settings)
         self.files = FilesResource(self)
 
+    def pool_stats(self):
+        """
+        Return the connection pool statistics of the underlying session
+
+        Returns:
+            Connections opened, reused and currently idle
+        """
+        return self._client.pool_stats()
+
+    def concurrency_stats(self):
+        """
+        Return the state of the adaptive concurrency limiter of the underlying session
+
+        Returns:
+            Current limit, calls in flight and latency estimates, None when adaptive concurrency is disabled
+        """
+        return self._client.concurrency_stats()
+
+    def circuit_stats(self):
+        """
+        Return the state of the circuit breaker of the underlying session, for health checks
+
+        Returns:
+            Circuit state and failure statistics, None when the circuit breaker is disabled
+        """
+        return self._client.circuit_stats()
+
+    def conditional_stats(self):
+        """
+        Return the statistics of the conditional requests of the underlying session
+
+        Returns:
+            Stored representations and the number of responses revalidated, None when conditional requests are disabled
+        """
+        return self._client.conditional_stats()
+
+    def flight_stats(self):
+        """
+        Return the statistics of the coalesced requests
+
+        Returns:
+            Calls made and calls coalesced, None when request coalescing is disabled
+        """
+        return self.flights.stats() if self.flights is not None else None
+
+    def upload_slot(self):
+        """
+        Context manager limiting the number of concurrent uploads to ``max_concurrent_uploads``
+        """
+        return self._client.upload_slot()
+
     def get(self, url, **kwargs):
         """
         Send a GET request
@@ -51,6 +51,11 @@ class ClickHandler(logging.Handler):
 
 
 def _output(file: File, output_format: str, path: Optional[Path] = None):
+    if output_format == "pdf" and path:
+        file.save_pdf(path)
+        click.echo(f"Result saved in {path}")
+        return
+
     if output_format == "pdf":
         data = file.pdf.read()
     else:
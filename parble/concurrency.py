@@ -0,0 +1,203 @@
+import threading
+import time
+import typing as t
+from dataclasses import dataclass
+
+from parble.settings import Settings
+
+
+@dataclass(frozen=True)
+class LimiterStats:
+    """
+    Snapshot of an adaptive concurrency limiter, for monitoring
+    """
+
+    limit: int  # current number of calls allowed in flight
+    in_flight: int  # calls currently in flight
+    latency: t.Dict[str, float]  # smoothed round-trip time in seconds, per kind of call
+    processing: t.Optional[float]  # smoothed server-side processing time of the uploads in seconds
+
+
+class _Latency:
+    """
+    Fast and slow moving averages of a latency: the call is healthy while the fast one stays close to the slow one
+    """
+
+    def __init__(self, fast: float = 0.3, slow: float = 0.05):
+        self._fast_weight = fast
+        self._slow_weight = slow
+        self.fast: t.Optional[float] = None
+        self.slow: t.Optional[float] = None
+
+    def add(self, value: float):
+        if self.fast is None:
+            self.fast = self.slow = value
+            return
+        self.fast += self._fast_weight * (value - self.fast)
+        self.slow += self._slow_weight * (value - self.slow)
+
+    def healthy(self, tolerance: float) -> bool:
+        return self.fast is None or self.fast <= self.slow * tolerance
+
+
+class AdaptiveLimiter:
+    """
+    Adaptive concurrency limiter using additive increase / multiplicative decrease (AIMD)
+
+    The limit grows by ``increase`` per window of ``limit`` successful calls while the latencies stay healthy,
+    and is multiplied by ``decrease`` when the API shows signs of overload (timeouts, 429 or 5xx responses).
+    Other failed calls, e.g. client errors, leave the limit and the latencies unchanged.
+    A latency is unhealthy when its fast moving average exceeds ``latency_tolerance`` times its slow moving
+    average: the limit then stops growing. Latencies are tracked per kind of call (e.g. per HTTP method), so
+    quick fetches and long uploads don't skew each other.
+
+    Args:
+        initial: initial limit
+        min_limit: lowest limit
+        max_limit: highest limit
+        increase: limit increase per window of successful calls
+        decrease: factor applied to the limit on overload
+        latency_tolerance: ratio between the recent and the long term latency considered healthy
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_tolerance: float = 2.0,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._in_flight = 0
+        self._latencies: t.Dict[str, _Latency] = {}
+        self._processing = _Latency()
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> t.Optional["AdaptiveLimiter"]:
+        """
+        Build the limiter configured in the settings, None when adaptive concurrency is disabled
+        """
+        if not settings.adaptive_concurrency:
+            return None
+        return cls(
+            initial=settings.concurrency_initial,
+            min_limit=settings.concurrency_min,
+            max_limit=settings.concurrency_max,
+        )
+
+    @property
+    def limit(self) -> int:
+        """
+        Current number of calls allowed in flight
+        """
+        return int(self._limit)
+
+    def stats(self) -> LimiterStats:
+        with self._cond:
+            return LimiterStats(
+                limit=self.limit,
+                in_flight=self._in_flight,
+                latency={key: lat.fast for key, lat in self._latencies.items()},
+                processing=self._processing.fast,
+            )
+
+    def slot(self, key: str = "default") -> "Slot":
+        """
+        Context manager waiting for a free slot and reporting the outcome of the call made in it
+
+        Args:
+            key: kind of call, latencies are tracked per key
+        """
+        return Slot(self, key)
+
+    def acquire(self):
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    def on_success(self, key: str, latency: float):
+        """
+        Record a successful call, growing the limit while the latencies are healthy
+        """
+        with self._cond:
+            lat = self._latencies.setdefault(key, _Latency())
+            lat.add(latency)
+            if not (lat.healthy(self.latency_tolerance) and self._processing.healthy(self.latency_tolerance)):
+                return
+            if self._limit < self.max_limit:
+                self._limit = min(self.max_limit, self._limit + self.increase / self._limit)
+                self._cond.notify_all()
+
+    def on_overload(self, key: str = "default"):
+        """
+        Record a call failed because of an overloaded API, shrinking the limit
+
+        The limit is shrunk at most once per round-trip, as the calls in flight at that time likely
+        failed for the same reason.
+        """
+        with self._cond:
+            now = time.monotonic()
+            lat = self._latencies.get(key)
+            window = lat.fast if lat is not None and lat.fast is not None else 0.0
+            if now - self._last_decrease < window:
+                return
+            self._last_decrease = now
+            self._limit = max(float(self.min_limit), self._limit * self.decrease)
+
+    def observe_processing(self, seconds: float):
+        """
+        Record the server-side processing time of a file, from its upload and done timings
+
+        The limit stops growing while the processing time degrades.
+        """
+        with self._cond:
+            self._processing.add(seconds)
+
+
+class Slot:
+    """
+    A call in flight inside an :py:class:`AdaptiveLimiter`
+    """
+
+    def __init__(self, limiter: AdaptiveLimiter, key: str):
+        self._limiter = limiter
+        self._key = key
+        self._overloaded = False
+        self._started = 0.0
+
+    def overloaded(self):
+        """
+        Flag the call as failed because of an overloaded API
+        """
+        self._overloaded = True
+
+    def __enter__(self) -> "Slot":
+        self._limiter.acquire()
+        self._started = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if self._overloaded:
+                self._limiter.on_overload(self._key)
+            elif exc_type is None:
+                self._limiter.on_success(self._key, time.monotonic() - self._started)
+            # other failures, e.g. client errors, tell nothing about the load of the API: the limit is left as is
+        finally:
+            self._limiter.release()
+        return False
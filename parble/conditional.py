@@ -0,0 +1,141 @@
+import threading
+import typing as t
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from parble.settings import Settings
+
+# headers of a 304 response refreshing the stored representation
+_UPDATED_HEADERS = ("ETag", "Last-Modified", "Cache-Control", "Expires", "Date")
+
+
+@dataclass(frozen=True)
+class ConditionalStats:
+    """
+    Snapshot of the representations kept for conditional requests
+    """
+
+    entries: int
+    revalidated: int  # 304 responses answered from a stored representation
+    fetched: int  # full responses stored
+
+
+class Representation:
+    """
+    A response body kept with its validators, to answer the 304 responses of conditional requests
+
+    Consumers may memoize what they derive from the body in :py:attr:`parsed`, e.g. the decoded JSON.
+    """
+
+    __slots__ = ("status_code", "reason", "headers", "content", "encoding", "parsed")
+
+    def __init__(self, resp: Response):
+        self.status_code = resp.status_code
+        self.reason = resp.reason
+        self.headers = CaseInsensitiveDict(resp.headers)
+        self.content = resp.content
+        self.encoding = resp.encoding
+        self.parsed: t.Any = None
+
+    @property
+    def validators(self) -> t.Dict[str, str]:
+        """
+        Headers making a request conditional on this representation having changed
+        """
+        headers = {}
+        if "ETag" in self.headers:
+            headers["If-None-Match"] = self.headers["ETag"]
+        if "Last-Modified" in self.headers:
+            headers["If-Modified-Since"] = self.headers["Last-Modified"]
+        return headers
+
+    def response(self, not_modified: Response) -> Response:
+        """
+        Build the full response answered by a 304 response
+        """
+        for name in _UPDATED_HEADERS:
+            if name in not_modified.headers:
+                self.headers[name] = not_modified.headers[name]
+        resp = Response()
+        resp.status_code = self.status_code
+        resp.reason = self.reason
+        resp.headers = CaseInsensitiveDict(self.headers)
+        resp._content = self.content
+        resp.encoding = self.encoding
+        resp.url = not_modified.url
+        resp.request = not_modified.request
+        resp.elapsed = not_modified.elapsed
+        resp.connection = not_modified.connection
+        resp.history = not_modified.history
+        resp.revalidated = True
+        resp.representation = self
+        return resp
+
+
+class RepresentationCache:
+    """
+    Bounded LRU store of the representations of the GET responses having an ETag or a Last-Modified header
+
+    Args:
+        max_entries: number of representations kept
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[t.Hashable, Representation]" = OrderedDict()
+        self._revalidated = self._fetched = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> t.Optional["RepresentationCache"]:
+        """
+        Build the representation store configured in the settings, None when conditional requests are disabled
+        """
+        if not settings.conditional_requests:
+            return None
+        return cls(settings.conditional_cache_entries)
+
+    def get(self, key: t.Hashable) -> t.Optional[Representation]:
+        with self._lock:
+            representation = self._entries.get(key)
+            if representation is not None:
+                self._entries.move_to_end(key)
+            return representation
+
+    def update(self, key: t.Hashable, stored: t.Optional[Representation], resp: Response) -> Response:
+        """
+        Answer a 304 response from the stored representation, or store the representation of a full response
+
+        Args:
+            key: key of the request
+            stored: representation the request was made conditional on
+            resp: response of the request
+
+        Returns:
+            The response, flagged with ``revalidated`` when it is answered from the stored representation
+        """
+        if resp.status_code == 304 and stored is not None:
+            with self._lock:
+                self._revalidated += 1
+            return stored.response(resp)
+        resp.revalidated = False
+        if resp.status_code == 200 and ("ETag" in resp.headers or "Last-Modified" in resp.headers):
+            representation = Representation(resp)
+            resp.representation = representation
+            with self._lock:
+                self._fetched += 1
+                self._entries[key] = representation
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        elif resp.status_code == 404:
+            with self._lock:
+                self._entries.pop(key, None)
+        return resp
+
+    def stats(self) -> ConditionalStats:
+        with self._lock:
+            return ConditionalStats(entries=len(self._entries), revalidated=self._revalidated, fetched=self._fetched)
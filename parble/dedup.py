@@ -0,0 +1,134 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import typing as t
+from dataclasses import dataclass
+from pathlib import Path
+
+from parble.settings import Settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    namespace TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    file_id TEXT NOT NULL,
+    done INTEGER NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (namespace, digest)
+);
+CREATE INDEX IF NOT EXISTS uploads_file_id ON uploads (file_id);
+"""
+
+
+def content_hash(fp: t.BinaryIO, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Return the SHA-256 hex digest of the content of a binary file-like, read chunk by chunk
+
+    A seekable file-like is rewound to its initial position afterwards, ready to be uploaded.
+
+    Args:
+        fp: binary file-like to hash
+        chunk_size: size of the chunks read
+    """
+    start = fp.tell() if getattr(fp, "seekable", lambda: False)() else None
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: fp.read(chunk_size), b""):
+        digest.update(chunk)
+    if start is not None:
+        fp.seek(start)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class Upload:
+    """
+    A previous upload of some content
+    """
+
+    file_id: str
+    done: bool  # whether the File was processed when last seen
+
+
+class UploadIndex:
+    """
+    Local index of the uploaded contents, mapping their SHA-256 digest to the File they were uploaded as
+
+    Uploading the same content again can then return the existing File instead of uploading and processing it again.
+    Contents are indexed per tenant and inbox, see :py:meth:`key`. The SQLite database can be shared by several
+    threads and processes.
+
+    Args:
+        path: path of the SQLite database, created if needed
+        timeout: seconds to wait for a lock held by another process
+    """
+
+    def __init__(self, path: t.Union[str, Path], timeout: float = 30.0):
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=timeout, isolation_level=None, check_same_thread=False)
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> t.Optional["UploadIndex"]:
+        """
+        Build the upload index configured in the settings, None when it is disabled
+        """
+        if settings.upload_index is None:
+            return None
+        return cls(settings.upload_index)
+
+    @staticmethod
+    def key(url: str, inbox_id: t.Optional[str] = None) -> str:
+        """
+        Namespace of the uploads to a tenant and inbox: the same content sent to another inbox is processed again
+        """
+        return f"{url}#{inbox_id or ''}"
+
+    def lookup(self, namespace: str, digest: str) -> t.Optional[Upload]:
+        """
+        Return the previous upload of a content, None when it was never uploaded
+
+        Args:
+            namespace: tenant and inbox of the upload, see :py:meth:`key`
+            digest: SHA-256 digest of the content
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT file_id, done FROM uploads WHERE namespace = ? AND digest = ?", (namespace, digest)
+            ).fetchone()
+        return Upload(file_id=row[0], done=bool(row[1])) if row is not None else None
+
+    def record(self, namespace: str, digest: str, file_id: str, done: bool):
+        """
+        Record the upload of a content as a File, or update its completion state
+
+        Args:
+            namespace: tenant and inbox of the upload, see :py:meth:`key`
+            digest: SHA-256 digest of the content
+            file_id: ID of the File
+            done: whether the File is processed
+        """
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?)",
+                (namespace, digest, file_id, int(done), time.time()),
+            )
+
+    def forget(self, file_id: str):
+        """
+        Remove the uploads of a File, e.g. once it is deleted from the API
+        """
+        with self._lock:
+            self._db.execute("DELETE FROM uploads WHERE file_id = ?", (file_id,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM uploads").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -26,6 +26,12 @@ class InvalidCallError(APICallError):
     pass
 
 
+class CircuitOpenError(APICallError):
+    """
+    Raised without calling the API while the circuit breaker is open
+    """
+
+
 handlers = {
     404: NotFoundError,
     401: UnAuthorizedError,
@@ -0,0 +1,182 @@
+"""
+Columnar export of Files, for reporting over many results
+
+The Files are flattened into typed columns, either at the document level (one row per document) or at the field level
+(one row per header field), and returned as plain lists, NumPy record arrays, Arrow tables or Parquet files.
+The coordinates of a field are its bounding box ``[x0, y0, x1, y1]``, exported as four columns (-1 when missing).
+
+NumPy and Arrow are optional dependencies: ``pip install 'parble[numpy]'`` or ``pip install 'parble[arrow]'``.
+"""
+import typing as t
+from pathlib import Path
+
+from parble.models import File
+
+# column names and NumPy dtypes of each level
+DOCUMENT_COLUMNS: t.Tuple[t.Tuple[str, str], ...] = (
+    ("file_id", "O"),
+    ("filename", "O"),
+    ("document_index", "i4"),
+    ("document_type", "O"),
+    ("automated", "?"),
+    ("classification_automated", "?"),
+    ("confidence", "f8"),
+    ("start_page", "i4"),
+    ("end_page", "i4"),
+    ("field_count", "i4"),
+)
+
+FIELD_COLUMNS: t.Tuple[t.Tuple[str, str], ...] = (
+    ("file_id", "O"),
+    ("document_index", "i4"),
+    ("document_type", "O"),
+    ("name", "O"),
+    ("value", "O"),
+    ("text", "O"),
+    ("confidence", "i4"),
+    ("automated", "?"),
+    ("page", "i4"),
+    ("x0", "i8"),
+    ("y0", "i8"),
+    ("x1", "i8"),
+    ("y1", "i8"),
+)
+
+_MISSING_BOX = (-1, -1, -1, -1)
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:  # no cov
+        raise ImportError("NumPy export requires numpy, install it with: pip install 'parble[numpy]'") from e
+    return numpy
+
+
+def _arrow():
+    try:
+        import pyarrow
+    except ImportError as e:  # no cov
+        raise ImportError("Arrow export requires pyarrow, install it with: pip install 'parble[arrow]'") from e
+    return pyarrow
+
+
+def _schema(level: str) -> t.Tuple[t.Tuple[str, str], ...]:
+    if level == "documents":
+        return DOCUMENT_COLUMNS
+    if level == "fields":
+        return FIELD_COLUMNS
+    raise ValueError(f"Unknown export level {level!r}, expecting 'documents' or 'fields'")
+
+
+def _document_columns(files: t.Iterable[File]) -> t.Dict[str, list]:
+    columns = {name: [] for name, _ in DOCUMENT_COLUMNS}
+    file_ids, filenames, indexes, types, automated, cls_automated, confidences, starts, ends, counts = (
+        columns[name].append for name, _ in DOCUMENT_COLUMNS
+    )
+    for file in files:
+        for index, doc in enumerate(file.documents):
+            classification = doc.classification
+            file_ids(file.id)
+            filenames(file.filename)
+            indexes(index)
+            types(classification.document_type)
+            automated(doc.automated)
+            cls_automated(classification.automated)
+            confidences(classification.confidence)
+            starts(classification.start_page)
+            ends(classification.end_page)
+            counts(len(doc.header_fields))
+    return columns
+
+
+def _field_columns(files: t.Iterable[File]) -> t.Dict[str, list]:
+    columns = {name: [] for name, _ in FIELD_COLUMNS}
+    file_ids, indexes, types, names, values, texts, confidences, automated, pages, x0s, y0s, x1s, y1s = (
+        columns[name].append for name, _ in FIELD_COLUMNS
+    )
+    for file in files:
+        for index, doc in enumerate(file.documents):
+            document_type = doc.classification.document_type
+            for name, field in doc.header_fields.items():
+                file_ids(file.id)
+                indexes(index)
+                types(document_type)
+                names(name)
+                values(field.value)
+                texts(field.text)
+                confidences(field.confidence)
+                automated(field.automated)
+                pages(field.page)
+                x0, y0, x1, y1 = field.coordinates if len(field.coordinates) == 4 else _MISSING_BOX
+                x0s(x0)
+                y0s(y0)
+                x1s(x1)
+                y1s(y1)
+    return columns
+
+
+def to_columns(files: t.Iterable[File], level: str = "fields") -> t.Dict[str, list]:
+    """
+    Flatten Files into columns of Python values
+
+    Args:
+        files: Files to export, consumed once
+        level: one row per ``"documents"`` or per header ``"fields"``
+
+    Returns:
+        Mapping of the column names to their values
+    """
+    _schema(level)
+    return _document_columns(files) if level == "documents" else _field_columns(files)
+
+
+def to_records(files: t.Iterable[File], level: str = "fields"):
+    """
+    Flatten Files into a NumPy record array, strings being stored as objects
+
+    Args:
+        files: Files to export, consumed once
+        level: one row per ``"documents"`` or per header ``"fields"``
+
+    Returns:
+        ``numpy.recarray`` with one typed column per attribute
+    """
+    np = _numpy()
+    schema = _schema(level)
+    columns = to_columns(files, level)
+    return np.rec.fromarrays([np.array(columns[name], dtype=dtype) for name, dtype in schema], dtype=list(schema))
+
+
+def to_table(files: t.Iterable[File], level: str = "fields"):
+    """
+    Flatten Files into an Arrow table
+
+    Args:
+        files: Files to export, consumed once
+        level: one row per ``"documents"`` or per header ``"fields"``
+
+    Returns:
+        ``pyarrow.Table`` with one typed column per attribute
+    """
+    pa = _arrow()
+    types = {"O": pa.string(), "i4": pa.int32(), "i8": pa.int64(), "f8": pa.float64(), "?": pa.bool_()}
+    schema = _schema(level)
+    columns = to_columns(files, level)
+    return pa.table({name: pa.array(columns[name], type=types[dtype]) for name, dtype in schema})
+
+
+def to_parquet(files: t.Iterable[File], path: t.Union[str, Path], level: str = "fields", **kwargs: t.Any):
+    """
+    Flatten Files into a Parquet file
+
+    Args:
+        files: Files to export, consumed once
+        path: path of the Parquet file to write
+        level: one row per ``"documents"`` or per header ``"fields"``
+        kwargs: extra arguments of ``pyarrow.parquet.write_table``, e.g. compression
+    """
+    _arrow()
+    import pyarrow.parquet as pq
+
+    pq.write_table(to_table(files, level), str(path), **kwargs)
@@ -0,0 +1,188 @@
+import concurrent.futures
+import logging
+import threading
+import time
+import typing as t
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from parble.exceptions import InvalidCallError, NotFoundError, UnAuthorizedError
+
+if t.TYPE_CHECKING:
+    from parble.models import File
+    from parble.sdk import ParbleSDK
+
+logger = logging.getLogger(__name__)
+
+# errors that won't go away by polling again
+FATAL_ERRORS = (NotFoundError, UnAuthorizedError, InvalidCallError)
+
+# python < 3.8 has no InvalidStateError
+_InvalidStateError = getattr(concurrent.futures, "InvalidStateError", RuntimeError)
+
+
+class ProcessingFuture(Future):
+    """
+    Future resolving to the processed :py:class:`parble.models.File`
+
+    ``file_id`` is set as soon as the upload has been accepted by the API.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.file_id: t.Optional[str] = None
+
+    def resolve(self, result: t.Optional["File"] = None, exception: t.Optional[BaseException] = None):
+        """
+        Set the result or the exception of the future, unless it was cancelled meanwhile
+        """
+        if self.done():
+            return
+        try:
+            if exception is not None:
+                self.set_exception(exception)
+            else:
+                self.set_result(result)
+        except _InvalidStateError:
+            pass
+
+
+class _Watch:
+    def __init__(self, interval: float):
+        self.futures: t.List[ProcessingFuture] = []
+        self.interval = interval
+        self.due = time.monotonic() + interval
+        self.errors = 0
+
+
+class FilePoller:
+    """
+    Poll the files still processing until they are done, then resolve their futures.
+
+    All the watched files share a single background thread: each polling round fetches the files which are due,
+    using a small pool of ``workers``. The polling interval of a file grows by ``backoff`` each time it is found
+    still processing, up to ``max_interval``.
+
+    The thread is started when a file is watched and stops on its own once nothing is left to poll.
+
+    Args:
+        sdk: SDK used to fetch the files
+        interval: initial polling interval in seconds
+        max_interval: maximum polling interval in seconds
+        backoff: growth factor of the polling interval
+        workers: number of concurrent requests of a polling round
+        max_errors: number of consecutive failed polls of a file before failing its future
+    """
+
+    def __init__(
+        self,
+        sdk: "ParbleSDK",
+        interval: float = 2.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+        workers: int = 4,
+        max_errors: int = 5,
+    ):
+        self._sdk = sdk
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_errors = max_errors
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parble-poll")
+        self._cond = threading.Condition()
+        self._watched: t.Dict[str, _Watch] = {}
+        self._thread: t.Optional[threading.Thread] = None
+        self._closed = False
+
+    def watch(self, file_id: str, future: ProcessingFuture):
+        """
+        Poll the given file until it's done and resolve future with it
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("FilePoller is closed")
+            self._watched.setdefault(file_id, _Watch(self.interval)).futures.append(future)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="parble-poller", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of files still being polled
+        """
+        with self._cond:
+            return len(self._watched)
+
+    def close(self):
+        """
+        Stop polling, the pending futures are cancelled
+        """
+        with self._cond:
+            self._closed = True
+            watched, self._watched = self._watched, {}
+            self._cond.notify()
+            thread = self._thread
+        for watch in watched.values():
+            for fut in watch.futures:
+                fut.cancel()
+        if thread is not None:
+            thread.join()
+        self._executor.shutdown(wait=True)
+
+    def _next_round(self) -> t.Optional[t.List[str]]:
+        """
+        Wait for the files due in the next round, None when there is nothing left to poll
+        """
+        with self._cond:
+            while True:
+                for file_id in [f for f, watch in self._watched.items() if all(x.cancelled() for x in watch.futures)]:
+                    del self._watched[file_id]
+                if self._closed or not self._watched:
+                    self._thread = None
+                    return None
+                now = time.monotonic()
+                due = [file_id for file_id, watch in self._watched.items() if watch.due <= now]
+                if due:
+                    return due
+                self._cond.wait(min(watch.due for watch in self._watched.values()) - now)
+
+    def _run(self):
+        while True:
+            due = self._next_round()
+            if due is None:
+                return
+            results = list(self._executor.map(self._poll, due))
+            with self._cond:
+                for file_id, file, exc in results:
+                    self._update(file_id, file, exc)
+
+    def _poll(self, file_id: str) -> t.Tuple[str, t.Optional["File"], t.Optional[Exception]]:
+        try:
+            return file_id, self._sdk.files.get(file_id), None
+        except Exception as exc:
+            return file_id, None, exc
+
+    def _update(self, file_id: str, file: t.Optional["File"], exc: t.Optional[Exception]):
+        watch = self._watched.get(file_id)
+        if watch is None:
+            return
+
+        if exc is not None:
+            watch.errors += 1
+            if isinstance(exc, FATAL_ERRORS) or watch.errors >= self.max_errors:
+                del self._watched[file_id]
+                for fut in watch.futures:
+                    fut.resolve(exception=exc)
+                return
+            logger.debug("Polling file %s failed (%r), retrying", file_id, exc)
+        elif file.is_done:
+            del self._watched[file_id]
+            for fut in watch.futures:
+                fut.resolve(file)
+            return
+        else:
+            watch.errors = 0
+
+        watch.interval = min(self.max_interval, watch.interval * self.backoff)
+        watch.due = time.monotonic() + watch.interval
@@ -1,13 +1,47 @@
+import shutil
+from collections.abc import Mapping, Sequence
 from datetime import datetime
 import json
-from typing import TYPE_CHECKING, Any, BinaryIO, Dict, List, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Union
 
 from pydantic import BaseModel, PrivateAttr, confloat
+from pydantic.datetime_parse import parse_datetime
 
 import json
 
 if TYPE_CHECKING:
     from parble.sdk import ParbleSDK
+    from parble.spatial import SpatialIndex
+    from parble.tables import Table
+
+
+def _trusted_datetime(value: Any) -> Optional[datetime]:
+    """
+    Parse a datetime from the API, trying the fast ISO format parser first
+    """
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return parse_datetime(value)
+
+
+def _construct(model: type, data: Dict[str, Any]) -> Any:
+    """
+    Build a model instance from its declared fields in data, without validation
+
+    This is a leaner ``BaseModel.construct``: the extra keys are ignored, as validation would,
+    and missing fields are not defaulted.
+    """
+    values = {name: data[name] for name in model.__fields__ if name in data}
+    obj = model.__new__(model)
+    object.__setattr__(obj, "__dict__", values)
+    object.__setattr__(obj, "__fields_set__", set(values))
+    if model.__private_attributes__:
+        obj._init_private_attributes()
+    return obj
 
 
 class Timings(BaseModel):
@@ -18,6 +52,24 @@ class Timings(BaseModel):
     upload: datetime
     done: Optional[datetime]
 
+    @property
+    def processing_time(self) -> Optional[float]:
+        """
+        Seconds elapsed between the upload and the end of the processing, None while processing
+        """
+        if self.done is None:
+            return None
+        return (self.done - self.upload).total_seconds()
+
+    @classmethod
+    def construct_trusted(cls, data: Dict[str, Any]) -> "Timings":
+        """
+        Build the model from trusted API data, without validation
+        """
+        return _construct(
+            cls, {"upload": _trusted_datetime(data["upload"]), "done": _trusted_datetime(data.get("done"))}
+        )
+
     def to_json_struct(self):
         return {"upload": self.upload.strftime("%Y-%m-%d %H:%M:%S"), "done": self.done.strftime("%Y-%m-%d %H:%M:%S")}
 
@@ -33,6 +85,13 @@ class Classification(BaseModel):
     start_page: int
     end_page: int
 
+    @classmethod
+    def construct_trusted(cls, data: Dict[str, Any]) -> "Classification":
+        """
+        Build the model from trusted API data, without validation
+        """
+        return _construct(cls, data)
+
 
 class Field(BaseModel):
     """
@@ -46,8 +105,55 @@ class Field(BaseModel):
     confidence: int
     automated: bool
 
+    @classmethod
+    def construct_trusted(cls, data: Dict[str, Any]) -> "Field":
+        """
+        Build the model from trusted API data, without validation
+        """
+        return _construct(cls, data)
+
+
+class LazyFields(Mapping):
+    """
+    Header fields of a document, each :py:class:`Field` being built from the raw payload when first accessed
+    """
+
+    def __init__(self, raw: Dict[str, Dict[str, Any]]):
+        self._raw = raw
+        self._fields: Dict[str, Field] = {}
+
+    def __getitem__(self, name: str) -> Field:
+        field = self._fields.get(name)
+        if field is None:
+            field = self._fields[name] = Field.construct_trusted(self._raw[name])
+        return field
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __repr__(self) -> str:
+        return f"<LazyFields: {len(self)} fields, {len(self._fields)} materialized>"
+
+    def to_json_struct(self):
+        return dict(self.items())
+
+
+class _LazyModel(BaseModel):
+    """
+    Model exporting its lazy containers as the plain list or dict they stand for
+    """
+
+    @classmethod
+    def _get_value(cls, v: Any, *args: Any, **kwargs: Any) -> Any:
+        if isinstance(v, (LazyDocuments, LazyFields)):
+            v = v.to_json_struct()
+        return super()._get_value(v, *args, **kwargs)
 
-class Document(BaseModel):
+
+class Document(_LazyModel):
     """
     A single classified and predicted document
     """
@@ -57,12 +163,110 @@ class Document(BaseModel):
     header_fields: Dict[str, Field] = {}
     tables: Dict[str, Any] = {}
 
+    _tables: Dict[str, Any] = PrivateAttr(default_factory=dict)
+
     @property
     def type(self) -> str:
         return self.classification.document_type
 
+    def table(self, name: str) -> "Table":
+        """
+        Return a table of the document as a typed, columnar :py:class:`parble.tables.Table`
+
+        The table is parsed on first access and cached until the raw table is replaced.
+
+        Args:
+            name: name of the table, a key of :py:attr:`tables`
+
+        Raises:
+            KeyError: when the document has no such table
+        """
+        from parble.tables import Table
+
+        raw = self.tables[name]
+        cached = self._tables.get(name)
+        if cached is None or cached[0] is not raw:
+            cached = self._tables[name] = (raw, Table(raw))
+        return cached[1]
+
+    @classmethod
+    def construct_trusted(cls, data: Dict[str, Any], lazy: bool = False) -> "Document":
+        """
+        Build the model and its classification and fields from trusted API data, without validation
+
+        Args:
+            data: attributes payload of the document
+            lazy: build each header field only when it is first accessed
+        """
+        header_fields = data.get("header_fields", {})
+        return _construct(
+            cls,
+            {
+                "automated": data["automated"],
+                "classification": Classification.construct_trusted(data["classification"]),
+                "header_fields": (
+                    LazyFields(header_fields)
+                    if lazy
+                    else {name: Field.construct_trusted(f) for name, f in header_fields.items()}
+                ),
+                "tables": data.get("tables", {}),
+            },
+        )
+
+
+class LazyDocuments(Sequence):
+    """
+    Documents of a File, each :py:class:`Document` being built from the raw payload when first accessed
+
+    Built documents are cached. Without validation, their header fields are built lazily too.
 
-class File(BaseModel):
+    Args:
+        raw: documents payload from the API
+        validate: validate each document when building it
+    """
+
+    def __init__(self, raw: List[Dict[str, Any]], validate: bool = True):
+        self._raw = raw
+        self._validate = validate
+        self._documents: List[Optional[Document]] = [None] * len(raw)
+
+    @property
+    def materialized(self) -> int:
+        """
+        Number of documents built so far
+        """
+        return sum(doc is not None for doc in self._documents)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self)))]
+        doc = self._documents[item]
+        if doc is None:
+            raw = self._raw[item]
+            doc = Document.parse_obj(raw) if self._validate else Document.construct_trusted(raw, lazy=True)
+            self._documents[item] = doc
+        return doc
+
+    def __iter__(self) -> Iterator[Document]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, (list, LazyDocuments)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"<LazyDocuments: {len(self)} documents, {self.materialized} materialized>"
+
+    def to_json_struct(self):
+        return list(self)
+
+
+class File(_LazyModel):
     """
     This model represents a File datastructure from Parble API.
 
@@ -77,27 +281,113 @@ class File(BaseModel):
     documents: List[Document]
 
     _sdk: Optional["ParbleSDK"] = PrivateAttr()
-    _pdf: Optional[BinaryIO] = PrivateAttr(default=None)
+    _indexes: Dict[str, Any] = PrivateAttr(default_factory=dict)
 
     def __init__(self, sdk: "ParbleSDK", **data: Any):
         super().__init__(**data)
         self._sdk = sdk
 
+    @classmethod
+    def construct_trusted(cls, data: Dict[str, Any], sdk: Optional["ParbleSDK"] = None) -> "File":
+        """
+        Build the File and its documents from trusted API data, without validation
+
+        This is much faster than validating the payload, but a malformed payload is not detected:
+        only use it with data coming from the Parble API.
+
+        Args:
+            data: attributes payload from the API call
+            sdk: SDK instance the File is bound to
+
+        Returns:
+            File object
+        """
+        file = _construct(
+            cls,
+            dict(
+                data,
+                timings=Timings.construct_trusted(data["timings"]),
+                documents=[Document.construct_trusted(doc) for doc in data["documents"]],
+            ),
+        )
+        file._sdk = sdk
+        return file
+
+    @classmethod
+    def construct_lazy(cls, data: Dict[str, Any], sdk: Optional["ParbleSDK"] = None, validate: bool = True) -> "File":
+        """
+        Build the File, keeping its documents as raw payload until they are accessed
+
+        The documents are then a :py:class:`LazyDocuments` sequence: each one is built when it is first indexed
+        or iterated, so reading the File attributes or the number of documents costs nothing.
+
+        Args:
+            data: attributes payload from the API call
+            sdk: SDK instance the File is bound to
+            validate: validate the File attributes now, and each document when it is built
+
+        Returns:
+            File object
+        """
+        raw = data.get("documents", [])
+        attrs = dict(data, documents=[])
+        file = cls(sdk=sdk, **attrs) if validate else cls.construct_trusted(attrs, sdk=sdk)
+        file.__dict__["documents"] = LazyDocuments(raw, validate=validate)
+        return file
+
+    @property
+    def _pdf_key(self) -> Any:
+        return str(self._sdk.client.settings.url) if self._sdk is not None else None, self.id
+
     @property
     def pdf(self) -> BinaryIO:
         """
         Fetch and return the PDF representation of the processed File.
 
-        The content is fetched from the API and cached.
+        The content is fetched from the API and cached in the bounded process-wide cache of
+        :py:mod:`parble.pdfcache`, each access returning a new file-like positioned at the start.
         Explicitly calling del on this property will clear the cache
         """
-        if self._pdf is None:
-            self._pdf = self._sdk.files.get_pdf(self.id)
-        return self._pdf
+        from parble.pdfcache import pdf_cache
+
+        return pdf_cache().fetch(self._pdf_key, lambda dest: self._sdk.files.get_pdf(self.id, dest=dest))
 
     @pdf.deleter
     def pdf(self):
-        self._pdf = None
+        from parble.pdfcache import pdf_cache
+
+        pdf_cache().discard(self._pdf_key)
+
+    def save_pdf(self, dest: Union[str, Path, BinaryIO], chunk_size: int = 64 * 1024):
+        """
+        Save the PDF representation of the processed File to dest.
+
+        The content is streamed from the API to dest without being cached, unless it was already cached.
+
+        Args:
+            dest: local path or binary file-like to write to
+            chunk_size: size of the streamed chunks
+        """
+        from parble.pdfcache import pdf_cache
+
+        cached = pdf_cache().open(self._pdf_key)
+        if cached is None:
+            self._sdk.files.get_pdf(self.id, dest=dest, chunk_size=chunk_size)
+            return
+
+        with cached:
+            if isinstance(dest, (str, Path)):
+                with open(dest, "wb") as f:
+                    shutil.copyfileobj(cached, f, chunk_size)
+            else:
+                shutil.copyfileobj(cached, dest, chunk_size)
+
+    @property
+    def is_done(self) -> bool:
+        """
+        Whether the processing of this file is complete
+        """
+        return self.timings.done is not None
 
     @property
     def name(self) -> str:
@@ -118,6 +408,130 @@ class File(BaseModel):
         """
         return self.documents[item]
 
+    def _index(self, name: str, build: Callable[[List[Document]], Any]):
+        """
+        Return the named index of the documents, built on first use and rebuilt when the documents are replaced
+        """
+        documents = self.documents
+        cached = self._indexes.get(name)
+        if cached is None or cached[0] is not documents or cached[1] != len(documents):
+            cached = self._indexes[name] = (documents, len(documents), build(documents))
+        return cached[2]
+
+    @staticmethod
+    def _index_types(documents: List[Document]) -> Dict[str, List[Document]]:
+        index: Dict[str, List[Document]] = {}
+        for doc in documents:
+            index.setdefault(doc.classification.document_type, []).append(doc)
+        return index
+
+    @staticmethod
+    def _index_fields(documents: List[Document]) -> Dict[str, List[Document]]:
+        index: Dict[str, List[Document]] = {}
+        for doc in documents:
+            for name in doc.header_fields:
+                index.setdefault(name, []).append(doc)
+        return index
+
+    @staticmethod
+    def _index_pages(documents: List[Document]) -> Dict[int, List[Document]]:
+        index: Dict[int, List[Document]] = {}
+        for doc in documents:
+            start, end = doc.classification.start_page, doc.classification.end_page
+            # the end page is excluded, but a document always covers its start page
+            for page in range(start, max(end, start + 1)):
+                index.setdefault(page, []).append(doc)
+        return index
+
+    def documents_of_type(self, document_type: str) -> List[Document]:
+        """
+        Return the documents of the given type
+
+        The documents are indexed by type on the first query.
+
+        Args:
+            document_type: classified type of the documents, e.g. invoice
+
+        Returns:
+            Matching documents, in order
+        """
+        return list(self._index("types", self._index_types).get(document_type, ()))
+
+    def fields_named(self, name: str) -> List[Field]:
+        """
+        Return the header fields with the given name, across all the documents
+
+        The documents are indexed by field names on the first query.
+
+        Args:
+            name: name of the header field, e.g. total_amount
+
+        Returns:
+            Matching fields, in the order of their documents
+        """
+        return [doc.header_fields[name] for doc in self._index("fields", self._index_fields).get(name, ())]
+
+    def documents_on_page(self, page: int) -> List[Document]:
+        """
+        Return the documents covering the given page
+
+        A document covers the pages from its classification ``start_page`` included to its ``end_page`` excluded.
+        The documents are indexed by pages on the first query.
+
+        Args:
+            page: page index, starting at 0
+
+        Returns:
+            Matching documents, in order
+        """
+        return list(self._index("pages", self._index_pages).get(page, ()))
+
+    def spatial_index(self) -> "SpatialIndex":
+        """
+        Return the spatial index of the header fields coordinates, to query the fields by region of a page
+
+        The index is built on the first call, see :py:class:`parble.spatial.SpatialIndex`.
+        """
+        from parble.spatial import SpatialIndex
+
+        return self._index("spatial", SpatialIndex)
+
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialize the File to JSON bytes with the fastest available backend, see :py:mod:`parble.serialization`
+        """
+        from parble.serialization import file_to_json
+
+        return file_to_json(self)
+
+    @classmethod
+    def from_json_bytes(
+        cls, data: Union[bytes, str], sdk: Optional["ParbleSDK"] = None, validate: bool = False
+    ) -> "File":
+        """
+        Deserialize a File written by :py:meth:`to_json_bytes`, binding it to a live sdk
+        """
+        from parble.serialization import file_from_json
+
+        return file_from_json(data, sdk=sdk, validate=validate)
+
+    def to_bytes(self) -> bytes:
+        """
+        Encode the File to a compact binary record, see :py:mod:`parble.binary`
+        """
+        from parble.binary import encode_file
+
+        return encode_file(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, sdk: Optional["ParbleSDK"] = None) -> "File":
+        """
+        Decode a File from a binary record written by :py:meth:`to_bytes`, binding it to a live sdk
+        """
+        from parble.binary import decode_file
+
+        return decode_file(data, sdk=sdk)
+
     @staticmethod
     def from_json(json_data: str):
         """
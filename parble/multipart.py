@@ -0,0 +1,163 @@
+import io
+import os
+import typing as t
+import uuid
+
+from urllib3.fields import RequestField
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def _file_size(file: t.BinaryIO) -> t.Optional[int]:
+    """
+    Remaining size of a seekable file-like, None if it can't be computed
+    """
+    try:
+        start = file.tell()
+        end = file.seek(0, os.SEEK_END)
+        file.seek(start)
+    except (AttributeError, OSError, ValueError):
+        return None
+    return end - start
+
+
+class MultipartEncoder:
+    """
+    Streaming multipart/form-data encoder
+
+    The form fields and the file are encoded on the fly while the body is read, so uploading a file never
+    requires more than ``chunk_size`` bytes of memory on top of the encoded headers.
+
+    When the file is seekable, the total length of the body is precomputed so it is sent with a Content-Length,
+    and the body can be rewound to be sent again (e.g. when retrying a call). Otherwise, iterate on the encoder
+    to send the body with a chunked transfer encoding.
+
+    Args:
+        fields: plain form fields to send before the file
+        name: name of the form field holding the file
+        file_name: filename of the uploaded file
+        file: binary file-like to upload, read from its current position
+        content_type: content type of the uploaded file
+        chunk_size: size of the chunks read from the file
+    """
+
+    def __init__(
+        self,
+        fields: t.Mapping[str, str],
+        name: str,
+        file_name: str,
+        file: t.BinaryIO,
+        content_type: str = "application/octet-stream",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self.boundary = uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self._file = file
+
+        parts = []
+        for key, value in fields.items():
+            parts.append(self._part_header(RequestField(key, value)))
+            parts.append(str(value).encode() + b"\r\n")
+        parts.append(self._part_header(RequestField(name, b"", filename=file_name), content_type=content_type))
+        self._head = b"".join(parts)
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode()
+
+        try:
+            self._file_start = file.tell()
+        except (AttributeError, OSError):
+            self._file_start = None
+        self._file_size = _file_size(file)
+        self._position = 0
+        self._file_done = False
+        self._tail_start = 0
+
+    def _part_header(self, field: RequestField, content_type: t.Optional[str] = None) -> bytes:
+        field.make_multipart(content_type=content_type)
+        return f"--{self.boundary}\r\n".encode() + field.render_headers().encode()
+
+    @property
+    def content_type(self) -> str:
+        """
+        Content-Type header of the encoded body
+        """
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    @property
+    def len(self) -> t.Optional[int]:
+        """
+        Total length of the encoded body, None when the file is not seekable
+        """
+        if self._file_size is None:
+            return None
+        return len(self._head) + self._file_size + len(self._tail)
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """
+        Rewind the body, only seeking back to the start is supported
+        """
+        if offset != 0 or whence != os.SEEK_SET or self._file_start is None:
+            raise io.UnsupportedOperation("MultipartEncoder can only be rewound to its start")
+        self._file.seek(self._file_start)
+        self._position = 0
+        self._file_done = False
+        return 0
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read up to size bytes of the encoded body, everything left if size is negative
+        """
+        if size is None or size < 0:
+            return b"".join(iter(lambda: self.read(self.chunk_size), b""))
+
+        head_end = len(self._head)
+        out = []
+        while size > 0:
+            pos = self._position
+            if pos < head_end:
+                data = self._head[pos : pos + size]
+            else:
+                data = b""
+                if not self._file_done:
+                    data = self._file.read(size)
+                    if not data:
+                        self._file_done = True
+                        self._tail_start = pos
+                if self._file_done:
+                    offset = pos - self._tail_start
+                    data = self._tail[offset : offset + size]
+            if not data:
+                break
+            out.append(data)
+            self._position += len(data)
+            size -= len(data)
+        return b"".join(out)
+
+    def __iter__(self) -> t.Iterator[bytes]:
+        self._rewind_if_consumed()
+        return iter(lambda: self.read(self.chunk_size), b"")
+
+    def aiter(self) -> "AsyncBody":
+        """
+        Async iterable over the encoded body, for asyncio HTTP clients
+        """
+        return AsyncBody(self)
+
+    def _rewind_if_consumed(self):
+        if self._position and self._file_start is not None:
+            self.seek(0)
+
+
+class AsyncBody:
+    """
+    Replayable async iterable over the chunks of a :py:class:`MultipartEncoder`
+    """
+
+    def __init__(self, encoder: MultipartEncoder):
+        self._encoder = encoder
+
+    async def __aiter__(self) -> t.AsyncIterator[bytes]:
+        for chunk in self._encoder:
+            yield chunk
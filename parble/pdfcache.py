@@ -0,0 +1,294 @@
+"""
+Process-wide bounded cache of the PDF contents of Files
+
+:py:attr:`parble.models.File.pdf` keeps the contents in this cache instead of on the File. Small contents are held
+in memory up to ``max_memory`` bytes; larger contents, and the least recently used ones once the memory budget is
+exceeded, are spilled to anonymous temporary files, up to ``max_disk`` bytes, and served through read-only memory
+maps. Beyond both budgets the least recently used contents are dropped and fetched again when needed.
+"""
+import io
+import mmap
+import tempfile
+import threading
+import typing as t
+from collections import OrderedDict
+from dataclasses import dataclass
+
+_MiB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class PDFCacheStats:
+    """
+    Snapshot of the PDF cache
+    """
+
+    hits: int
+    misses: int
+    entries: int
+    memory: int  # bytes held in memory
+    disk: int  # bytes spilled to temporary files
+
+
+class MappedFile(io.RawIOBase):
+    """
+    Read-only binary file-like over a memory map, closing the map when closed
+    """
+
+    def __init__(self, mapped: mmap.mmap):
+        super().__init__()
+        self._mapped = mapped
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: t.Optional[int] = -1) -> bytes:
+        self._checkClosed()
+        end = len(self._mapped) if size is None or size < 0 else min(self._pos + size, len(self._mapped))
+        data = self._mapped[self._pos : end]
+        self._pos = max(self._pos, end)
+        return data
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._checkClosed()
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._mapped)
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self._pos = offset
+        return offset
+
+    def tell(self) -> int:
+        self._checkClosed()
+        return self._pos
+
+    def close(self):
+        if not self.closed:
+            self._mapped.close()
+        super().close()
+
+
+class _Spool:
+    """
+    Binary sink keeping the content in memory up to a size, then in an anonymous temporary file
+    """
+
+    def __init__(self, max_size: int, directory: t.Optional[str]):
+        self.max_size = max_size
+        self.directory = directory
+        self.buffer: t.Optional[bytearray] = bytearray()
+        self.file: t.Optional[t.BinaryIO] = None
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        if self.buffer is not None and len(self.buffer) + len(data) > self.max_size:
+            self.file = tempfile.TemporaryFile(dir=self.directory)
+            self.file.write(self.buffer)
+            self.buffer = None
+        if self.buffer is not None:
+            self.buffer += data
+        else:
+            self.file.write(data)
+        self.size += len(data)
+        return len(data)
+
+    def writable(self) -> bool:
+        return True
+
+
+class _Entry:
+    __slots__ = ("data", "file", "size")
+
+    def __init__(self, size: int, data: t.Optional[bytes] = None, file: t.Optional[t.BinaryIO] = None):
+        self.size = size
+        self.data = data
+        self.file = file
+
+
+class PDFCache:
+    """
+    Bounded LRU cache of PDF contents, in memory and spilled to temporary files
+
+    Every access returns a new file-like positioned at the start, so concurrent readers don't share a position.
+    Spilled contents stay readable through the file-likes already returned even after they are evicted.
+
+    Args:
+        max_memory: bytes of contents held in memory
+        max_disk: bytes of contents spilled to temporary files, 0 to never spill
+        spill_size: contents larger than this are spilled to a temporary file right away
+        directory: directory of the temporary files, defaults to the system temporary directory
+    """
+
+    def __init__(
+        self,
+        max_memory: int = 256 * _MiB,
+        max_disk: int = 4096 * _MiB,
+        spill_size: int = 16 * _MiB,
+        directory: t.Optional[str] = None,
+    ):
+        self.max_memory = max_memory
+        self.max_disk = max_disk
+        self.spill_size = min(spill_size, max_memory)
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[t.Hashable, _Entry]" = OrderedDict()
+        self._memory = self._disk = 0
+        self._hits = self._misses = 0
+
+    def stats(self) -> PDFCacheStats:
+        with self._lock:
+            return PDFCacheStats(
+                hits=self._hits, misses=self._misses, entries=len(self._entries), memory=self._memory, disk=self._disk
+            )
+
+    def __contains__(self, key: t.Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def open(self, key: t.Hashable) -> t.Optional[t.BinaryIO]:
+        """
+        Return a file-like of a cached content, None when it isn't cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return self._reader(entry)
+
+    @staticmethod
+    def _reader(entry: _Entry) -> t.BinaryIO:
+        if entry.data is not None:
+            return io.BytesIO(entry.data)
+        return MappedFile(mmap.mmap(entry.file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def fetch(self, key: t.Hashable, download: t.Callable[[t.BinaryIO], t.Any]) -> t.BinaryIO:
+        """
+        Return a file-like of a content, downloading it into the cache when it isn't cached
+
+        Args:
+            key: key of the content, e.g. the File ID
+            download: function writing the content to the binary file-like it is given
+
+        Returns:
+            File-like of the content
+        """
+        cached = self.open(key)
+        if cached is not None:
+            return cached
+        spool = _Spool(self.spill_size, self.directory)
+        try:
+            download(spool)
+        except BaseException:
+            if spool.file is not None:
+                spool.file.close()
+            raise
+        if spool.file is not None:
+            spool.file.flush()
+            entry = _Entry(spool.size, file=spool.file)
+        else:
+            entry = _Entry(spool.size, data=bytes(spool.buffer))
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = entry
+            if entry.file is not None:
+                self._disk += entry.size
+            else:
+                self._memory += entry.size
+            reader = self._reader(entry)
+            self._evict()
+        return reader
+
+    def _spill(self, entry: _Entry):
+        entry.file = tempfile.TemporaryFile(dir=self.directory)
+        entry.file.write(entry.data)
+        entry.file.flush()
+        entry.data = None
+        self._memory -= entry.size
+        self._disk += entry.size
+
+    def _evict(self):
+        if self._memory > self.max_memory:
+            for key, entry in list(self._entries.items()):
+                if self._memory <= self.max_memory:
+                    break
+                if entry.data is None:
+                    continue
+                if entry.size and entry.size <= self.max_disk:
+                    self._spill(entry)
+                else:
+                    self._discard(key)
+        if self._disk > self.max_disk:
+            for key, entry in list(self._entries.items()):
+                if self._disk <= self.max_disk:
+                    break
+                if entry.file is not None:
+                    self._discard(key)
+
+    def _discard(self, key: t.Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        if entry.file is not None:
+            # the memory maps already handed out keep the content readable
+            entry.file.close()
+            self._disk -= entry.size
+        else:
+            self._memory -= entry.size
+
+    def discard(self, key: t.Hashable):
+        """
+        Remove a content from the cache
+        """
+        with self._lock:
+            self._discard(key)
+
+    def clear(self):
+        """
+        Remove every content from the cache
+        """
+        with self._lock:
+            for key in list(self._entries):
+                self._discard(key)
+
+
+_cache = PDFCache()
+
+
+def pdf_cache() -> PDFCache:
+    """
+    Return the process-wide PDF cache used by :py:attr:`parble.models.File.pdf`
+    """
+    return _cache
+
+
+def configure_pdf_cache(**kwargs: t.Any) -> PDFCache:
+    """
+    Replace the process-wide PDF cache, dropping its contents
+
+    Args:
+        kwargs: arguments of :py:class:`PDFCache`: max_memory, max_disk, spill_size and directory
+
+    Returns:
+        The new PDF cache
+    """
+    global _cache
+    previous, _cache = _cache, PDFCache(**kwargs)
+    previous.clear()
+    return _cache
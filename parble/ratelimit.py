@@ -0,0 +1,132 @@
+import os
+import struct
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+from parble.exceptions import ConfigurationError
+from parble.settings import Settings
+
+try:
+    import fcntl
+except ImportError:  # no cov
+    fcntl = None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter
+
+    The bucket holds up to ``burst`` tokens and is refilled at ``rate`` tokens per second.
+    Each call takes a token, reserving it in advance when the bucket is empty: callers are then
+    spaced out at the sustained rate instead of bursting and backing off.
+
+    Args:
+        rate: sustained number of calls per second
+        burst: maximum number of calls allowed at once, defaults to one second worth of calls
+    """
+
+    def __init__(self, rate: float, burst: t.Optional[float] = None):
+        if rate <= 0:
+            raise ConfigurationError("rate limit must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = self._now()
+
+    @staticmethod
+    def _now() -> float:
+        return time.monotonic()
+
+    def _take(self, tokens: float, updated: float, now: float) -> t.Tuple[float, float]:
+        """
+        Refill the bucket then take a token
+
+        Returns:
+            The tokens left, possibly negative when the token is reserved, and the delay before using it
+        """
+        tokens = min(self.burst, tokens + (now - updated) * self.rate) - 1
+        return tokens, max(0.0, -tokens / self.rate)
+
+    def reserve(self) -> float:
+        """
+        Take a token without waiting
+
+        Returns:
+            Number of seconds to wait before the reserved call can be made
+        """
+        with self._lock:
+            now = self._now()
+            self._tokens, delay = self._take(self._tokens, self._updated, now)
+            self._updated = now
+        return delay
+
+    def acquire(self) -> float:
+        """
+        Take a token, waiting until the call can be made
+
+        Returns:
+            Number of seconds waited
+        """
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket shared by all the processes of a host through a state file
+
+    The bucket state is stored in ``path`` and updated under an exclusive ``flock``, so every process
+    using the same file shares the same budget. Only available on POSIX systems.
+
+    Args:
+        path: path of the state file, created if missing
+        rate: sustained number of calls per second
+        burst: maximum number of calls allowed at once, defaults to one second worth of calls
+    """
+
+    _state = struct.Struct("<dd")
+
+    def __init__(self, path: t.Union[str, Path], rate: float, burst: t.Optional[float] = None):
+        if fcntl is None:  # no cov
+            raise ConfigurationError("cross-process rate limiting requires fcntl (POSIX only)")
+        super().__init__(rate, burst)
+        self.path = Path(path)
+        # the file is re-opened per call so the bucket survives forks
+        self.path.touch(exist_ok=True)
+
+    @staticmethod
+    def _now() -> float:
+        # monotonic clocks are not comparable across processes
+        return time.time()
+
+    def reserve(self) -> float:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            data = os.pread(fd, self._state.size, 0)
+            now = self._now()
+            if len(data) == self._state.size:
+                tokens, updated = self._state.unpack(data)
+            else:
+                tokens, updated = self.burst, now
+            tokens, delay = self._take(tokens, min(updated, now), now)
+            os.pwrite(fd, self._state.pack(tokens, now), 0)
+        finally:
+            os.close(fd)
+        return delay
+
+
+def rate_limiter_from_settings(settings: Settings) -> t.Optional[TokenBucket]:
+    """
+    Build the rate limiter configured in the settings, None when rate limiting is disabled
+    """
+    if settings.rate_limit is None:
+        return None
+    if settings.rate_limit_file is not None:
+        return FileTokenBucket(settings.rate_limit_file, settings.rate_limit, settings.rate_limit_burst)
+    return TokenBucket(settings.rate_limit, settings.rate_limit_burst)
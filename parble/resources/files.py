@@ -1,9 +1,16 @@
+import logging
 import typing as t
 
 from pydantic import constr
+from requests import HTTPError, RequestException
 
+from ..exceptions import APICallError
+from ..multipart import MultipartEncoder
+from ..streaming import iter_array
 from .base import BaseResource
 
+logger = logging.getLogger(__name__)
+
 
 class FilesResource(BaseResource):
     __uri__ = "files"
@@ -14,7 +21,29 @@ class FilesResource(BaseResource):
         if res.ok:
             return None
 
-    def get(self, pk: str, content_type="application/json") -> t.Union[t.Dict[str, t.Any], bytes]:
+    def get(
+        self, pk: str, content_type="application/json", coalesce: bool = True
+    ) -> t.Union[t.Dict[str, t.Any], bytes]:
+        """
+        Get the given content of a file
+
+        With the ``coalesce_requests`` setting, concurrent calls for the same file and content type share
+        a single request and the same decoded payload.
+
+        Args:
+            pk: File ID to get
+            content_type: content type to get
+            coalesce: share the request with the concurrent identical calls, False when the caller already does
+
+        Returns:
+            Decoded JSON payload, or the raw content for other content types
+        """
+        flights = self._client.flights
+        if flights is None or not coalesce:
+            return self._get(pk, content_type)
+        return flights.do(("files.get", pk, content_type), lambda: self._get(pk, content_type))
+
+    def _get(self, pk: str, content_type: str) -> t.Union[t.Dict[str, t.Any], bytes]:
         uri = f"{self.__uri__}/{pk}"
         res = self._client.get(uri, headers={"Accept": content_type})
         if res.ok:
@@ -23,24 +52,188 @@ class FilesResource(BaseResource):
                 return res.json()
             return res.content
 
+    def fetch(self, pk: str) -> t.Tuple[t.Dict[str, t.Any], bool]:
+        """
+        Get the payload of a file, and whether it changed since it was last fetched
+
+        With the ``conditional_requests`` setting, the request is conditional on the last response: when the file
+        didn't change, the payload decoded from the last response is returned again, as the same object.
+
+        Args:
+            pk: File ID to get
+
+        Returns:
+            Payload of the file, and False when it was revalidated unchanged
+        """
+        uri = f"{self.__uri__}/{pk}"
+        res = self._client.get(uri, headers={"Accept": "application/json"})
+        representation = getattr(res, "representation", None)
+        if representation is None:
+            return res.json(), True
+        if representation.parsed is None:
+            representation.parsed = res.json()
+        return representation.parsed, not res.revalidated
+
+    def iter_documents(
+        self, pk: str, attributes: t.Optional[t.Dict[str, t.Any]] = None, chunk_size: int = 64 * 1024
+    ) -> t.Iterator[t.Dict[str, t.Any]]:
+        """
+        Stream the documents of a file, parsing the response incrementally
+
+        Each document is decoded as soon as it has been received, so the memory held is bounded by
+        the largest document rather than the whole response.
+
+        Args:
+            pk: File ID to get
+            attributes: optional dict updated with the other attributes of the file
+            chunk_size: size of the chunks read from the response
+
+        Yields:
+            Documents payloads
+        """
+        uri = f"{self.__uri__}/{pk}"
+        res = self._client.get(uri, headers={"Accept": "application/json"}, stream=True)
+        try:
+            yield from iter_array(res.iter_content(chunk_size), "documents", attributes)
+        except RequestException as exc:
+            raise APICallError(f"Reading {uri} failed") from exc
+        finally:
+            res.close()
+
+    def download(
+        self,
+        pk: str,
+        dest: t.BinaryIO,
+        content_type="application/pdf",
+        chunk_size: int = 64 * 1024,
+        offset: int = 0,
+        max_resumes: int = 3,
+    ) -> int:
+        """
+        Stream the given content of a file into dest, chunk by chunk
+
+        Interrupted transfers are resumed with HTTP Range requests. If the server ignores the range, the bytes
+        already written are skipped from the new response. A range starting at the end of the content is answered
+        with a 416 status: the download is then already complete.
+
+        Args:
+            pk: File ID to download
+            dest: binary file-like to write to
+            content_type: content type to download
+            chunk_size: size of the chunks read from the response
+            offset: number of bytes already downloaded in a previous transfer, requested with a Range
+            max_resumes: maximum number of times an interrupted transfer is resumed
+
+        Returns:
+            Number of bytes written to dest
+        """
+        uri = f"{self.__uri__}/{pk}"
+        written = 0
+        resumes = 0
+        while True:
+            position = offset + written
+            headers = {"Accept": content_type}
+            if position:
+                headers["Range"] = f"bytes={position}-"
+            try:
+                res = self._client.get(uri, headers=headers, stream=True)
+            except APICallError as exc:
+                if position and isinstance(exc.__cause__, HTTPError) and exc.__cause__.response.status_code == 416:
+                    return written
+                raise
+            try:
+                skip = position if position and res.status_code != 206 else 0
+                for chunk in res.iter_content(chunk_size):
+                    if skip:
+                        chunk, skip = chunk[skip:], max(0, skip - len(chunk))
+                        if not chunk:
+                            continue
+                    dest.write(chunk)
+                    written += len(chunk)
+                return written
+            except RequestException as exc:
+                if resumes >= max_resumes:
+                    raise APICallError(f"Download of {uri} interrupted after {position} bytes") from exc
+                resumes += 1
+                logger.debug("Download of %s interrupted after %d bytes (%r), resuming", uri, offset + written, exc)
+            finally:
+                res.close()
+
     def post(
         self,
         file_content: t.BinaryIO,
         file_name: str,
         inbox_id: constr(regex=r"^[a-f0-9]{24}$") = None,
         content_type: str = "application/octet-stream",
+        allow_redirects: bool = True,
     ) -> t.Dict[str, t.Any]:
-
-        files = {"file": (file_name, file_content, content_type)}
         payload = {}
         if inbox_id:
             payload["inbox_id"] = inbox_id
+        encoder = MultipartEncoder(payload, "file", file_name, file_content, content_type)
 
-        res = self._client.post(
-            self.__uri__,
-            files=files,
-            data=payload,
-            timeout=300,
-        )
+        # non-seekable files are sent with a chunked transfer encoding
+        with self._client.upload_slot():
+            res = self._client.post(
+                self.__uri__,
+                data=encoder if encoder.len is not None else iter(encoder),
+                headers={"Content-Type": encoder.content_type},
+                timeout=300,
+                allow_redirects=allow_redirects,
+            )
+        if res.status_code == 303:
+            # the processing is still running: only the id of the file is known
+            return {"id": res.headers["Location"].rstrip("/").rsplit("/", 1)[-1]}
         if res.ok:
             return res.json()
+
+
+class AsyncFilesResource(BaseResource):
+    """
+    asyncio counterpart of :py:class:`FilesResource`
+    """
+
+    __uri__ = "files"
+
+    async def delete(self, pk: str):
+        uri = f"{self.__uri__}/{pk}"
+        res = await self._client.delete(uri)
+        if res.is_success:
+            return None
+
+    async def get(
+        self, pk: str, content_type="application/json", coalesce: bool = True
+    ) -> t.Union[t.Dict[str, t.Any], bytes]:
+        flights = self._client.flights
+        if flights is None or not coalesce:
+            return await self._get(pk, content_type)
+        return await flights.do(("files.get", pk, content_type), lambda: self._get(pk, content_type))
+
+    async def _get(self, pk: str, content_type: str) -> t.Union[t.Dict[str, t.Any], bytes]:
+        uri = f"{self.__uri__}/{pk}"
+        res = await self._client.get(uri, headers={"Accept": content_type})
+        if res.is_success:
+            ct = res.headers.get("Content-Type", "application/json")
+            if ct == "application/json":
+                return res.json()
+            return res.content
+
+    async def post(
+        self,
+        file_content: t.BinaryIO,
+        file_name: str,
+        inbox_id: constr(regex=r"^[a-f0-9]{24}$") = None,
+        content_type: str = "application/octet-stream",
+    ) -> t.Dict[str, t.Any]:
+        payload = {}
+        if inbox_id:
+            payload["inbox_id"] = inbox_id
+        encoder = MultipartEncoder(payload, "file", file_name, file_content, content_type)
+        headers = {"Content-Type": encoder.content_type}
+        if encoder.len is not None:
+            headers["Content-Length"] = str(encoder.len)
+
+        async with self._client.upload_slot():
+            res = await self._client.post(self.__uri__, content=encoder.aiter(), headers=headers, timeout=300)
+        if res.is_success:
+            return res.json()
@@ -0,0 +1,168 @@
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Collection, Optional
+
+from requests import ConnectionError, ConnectTimeout, Response, Timeout
+from requests.exceptions import ChunkedEncodingError
+from urllib3.exceptions import NewConnectionError
+
+from parble.settings import Settings
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Parse a Retry-After header value
+
+    Args:
+        value: header value, either a number of seconds or an HTTP date
+        now: reference time for HTTP dates, defaults to the current time
+
+    Returns:
+        Number of seconds to wait, None if the value is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if date is None:
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (date - now).total_seconds())
+
+
+def is_connect_error(exc: BaseException) -> bool:
+    """
+    Tell whether the error happened while connecting, i.e. before anything was sent to the server
+    """
+    if isinstance(exc, ConnectTimeout):
+        return True
+    if isinstance(exc, ConnectionError) and exc.args:
+        reason = getattr(exc.args[0], "reason", exc.args[0])
+        return isinstance(reason, NewConnectionError)
+    return False
+
+
+class RetryPolicy:
+    """
+    Retry policy of the API calls: exponential backoff with full jitter, bounded by a total time budget.
+
+    Idempotent methods are retried on any transport error and on the retryable statuses.
+    Other methods (e.g. the multipart upload POST) are only retried when the server could not have
+    processed the request: connect-phase failures, and 429 responses, the API rejecting the call before handling it.
+    Uploads are thus retried on 429, but not on 5xx responses or read timeouts, which could process a file twice.
+
+    Args:
+        max_retries: maximum number of retries of a single call, 0 disables retries
+        backoff_factor: base delay in seconds, doubled at each attempt
+        backoff_max: maximum delay between two attempts
+        budget: maximum time in seconds spent on a call including its retries, None for no limit
+        statuses: response status codes to retry
+        sleep: function used to wait between attempts
+    """
+
+    idempotent_methods = IDEMPOTENT_METHODS
+
+    def __init__(
+        self,
+        max_retries: int = 0,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30.0,
+        budget: Optional[float] = None,
+        statuses: Collection[int] = (429, 500, 502, 503, 504),
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.budget = budget
+        self.statuses = frozenset(statuses)
+        self.sleep = sleep
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "RetryPolicy":
+        return cls(
+            max_retries=settings.max_retries,
+            backoff_factor=settings.retry_backoff_factor,
+            backoff_max=settings.retry_backoff_max,
+            budget=settings.retry_budget,
+            statuses=settings.retry_statuses,
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Full jitter delay before the given retry attempt (starting at 1)
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * 2 ** (attempt - 1)))
+
+    def is_retryable_error(self, method: str, exc: BaseException) -> bool:
+        if method.upper() in self.idempotent_methods:
+            return isinstance(exc, (ConnectionError, Timeout, ChunkedEncodingError))
+        return is_connect_error(exc)
+
+    def is_retryable_response(self, method: str, response: Response) -> bool:
+        if response.status_code not in self.statuses:
+            return False
+        return method.upper() in self.idempotent_methods or response.status_code == 429
+
+    def start(self) -> "RetryState":
+        """
+        Start tracking the retries of a new call
+        """
+        return RetryState(self)
+
+
+class RetryState:
+    """
+    Retry bookkeeping of a single call
+    """
+
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+        self.attempt = 0
+        self._started = time.monotonic()
+
+    def next_delay(
+        self, method: str, response: Optional[Response] = None, error: Optional[Exception] = None
+    ) -> Optional[float]:
+        """
+        Compute the delay before retrying the failed attempt
+
+        Args:
+            method: HTTP method of the call
+            response: response of the attempt, if any
+            error: error raised by the attempt, if any
+
+        Returns:
+            Seconds to wait before the next attempt, None if the call must not be retried
+        """
+        policy = self.policy
+        if self.attempt >= policy.max_retries:
+            return None
+        if error is not None:
+            if not policy.is_retryable_error(method, error):
+                return None
+        elif response is None or not policy.is_retryable_response(method, response):
+            return None
+
+        self.attempt += 1
+        delay = policy.backoff(self.attempt)
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                # a far away Retry-After would block the caller, and the slots it holds, for that long
+                delay = min(retry_after, policy.backoff_max)
+
+        if policy.budget is not None and time.monotonic() - self._started + delay > policy.budget:
+            return None
+        return delay
@@ -1,12 +1,149 @@
+import random
+import threading
 import typing as t
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from io import BytesIO
 from mimetypes import guess_type
 from pathlib import Path
 
 from pydantic import constr
 
+from .cache import ResultCache
 from .client import ParbleAPIClient
-from .models import File
+from .dedup import Upload, UploadIndex, content_hash
+from .exceptions import NotFoundError
+from .futures import FilePoller, ProcessingFuture
+from .models import Document, File
+
+
+def guess_content_type(path: Path) -> str:
+    """
+    Guess the content type of a local file, defaulting to an octet stream
+    """
+    file_type, encoding = guess_type(path)
+    return file_type or "application/octet-stream"
+
+
+class BaseFiles:
+    """
+    Shared behavior of the sync and asyncio Files helpers
+    """
+
+    def __init__(self, sdk):
+        self._sdk = sdk
+        self.cache = ResultCache.from_settings(sdk.client.settings)
+        self.uploads = UploadIndex.from_settings(sdk.client.settings)
+
+    def cache_stats(self):
+        """
+        Return the statistics of the result cache
+
+        Returns:
+            Hits, misses and size of the cache, None when the ``result_cache`` setting is not set
+        """
+        return self.cache.stats() if self.cache is not None else None
+
+    def _cached(self, file_id: str) -> t.Optional[t.Dict[str, t.Any]]:
+        """
+        Return the cached payload of a processed File
+        """
+        if self.cache is None:
+            return None
+        return self.cache.get(str(self._sdk.client.settings.url), file_id)
+
+    def _store(self, res: t.Dict[str, t.Any]):
+        """
+        Cache the payload of a File from the API, if it is processed
+        """
+        if self.cache is not None and "id" in res:
+            self.cache.put(str(self._sdk.client.settings.url), res["id"], res)
+
+    def _forget(self, file_id: str):
+        if self.cache is not None:
+            self.cache.delete(str(self._sdk.client.settings.url), file_id)
+        if self.uploads is not None:
+            self.uploads.forget(file_id)
+
+    def _indexes(self, fp: t.BinaryIO) -> bool:
+        """
+        Whether the content to upload goes through the upload index: it must be enabled, and the content seekable
+        to be read twice
+        """
+        return self.uploads is not None and getattr(fp, "seekable", lambda: False)()
+
+    def _index_key(self, inbox_id: t.Optional[str], digest: str) -> t.Tuple[str, str]:
+        return UploadIndex.key(str(self._sdk.client.settings.url), inbox_id), digest
+
+    def _upload_key(self, fp: t.BinaryIO, inbox_id: t.Optional[str]) -> t.Optional[t.Tuple[str, str]]:
+        """
+        Hash the content to upload, returning its upload index namespace and digest
+
+        Returns:
+            None when the upload index is disabled, or the content can't be read twice
+        """
+        if not self._indexes(fp):
+            return None
+        return self._index_key(inbox_id, content_hash(fp))
+
+    def _previous_upload(self, key: t.Optional[t.Tuple[str, str]]) -> t.Optional[Upload]:
+        return self.uploads.lookup(*key) if key is not None else None
+
+    def _record_upload(self, key: t.Optional[t.Tuple[str, str]], res: t.Dict[str, t.Any]):
+        """
+        Index the File a content was uploaded as, from the upload response
+        """
+        if key is not None:
+            self.uploads.record(*key, res["id"], bool((res.get("timings") or {}).get("done")))
+
+    def _reused(self, key: t.Tuple[str, str], previous: Upload, file: File) -> File:
+        """
+        Update the completion state of a previous upload with the File fetched for it
+        """
+        if file.is_done != previous.done:
+            self.uploads.record(*key, file.id, file.is_done)
+        return file
+
+    def validates(self, validate: t.Optional[bool] = None) -> bool:
+        """
+        Whether a payload from the API should be validated
+
+        Args:
+            validate: per call choice, defaults to the ``validate_models`` setting. When models are not validated,
+                a ``validation_sample_rate`` share of the payloads is still validated to catch unexpected data.
+        """
+        if validate is not None:
+            return validate
+        settings = self._sdk.client.settings
+        if settings.validate_models:
+            return True
+        return settings.validation_sample_rate > 0 and random.random() < settings.validation_sample_rate
+
+    def create(self, validate: t.Optional[bool] = None, lazy: t.Optional[bool] = None, **attrs: t.Any) -> File:
+        """
+        Create a File object from a dict of attributes
+
+        On top of the attributes from the API, Files require to be bound to an active SDK instance,
+        which this helper function makes sure.
+
+        Args:
+            validate: validate the attributes, or trust them and skip the validation,
+                defaults to the ``validate_models`` setting
+            lazy: build the documents only when they are accessed, defaults to the ``lazy_documents`` setting
+            attrs: Attributes payload from the API Call
+
+        Returns:
+            parsed File object
+        """
+        if lazy is None:
+            lazy = self._sdk.client.settings.lazy_documents
+        validate = self.validates(validate)
+        if lazy:
+            return File.construct_lazy(attrs, sdk=self._sdk, validate=validate)
+        if not validate:
+            return File.construct_trusted(attrs, sdk=self._sdk)
+        attrs["sdk"] = self._sdk
+        return File.parse_obj(attrs)
 
 
 class ParbleSDK:
@@ -15,28 +152,203 @@ class ParbleSDK:
 
     This class exposes primitives built on top of the :py:class:`ParbleAPIClient`
 
+    With ``validate=False``, the payloads from the API are trusted and the Files are built without validation,
+    which is much faster for large payloads. It can also be chosen per call.
     """
 
-    def __init__(self, url=None, api_key=None):
-
-        self.client = ParbleAPIClient(url=url, api_key=api_key)
+    def __init__(self, url=None, api_key=None, validate: t.Optional[bool] = None, **settings):
+        if validate is not None:
+            settings["validate_models"] = validate
+        self.client = ParbleAPIClient(url=url, api_key=api_key, **settings)
         self.files = self.Files(self)
 
-    class Files:
+    def close(self):
+        """
+        Stop the background uploads and polling, then close the underlying connections
+        """
+        self.files.close()
+        self.client._client.close()
+
+    class Files(BaseFiles):
         """
         Files helper to upload, get processed elements, etc
         """
 
         def __init__(self, sdk: "ParbleSDK"):
-            self._sdk = sdk
+            super().__init__(sdk)
+            self._lock = threading.Lock()
+            self._submit_executor: t.Optional[ThreadPoolExecutor] = None
+            self._poller: t.Optional[FilePoller] = None
+            self._submitted: t.Set[ProcessingFuture] = set()
+            self._closed = False
+            # last File built per ID, returned again when its payload is revalidated unchanged
+            self._revalidated: "OrderedDict[str, t.Tuple[t.Dict[str, t.Any], t.Tuple, File]]" = OrderedDict()
+
+        @property
+        def poller(self) -> FilePoller:
+            """
+            Poller resolving the futures of the submitted files
+            """
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Files is closed")
+                if self._poller is None:
+                    settings = self._sdk.client.settings
+                    self._poller = FilePoller(
+                        self._sdk,
+                        interval=settings.poll_interval,
+                        max_interval=settings.poll_max_interval,
+                        workers=settings.poll_workers,
+                    )
+                return self._poller
+
+        def close(self):
+            """
+            Cancel the pending submitted uploads and stop polling
+
+            The uploads already running complete, but their futures are cancelled too.
+            """
+            with self._lock:
+                self._closed = True
+                executor, self._submit_executor = self._submit_executor, None
+                poller, self._poller = self._poller, None
+                submitted, self._submitted = self._submitted, set()
+            for future in submitted:
+                # the queued uploads are skipped by _submit
+                future.cancel()
+            if executor is not None:
+                executor.shutdown(wait=True)
+            if poller is not None:
+                poller.close()
+            if self.cache is not None:
+                self.cache.close()
+            if self.uploads is not None:
+                self.uploads.close()
+
+        def _uploaded(self, res: t.Dict[str, t.Any], validate: t.Optional[bool] = None) -> File:
+            """
+            Create the File returned by an upload, reporting its processing time to the concurrency limiter
+            """
+            self._store(res)
+            file = self.create(validate=validate, **res)
+            limiter = self._sdk.client._client.concurrency
+            if limiter is not None and file.timings.processing_time is not None:
+                limiter.observe_processing(file.timings.processing_time)
+            return file
+
+        def _observe_future(self, future: ProcessingFuture):
+            limiter = self._sdk.client._client.concurrency
+            if limiter is None or future.cancelled() or future.exception() is not None:
+                return
+            if future.result().timings.processing_time is not None:
+                limiter.observe_processing(future.result().timings.processing_time)
 
-        def post(self, path: t.Union[str, Path], inbox_id: constr(regex=r"^[a-f0-9]{24}$") = None) -> File:
+        def _reuse(self, key: t.Optional[t.Tuple[str, str]], validate: t.Optional[bool] = None) -> t.Optional[File]:
+            """
+            Return the File a content was already uploaded as, None when it is new or the File was deleted
+            """
+            previous = self._previous_upload(key)
+            if previous is None:
+                return None
+            try:
+                file = self.get(previous.file_id, validate=validate)
+            except NotFoundError:
+                self.uploads.forget(previous.file_id)
+                return None
+            return self._reused(key, previous, file)
+
+        def _post(
+            self,
+            file: t.BinaryIO,
+            file_name: str,
+            file_type: str,
+            inbox_id: t.Optional[str],
+            validate: t.Optional[bool],
+        ) -> File:
+            key = self._upload_key(file, inbox_id)
+            existing = self._reuse(key, validate=validate)
+            if existing is not None:
+                return existing
+            res = self._sdk.client.files.post(file, file_name, inbox_id=inbox_id, content_type=file_type)
+            self._record_upload(key, res)
+            return self._uploaded(res, validate=validate)
+
+        def submit(
+            self, path: t.Union[str, Path], inbox_id: constr(regex=r"^[a-f0-9]{24}$") = None
+        ) -> ProcessingFuture:
+            """
+            Upload the file at the given local path in the background, without waiting for its processing
+
+            The upload runs on a pool of ``submit_workers`` threads. Once accepted, if the API did not complete
+            the processing within its synchronous window, the file is handed over to a shared poller which
+            fetches it with an adaptive interval until it is done.
+
+            Args:
+                path: local path of the file to upload
+                inbox_id: optional uuid of the inbox to upload to
+
+            Returns:
+                Future resolving to the processed File
+            """
+            future = ProcessingFuture()
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Files is closed")
+                self._submitted.add(future)
+                future.add_done_callback(self._untrack)
+                if self._submit_executor is None:
+                    self._submit_executor = ThreadPoolExecutor(
+                        max_workers=self._sdk.client.settings.submit_workers, thread_name_prefix="parble-submit"
+                    )
+                self._submit_executor.submit(self._submit, future, Path(path), inbox_id)
+            return future
+
+        def _untrack(self, future: ProcessingFuture):
+            with self._lock:
+                self._submitted.discard(future)
+
+        def _submit(self, future: ProcessingFuture, path: Path, inbox_id: t.Optional[str]):
+            if future.cancelled():
+                return
+            try:
+                with open(path.absolute(), "rb") as f:
+                    key = self._upload_key(f, inbox_id)
+                    existing = self._reuse(key)
+                    if existing is not None:
+                        future.file_id = existing.id
+                        if existing.is_done:
+                            future.resolve(existing)
+                            return
+                        self.poller.watch(future.file_id, future)
+                        return
+                    res = self._sdk.client.files.post(
+                        f, path.name, inbox_id=inbox_id, content_type=guess_content_type(path), allow_redirects=False
+                    )
+                future.file_id = res["id"]
+                self._record_upload(key, res)
+                if "timings" in res:
+                    file = self._uploaded(res)
+                    if file.is_done:
+                        future.resolve(file)
+                        return
+                future.add_done_callback(self._observe_future)
+                self.poller.watch(future.file_id, future)
+            except Exception as exc:
+                future.resolve(exception=exc)
+
+        def post(
+            self,
+            path: t.Union[str, Path],
+            inbox_id: constr(regex=r"^[a-f0-9]{24}$") = None,
+            validate: t.Optional[bool] = None,
+        ) -> File:
             """
             Upload and process the file at the given local path
 
             Args:
                 path: local path of the file to upload
                 inbox_id: optional uuid of the inbox to upload to
+                validate: validate the response, defaults to the ``validate_models`` setting
 
             Returns:
                 Processed File response
@@ -44,13 +356,71 @@ class ParbleSDK:
             if not isinstance(path, Path):
                 path = Path(path)
 
-            file_name = path.name
-            file_type, encoding = guess_type(path)
-            if not file_type:
-                file_type = "application/octet-stream"
             with open(path.absolute(), "rb") as f:
-                res = self._sdk.client.files.post(f, file_name, inbox_id=inbox_id, content_type=file_type)
-            return self.create(**res)
+                return self._post(f, path.name, guess_content_type(path), inbox_id, validate)
+
+        def post_many(
+            self,
+            paths: t.Iterable[t.Union[str, Path]],
+            inbox_id: constr(regex=r"^[a-f0-9]{24}$") = None,
+            max_workers: t.Optional[int] = None,
+            ordered: bool = False,
+            validate: t.Optional[bool] = None,
+        ) -> t.Iterator[t.Tuple[t.Union[str, Path], t.Union[File, Exception]]]:
+            """
+            Upload and process many local files concurrently
+
+            Uploads run on a pool of ``max_workers`` threads and at most ``max_workers`` paths are consumed
+            from ``paths`` ahead of the results, so it can be a lazy iterable of any size.
+            A failed upload does not abort the batch: its exception is yielded in place of the File.
+
+            Closing the returned generator (or breaking out of the loop) cancels the pending uploads
+            and waits for the running ones to complete.
+
+            Args:
+                paths: local paths of the files to upload
+                inbox_id: optional uuid of the inbox to upload to
+                max_workers: maximum number of concurrent uploads, defaults to 8 or to ``concurrency_max`` when
+                    adaptive concurrency is enabled, the adaptive limiter then finding the actual concurrency
+                ordered: yield the results in the order of ``paths`` instead of as soon as they complete
+                validate: validate the responses, defaults to the ``validate_models`` setting
+
+            Yields:
+                (path, processed File or raised exception) pairs
+            """
+            if max_workers is None:
+                settings = self._sdk.client.settings
+                max_workers = settings.concurrency_max if settings.adaptive_concurrency else 8
+            paths = iter(paths)
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="parble-upload")
+            pending: t.Deque[t.Tuple[t.Union[str, Path], Future]] = deque()
+
+            def submit_next() -> bool:
+                for path in paths:
+                    pending.append((path, executor.submit(self.post, path, inbox_id=inbox_id, validate=validate)))
+                    return True
+                return False
+
+            try:
+                for _ in range(max_workers):
+                    if not submit_next():
+                        break
+
+                while pending:
+                    if ordered:
+                        path, fut = pending.popleft()
+                    else:
+                        wait([f for _, f in pending], return_when=FIRST_COMPLETED)
+                        path, fut = next((p, f) for p, f in pending if f.done())
+                        pending.remove((path, fut))
+
+                    exc = fut.exception()
+                    yield path, exc if exc is not None else fut.result()
+                    submit_next()
+            finally:
+                for _, fut in pending:
+                    fut.cancel()
+                executor.shutdown(wait=True)
 
         def post_file(
             self,
@@ -58,6 +428,7 @@ class ParbleSDK:
             file_name: str,
             file_type="application/octet-stream",
             inbox_id: constr(regex=r"^[a-f0-9]{24}$") = None,
+            validate: t.Optional[bool] = None,
         ) -> File:
             """
             Upload and process the given file-like
@@ -71,51 +442,136 @@ class ParbleSDK:
                 file_name: Filename to be used
                 inbox_id: optional uuid of the inbox to upload to
                 file_type: Content Type of the file
+                validate: validate the response, defaults to the ``validate_models`` setting
 
             Returns:
                 Processed File data
             """
-            res = self._sdk.client.files.post(file, file_name, inbox_id=inbox_id, content_type=file_type)
-            return self.create(**res)
+            return self._post(file, file_name, file_type, inbox_id, validate)
 
-        def get(self, file_id: str) -> File:
+        def get(self, file_id: str, validate: t.Optional[bool] = None, lazy: t.Optional[bool] = None) -> File:
             """
             Retrieve the given File payload
 
+            With the ``conditional_requests`` setting, when the File didn't change since the last call,
+            the File built last time is returned again without parsing the payload.
+            With the ``coalesce_requests`` setting, concurrent calls for the same File share a single request
+            and get the same File.
+
             Args:
                 file_id: File ID to get
+                validate: validate the response, defaults to the ``validate_models`` setting
+                lazy: build the documents only when they are accessed, defaults to the ``lazy_documents`` setting
 
             Returns:
                 Matching File
             """
-            res = self._sdk.client.files.get(file_id)
-            return self.create(**res)
+            flights = self._sdk.client.flights
+            if flights is None:
+                return self._get(file_id, validate, lazy)
+            return flights.do(("file", file_id, validate, lazy), lambda: self._get(file_id, validate, lazy))
+
+        def _get(self, file_id: str, validate: t.Optional[bool], lazy: t.Optional[bool]) -> File:
+            res = self._cached(file_id)
+            if res is not None:
+                return self.create(validate=validate, lazy=lazy, **res)
+            if self._sdk.client.settings.conditional_requests:
+                return self._get_conditional(file_id, validate, lazy)
+            if self._sdk.client.flights is not None:
+                # within the flight of get: the request isn't coalesced a second time
+                res = self._sdk.client.files.get(file_id, coalesce=False)
+            else:
+                res = self._sdk.client.files.get(file_id)
+            self._store(res)
+            return self.create(validate=validate, lazy=lazy, **res)
 
-        def get_pdf(self, file_id: str) -> t.BinaryIO:
+        def _get_conditional(self, file_id: str, validate: t.Optional[bool], lazy: t.Optional[bool]) -> File:
             """
-            Retrieve the given File PDF content
+            Get a File with a conditional request, returning the File built last time when it didn't change
+            """
+            res, fresh = self._sdk.client.files.fetch(file_id)
+            options = (validate, lazy)
+            with self._lock:
+                previous = self._revalidated.get(file_id)
+            if not fresh and previous is not None and previous[0] is res and previous[1] == options:
+                return previous[2]
+            self._store(res)
+            file = self.create(validate=validate, lazy=lazy, **res)
+            with self._lock:
+                self._revalidated[file_id] = (res, options, file)
+                self._revalidated.move_to_end(file_id)
+                while len(self._revalidated) > self._sdk.client.settings.conditional_cache_entries:
+                    self._revalidated.popitem(last=False)
+            return file
+
+        def iter_documents(
+            self,
+            file_id: str,
+            attributes: t.Optional[t.Dict[str, t.Any]] = None,
+            validate: t.Optional[bool] = None,
+        ) -> t.Iterator[Document]:
+            """
+            Stream the documents of the given File one by one
+
+            The response is parsed incrementally while it is received: the memory held is bounded by
+            the largest document instead of the whole File, which suits very large files.
 
             Args:
                 file_id: File ID to get
+                attributes: optional dict filled with the other attributes of the File as they are parsed
+                validate: validate the documents, defaults to the ``validate_models`` setting
 
-            Returns:
-                File-like PDF content
+            Yields:
+                Documents of the File
             """
-            res = self._sdk.client.files.get(file_id, content_type="application/pdf")
-            return BytesIO(res)
+            validate = self.validates(validate)
+            for doc in self._sdk.client.files.iter_documents(file_id, attributes=attributes):
+                yield Document.parse_obj(doc) if validate else Document.construct_trusted(doc)
 
-        def create(self, **attrs: t.Any) -> File:
+        def get_pdf(
+            self,
+            file_id: str,
+            dest: t.Union[str, Path, t.BinaryIO, None] = None,
+            chunk_size: int = 64 * 1024,
+            resume: bool = False,
+        ) -> t.Union[t.BinaryIO, Path]:
             """
-            Create a File object from a dict of attributes
+            Retrieve the given File PDF content
 
-            On top of the attributes from the API, Files require to be bound to an active SDK instance,
-            which this helper function makes sure.
+            Without dest, the whole content is loaded in memory. Otherwise it is streamed to dest chunk by chunk,
+            resuming interrupted transfers.
 
             Args:
-                attrs: Attributes payload from the API Call
+                file_id: File ID to get
+                dest: optional local path or binary file-like to stream the content to
+                chunk_size: size of the streamed chunks
+                resume: when dest is a path to an existing partial download, only fetch the missing bytes
 
             Returns:
-                parsed File object
+                File-like PDF content, or dest when given
+            """
+            if dest is None:
+                res = self._sdk.client.files.get(file_id, content_type="application/pdf")
+                return BytesIO(res)
+
+            if not isinstance(dest, (str, Path)):
+                self._sdk.client.files.download(file_id, dest, chunk_size=chunk_size)
+                return dest
+
+            dest = Path(dest)
+            offset = dest.stat().st_size if resume and dest.exists() else 0
+            with open(dest, "ab" if offset else "wb") as f:
+                self._sdk.client.files.download(file_id, f, chunk_size=chunk_size, offset=offset)
+            return dest
+
+        def delete(self, file_id: str) -> None:
+            """
+            Delete the given File
+
+            Args:
+                file_id: File ID to delete
             """
-            attrs["sdk"] = self._sdk
-            return File.parse_obj(attrs)
+            self._sdk.client.files.delete(file_id)
+            self._forget(file_id)
+            with self._lock:
+                self._revalidated.pop(file_id, None)
@@ -0,0 +1,118 @@
+import json
+import typing as t
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from parble.models import File
+
+if t.TYPE_CHECKING:
+    from parble.sdk import ParbleSDK
+
+try:
+    import orjson
+except ImportError:  # no cov
+    orjson = None
+
+
+def _default(obj: t.Any) -> t.Any:
+    """
+    Convert the objects the JSON backends don't know about
+
+    Only the fields of the models are serialized, never their SDK binding.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if hasattr(obj, "to_json_struct"):
+        # lazy documents and fields
+        return obj.to_json_struct()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: t.Any) -> bytes:
+    """
+    Serialize a File, or any structure of models, to JSON bytes
+
+    orjson is used when installed (``pip install 'parble[fast]'``), datetimes are written in ISO 8601 format.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def loads(data: t.Union[bytes, str]) -> t.Any:
+    """
+    Deserialize JSON bytes, with orjson when installed
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def file_to_json(file: File) -> bytes:
+    """
+    Serialize a File to JSON bytes, without its SDK binding
+
+    Args:
+        file: File to serialize
+
+    Returns:
+        JSON bytes
+    """
+    return dumps(file)
+
+
+def file_from_json(data: t.Union[bytes, str], sdk: t.Optional["ParbleSDK"] = None, validate: bool = False) -> File:
+    """
+    Deserialize a File written by :py:func:`file_to_json`, binding it to sdk
+
+    Args:
+        data: JSON bytes or string
+        sdk: live SDK instance the File is bound to, to fetch its PDF content
+        validate: validate the data, which is trusted by default as written by this SDK
+
+    Returns:
+        File object
+    """
+    attrs = loads(data)
+    if validate:
+        return File(sdk=sdk, **attrs)
+    return File.construct_trusted(attrs, sdk=sdk)
+
+
+def dump_json_lines(files: t.Iterable[File], fp: t.BinaryIO) -> int:
+    """
+    Write Files to a binary file-like, one JSON document per line
+
+    Args:
+        files: Files to write
+        fp: binary file-like to write to
+
+    Returns:
+        Number of Files written
+    """
+    count = 0
+    for file in files:
+        fp.write(dumps(file))
+        fp.write(b"\n")
+        count += 1
+    return count
+
+
+def load_json_lines(fp: t.BinaryIO, sdk: t.Optional["ParbleSDK"] = None, validate: bool = False) -> t.Iterator[File]:
+    """
+    Read the Files written by :py:func:`dump_json_lines`, binding them to sdk
+
+    Args:
+        fp: binary file-like to read from
+        sdk: live SDK instance the Files are bound to
+        validate: validate the data, which is trusted by default as written by this SDK
+
+    Yields:
+        File objects
+    """
+    for line in fp:
+        if line.strip():
+            yield file_from_json(line, sdk=sdk, validate=validate)
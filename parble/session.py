@@ -1,18 +1,32 @@
+import logging
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Optional
 from urllib.parse import urljoin
 
 from requests import HTTPError, PreparedRequest, Request, RequestException, Response, Session
 from requests import Timeout as RequestTimeout
+from requests.utils import rewind_body
 
 from parble._version import __version__
+from parble.adapters import ParbleHTTPAdapter, PoolStats
+from parble.circuitbreaker import CircuitBreaker, CircuitStats
+from parble.concurrency import AdaptiveLimiter, LimiterStats, Slot
+from parble.conditional import ConditionalStats, RepresentationCache
 from parble.exceptions import APICallError, CallTimeoutError, handlers
+from parble.ratelimit import rate_limiter_from_settings
+from parble.retry import RetryPolicy
 from parble.settings import Settings
 
+logger = logging.getLogger(__name__)
+
 
 class BaseSession(Session):
     """
     Base requests session with shared behavior for the API Calls.
 
-    Provides base url support, custom headers and common error handling.
+    Provides base url support, custom headers, connection pooling, retries, rate limiting,
+    adaptive concurrency, circuit breaking, conditional requests and common error handling.
     """
 
     def __init__(self, settings: Settings):
@@ -22,12 +36,49 @@ class BaseSession(Session):
 
     def initialize(self):
         """
-        Initialize the session by setting the headers to use
+        Initialize the session by setting the headers to use and mounting the pooled adapter
         """
         self.headers["X-API-Key"] = self._settings.api_key.get_secret_value()
         self.headers["Accept"] = "application/json"
         self.headers["User-Agent"] = f"parble-python/{__version__}"
 
+        self._adapter = ParbleHTTPAdapter(
+            pool_connections=self._settings.pool_connections,
+            pool_maxsize=self._settings.pool_maxsize,
+            pool_block=self._settings.pool_block,
+            keep_alive=self._settings.keep_alive_timeout,
+        )
+        self.mount("https://", self._adapter)
+        self.mount("http://", self._adapter)
+
+        self.retry_policy = RetryPolicy.from_settings(self._settings)
+        self.rate_limiter = rate_limiter_from_settings(self._settings)
+        self.concurrency = AdaptiveLimiter.from_settings(self._settings)
+        self.circuit_breaker = CircuitBreaker.from_settings(self._settings)
+        self.representations = RepresentationCache.from_settings(self._settings)
+        uploads = self._settings.max_concurrent_uploads
+        self._upload_slots = threading.BoundedSemaphore(uploads) if uploads else None
+
+    def pool_stats(self) -> PoolStats:
+        """
+        Return the connection pool statistics of this session
+
+        Returns:
+            Connections opened, reused and currently idle
+        """
+        return self._adapter.stats()
+
+    @contextmanager
+    def upload_slot(self):
+        """
+        Context manager holding one of the ``max_concurrent_uploads`` slots of this session
+        """
+        if self._upload_slots is None:
+            yield
+            return
+        with self._upload_slots:
+            yield
+
     def build_url(self, url: str) -> str:
         """
         Join the base URL with the provided URI
@@ -42,18 +93,135 @@ class BaseSession(Session):
         """
         return urljoin(str(self._settings.url), url)
 
+    def _conditional(self, method: str, url: str, kwargs: dict):
+        """
+        Make a GET request conditional on the representation stored from a previous response
+
+        Only JSON requests are conditional: other contents, e.g. PDFs, are too large to be kept in memory.
+        Streamed and range requests are left as they are.
+
+        Returns:
+            Key of the request and the stored representation, None when the request isn't conditional
+        """
+        headers = kwargs.get("headers") or {}
+        if self.representations is None or method.upper() != "GET" or kwargs.get("stream") or "Range" in headers:
+            return None
+        if headers.get("Accept", self.headers["Accept"]) != "application/json":
+            return None
+        key = (self.build_url(url), repr(kwargs.get("params")))
+        stored = self.representations.get(key)
+        if stored is not None:
+            kwargs["headers"] = dict(headers, **stored.validators)
+        return key, stored
+
     def request(self, method: str, url: str, *args, **kwargs) -> Response:
         kwargs.setdefault("timeout", self._settings.default_timeout)
-        try:
-            resp = super().request(method, url, *args, **kwargs)
-            resp.raise_for_status()
-            return resp
-        except RequestTimeout as exc:
-            raise CallTimeoutError from exc
-        except HTTPError as exc:
-            self.parse_error(exc)
-        except RequestException as exc:
-            raise APICallError from exc
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_call()
+        conditional = self._conditional(method, url, kwargs)
+        with self.concurrency.slot(method.upper()) if self.concurrency else nullcontext() as slot:
+            try:
+                resp = super().request(method, url, *args, **kwargs)
+                self._record_outcome(
+                    slot, overloaded=resp.status_code == 429 or resp.status_code >= 500, failed=resp.status_code >= 500
+                )
+                if conditional is not None:
+                    resp = self.representations.update(*conditional, resp)
+                resp.raise_for_status()
+                return resp
+            except RequestTimeout as exc:
+                self._record_outcome(slot, overloaded=True, failed=True, timeout=True)
+                raise CallTimeoutError from exc
+            except HTTPError as exc:
+                self.parse_error(exc)
+            except RequestException as exc:
+                self._record_outcome(slot, overloaded=True, failed=True)
+                raise APICallError from exc
+
+    def _record_outcome(self, slot: Optional[Slot], overloaded: bool, failed: bool, timeout: bool = False):
+        """
+        Report the outcome of a call to the adaptive concurrency limiter and the circuit breaker
+        """
+        if slot is not None and overloaded:
+            slot.overloaded()
+        if self.circuit_breaker is not None:
+            if failed:
+                self.circuit_breaker.record_failure(timeout=timeout)
+            else:
+                self.circuit_breaker.record_success()
+
+    def circuit_stats(self) -> Optional[CircuitStats]:
+        """
+        Return the state of the circuit breaker, None when it is disabled
+
+        Returns:
+            Circuit state and failure statistics of the sliding window
+        """
+        if self.circuit_breaker is None:
+            return None
+        return self.circuit_breaker.stats()
+
+    def conditional_stats(self) -> Optional[ConditionalStats]:
+        """
+        Return the statistics of the conditional requests, None when they are disabled
+
+        Returns:
+            Stored representations and the number of responses revalidated
+        """
+        if self.representations is None:
+            return None
+        return self.representations.stats()
+
+    def concurrency_stats(self) -> Optional[LimiterStats]:
+        """
+        Return the state of the adaptive concurrency limiter, None when it is disabled
+
+        Returns:
+            Current limit, calls in flight and latency estimates
+        """
+        if self.concurrency is None:
+            return None
+        return self.concurrency.stats()
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        """
+        Send the prepared request, retrying transient failures according to the retry policy
+
+        A request whose streamed body can't be rewound, e.g. a one-shot iterator, is sent only once.
+        """
+        state = self.retry_policy.start()
+        replayable = self._replayable(request)
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                resp = super().send(request, **kwargs)
+            except RequestException as exc:
+                delay = state.next_delay(request.method, error=exc) if replayable else None
+                if delay is None:
+                    raise
+                logger.debug("%s %s failed (%r), retrying in %.2fs", request.method, request.url, exc, delay)
+            else:
+                delay = state.next_delay(request.method, response=resp) if replayable else None
+                if delay is None:
+                    return resp
+                logger.debug(
+                    "%s %s returned %s, retrying in %.2fs", request.method, request.url, resp.status_code, delay
+                )
+                resp.close()
+
+            if request.body is not None and getattr(request, "_body_position", None) is not None:
+                rewind_body(request)
+            self.retry_policy.sleep(delay)
+
+    @staticmethod
+    def _replayable(request: PreparedRequest) -> bool:
+        """
+        Whether the body of the request can be sent again, the position of a streamed body being recorded to rewind it
+        """
+        if request.body is None or isinstance(request.body, (bytes, str)):
+            return True
+        return isinstance(getattr(request, "_body_position", None), int)
 
     def prepare_request(self, request: Request) -> PreparedRequest:
         request.url = self.build_url(request.url)
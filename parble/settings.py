@@ -1,4 +1,5 @@
-from typing import Any
+from pathlib import Path
+from typing import Any, List, Optional
 
 from pydantic import AnyHttpUrl, BaseSettings, SecretStr, ValidationError, validator
 
@@ -11,6 +12,65 @@ class Settings(BaseSettings):
 
     default_timeout: int = 30
 
+    # connection pooling
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    keep_alive_timeout: Optional[float] = None
+
+    # retries
+    max_retries: int = 0
+    retry_backoff_factor: float = 0.5
+    retry_backoff_max: float = 30.0
+    retry_budget: Optional[float] = None
+    retry_statuses: List[int] = [429, 500, 502, 503, 504]
+
+    # submit and poll processing
+    submit_workers: int = 8
+    poll_interval: float = 2.0
+    poll_max_interval: float = 30.0
+    poll_workers: int = 4
+
+    # client-side rate limiting
+    rate_limit: Optional[float] = None
+    rate_limit_burst: Optional[float] = None
+    rate_limit_file: Optional[Path] = None
+    max_concurrent_uploads: Optional[int] = None
+
+    # adaptive concurrency
+    adaptive_concurrency: bool = False
+    concurrency_initial: int = 4
+    concurrency_min: int = 1
+    concurrency_max: int = 64
+
+    # circuit breaker
+    circuit_breaker: bool = False
+    circuit_failure_rate: float = 0.5
+    circuit_min_calls: int = 10
+    circuit_window: float = 60.0
+    circuit_consecutive_timeouts: int = 3
+    circuit_reset_timeout: float = 30.0
+
+    # model construction
+    validate_models: bool = True
+    validation_sample_rate: float = 0.0
+    lazy_documents: bool = False
+
+    # persistent cache of the processed results
+    result_cache: Optional[Path] = None
+    result_cache_max_size: Optional[int] = 1024 * 1024 * 1024
+    result_cache_max_age: Optional[float] = None
+
+    # upload deduplication
+    upload_index: Optional[Path] = None
+
+    # conditional requests
+    conditional_requests: bool = False
+    conditional_cache_entries: int = 256
+
+    # coalescing of concurrent identical GET requests
+    coalesce_requests: bool = False
+
     class Config:
         env_prefix = "PARBLE_"
         env_file_encoding = "utf-8"
@@ -0,0 +1,136 @@
+"""
+Coalescing of concurrent identical calls
+
+While a call is in flight, the same call made by other threads or tasks waits for it and shares its outcome,
+its result or its exception, instead of being made again. Calls made after it completed are made again: nothing
+is cached.
+"""
+import asyncio
+import threading
+import typing as t
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+from parble.settings import Settings
+
+T = t.TypeVar("T")
+
+
+@dataclass(frozen=True)
+class FlightStats:
+    """
+    Snapshot of a single-flight group
+    """
+
+    calls: int  # calls made
+    coalesced: int  # calls which waited for the same call in flight instead
+    in_flight: int
+
+
+class SingleFlight:
+    """
+    Group of calls where concurrent calls with the same key, made from several threads, share a single execution
+
+    The first caller of a key runs the call, the callers arriving while it is in flight wait for it and get
+    the same result, or the same exception raised.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: t.Dict[t.Hashable, Future] = {}
+        self._calls = self._coalesced = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> t.Optional["SingleFlight"]:
+        """
+        Build the single-flight group configured in the settings, None when request coalescing is disabled
+        """
+        if not settings.coalesce_requests:
+            return None
+        return cls()
+
+    def do(self, key: t.Hashable, fn: t.Callable[[], T]) -> T:
+        """
+        Run fn, or wait for the call of the same key already in flight
+
+        Args:
+            key: key identifying identical calls
+            fn: call to run
+
+        Returns:
+            Result of the call
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = Future()
+                self._calls += 1
+                leader = True
+            else:
+                self._coalesced += 1
+                leader = False
+        if not leader:
+            return flight.result()
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._land(key)
+            flight.set_exception(exc)
+            raise
+        self._land(key)
+        flight.set_result(result)
+        return result
+
+    def _land(self, key: t.Hashable):
+        # new calls of the key are made again once the outcome is known
+        with self._lock:
+            del self._flights[key]
+
+    def stats(self) -> FlightStats:
+        with self._lock:
+            return FlightStats(calls=self._calls, coalesced=self._coalesced, in_flight=len(self._flights))
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of :py:class:`SingleFlight`, coalescing the calls of concurrent tasks
+
+    The call runs in its own task: a waiter being cancelled doesn't cancel the call the other waiters share.
+    """
+
+    def __init__(self):
+        self._flights: t.Dict[t.Hashable, asyncio.Future] = {}
+        self._calls = self._coalesced = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> t.Optional["AsyncSingleFlight"]:
+        """
+        Build the single-flight group configured in the settings, None when request coalescing is disabled
+        """
+        if not settings.coalesce_requests:
+            return None
+        return cls()
+
+    async def do(self, key: t.Hashable, fn: t.Callable[[], t.Awaitable[T]]) -> T:
+        """
+        Await fn, or wait for the call of the same key already in flight
+
+        Args:
+            key: key identifying identical calls
+            fn: coroutine function making the call
+
+        Returns:
+            Result of the call
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = asyncio.ensure_future(fn())
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+            self._calls += 1
+        else:
+            self._coalesced += 1
+        return await asyncio.shield(flight)
+
+    def stats(self) -> FlightStats:
+        return FlightStats(calls=self._calls, coalesced=self._coalesced, in_flight=len(self._flights))
@@ -0,0 +1,224 @@
+"""
+Spatial index over the coordinates of the fields
+
+The coordinates of a field are its bounding box ``[x0, y0, x1, y1]`` on its page. Fields are bucketed per page into a
+uniform grid, whose cells are sized after the average field, so region and nearest neighbour queries only look at
+the fields of the cells around the query instead of every field of the page.
+"""
+import heapq
+import math
+import typing as t
+
+from parble.models import Document, Field, File
+
+Box = t.Tuple[float, float, float, float]
+
+
+class FieldRef(t.NamedTuple):
+    """
+    A field found by a spatial query, with its name and document
+    """
+
+    name: str
+    field: Field
+    document: Document
+
+    @property
+    def box(self) -> Box:
+        return _box(self.field)
+
+
+def _box(field: Field) -> Box:
+    x0, y0, x1, y1 = field.coordinates
+    return min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)
+
+
+def _intersects(a: Box, b: Box) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _contains(outer: Box, inner: Box) -> bool:
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and inner[2] <= outer[2] and inner[3] <= outer[3]
+
+
+def _distance(box: Box, x: float, y: float) -> float:
+    dx = max(box[0] - x, 0, x - box[2])
+    dy = max(box[1] - y, 0, y - box[3])
+    return math.hypot(dx, dy)
+
+
+class _PageGrid:
+    def __init__(self, refs: t.List[FieldRef], cell_size: t.Optional[float]):
+        self.refs = refs
+        self.boxes = [ref.box for ref in refs]
+        if cell_size is None:
+            # cells about twice the size of the average field
+            sizes = [max(b[2] - b[0], b[3] - b[1]) for b in self.boxes]
+            cell_size = 2 * sum(sizes) / len(sizes) if sizes else 1
+        self.cell_size = max(float(cell_size), 1.0)
+        self.cells: t.Dict[t.Tuple[int, int], t.List[int]] = {}
+        for i, box in enumerate(self.boxes):
+            for cell in self._cells(box):
+                self.cells.setdefault(cell, []).append(i)
+        if self.cells:
+            self.extent = (
+                min(c[0] for c in self.cells),
+                min(c[1] for c in self.cells),
+                max(c[0] for c in self.cells),
+                max(c[1] for c in self.cells),
+            )
+
+    def _cell(self, x: float, y: float) -> t.Tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def _cells(self, box: Box) -> t.Iterator[t.Tuple[int, int]]:
+        cx0, cy0 = self._cell(box[0], box[1])
+        cx1, cy1 = self._cell(box[2], box[3])
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                yield cx, cy
+
+    def candidates(self, box: Box) -> t.List[int]:
+        if not self.cells:
+            return []
+        # clip the query to the grid extent, so huge regions don't enumerate empty cells
+        cx0, cy0 = self._cell(box[0], box[1])
+        cx1, cy1 = self._cell(box[2], box[3])
+        ex0, ey0, ex1, ey1 = self.extent
+        found: t.Set[int] = set()
+        for cx in range(max(cx0, ex0), min(cx1, ex1) + 1):
+            for cy in range(max(cy0, ey0), min(cy1, ey1) + 1):
+                found.update(self.cells.get((cx, cy), ()))
+        return sorted(found)
+
+    def nearest(self, x: float, y: float, k: int) -> t.List[int]:
+        if not self.cells:
+            return []
+        cx, cy = self._cell(x, y)
+        ex0, ey0, ex1, ey1 = self.extent
+        # rings of cells around the cell of the point, until no further field can be closer
+        max_ring = max(abs(cx - ex0), abs(cx - ex1), abs(cy - ey0), abs(cy - ey1))
+        seen: t.Set[int] = set()
+        best: t.List[t.Tuple[float, int]] = []
+        for ring in range(max_ring + 1):
+            for cell in self._ring(cx, cy, ring):
+                for i in self.cells.get(cell, ()):
+                    if i not in seen:
+                        seen.add(i)
+                        best.append((_distance(self.boxes[i], x, y), i))
+            if len(best) >= k:
+                best = heapq.nsmallest(k, best)
+                # fields in the next rings are at least ring cells away from the point
+                if best[-1][0] <= ring * self.cell_size:
+                    break
+        return [i for _, i in sorted(best)[:k]]
+
+    @staticmethod
+    def _ring(cx: int, cy: int, ring: int) -> t.Iterator[t.Tuple[int, int]]:
+        if ring == 0:
+            yield cx, cy
+            return
+        for dx in range(-ring, ring + 1):
+            yield cx + dx, cy - ring
+            yield cx + dx, cy + ring
+        for dy in range(-ring + 1, ring):
+            yield cx - ring, cy + dy
+            yield cx + ring, cy + dy
+
+
+class SpatialIndex:
+    """
+    Per page spatial index over the header fields of documents
+
+    Fields without a ``[x0, y0, x1, y1]`` bounding box are not indexed.
+
+    Args:
+        documents: documents whose header fields are indexed
+        cell_size: size of the grid cells, defaults to twice the average field size of each page
+    """
+
+    def __init__(self, documents: t.Iterable[Document], cell_size: t.Optional[float] = None):
+        pages: t.Dict[int, t.List[FieldRef]] = {}
+        for doc in documents:
+            for name, field in doc.header_fields.items():
+                if len(field.coordinates) == 4:
+                    pages.setdefault(field.page, []).append(FieldRef(name, field, doc))
+        self._pages = {page: _PageGrid(refs, cell_size) for page, refs in pages.items()}
+
+    @classmethod
+    def from_document(cls, document: Document, cell_size: t.Optional[float] = None) -> "SpatialIndex":
+        return cls([document], cell_size)
+
+    @classmethod
+    def from_file(cls, file: File, cell_size: t.Optional[float] = None) -> "SpatialIndex":
+        return cls(file.documents, cell_size)
+
+    @property
+    def pages(self) -> t.List[int]:
+        """
+        Pages having indexed fields
+        """
+        return sorted(self._pages)
+
+    def fields_on_page(self, page: int) -> t.List[FieldRef]:
+        grid = self._pages.get(page)
+        return list(grid.refs) if grid is not None else []
+
+    def _query(self, page: int, box: t.Sequence[float], predicate: t.Callable[[Box], bool]) -> t.List[FieldRef]:
+        grid = self._pages.get(page)
+        if grid is None:
+            return []
+        return [grid.refs[i] for i in grid.candidates(tuple(box)) if predicate(grid.boxes[i])]
+
+    def intersecting(self, page: int, box: t.Sequence[float]) -> t.List[FieldRef]:
+        """
+        Return the fields of the page whose bounding box intersects box
+
+        Args:
+            page: page of the fields
+            box: region as ``(x0, y0, x1, y1)``
+        """
+        box = tuple(box)
+        return self._query(page, box, lambda b: _intersects(b, box))
+
+    def within(self, page: int, box: t.Sequence[float]) -> t.List[FieldRef]:
+        """
+        Return the fields of the page whose bounding box is contained in box
+
+        Args:
+            page: page of the fields
+            box: region as ``(x0, y0, x1, y1)``
+        """
+        box = tuple(box)
+        return self._query(page, box, lambda b: _contains(box, b))
+
+    def containing(self, page: int, x: float, y: float) -> t.List[FieldRef]:
+        """
+        Return the fields of the page whose bounding box contains the point (x, y)
+        """
+        point = (x, y, x, y)
+        return self._query(page, point, lambda b: _contains(b, point))
+
+    def overlapping(self, field: Field) -> t.List[FieldRef]:
+        """
+        Return the other fields of the same page overlapping field
+        """
+        return [ref for ref in self.intersecting(field.page, _box(field)) if ref.field is not field]
+
+    def nearest(self, page: int, x: float, y: float, k: int = 1) -> t.List[FieldRef]:
+        """
+        Return the k fields of the page closest to the point (x, y), by distance to their bounding box
+
+        Args:
+            page: page of the fields
+            x: horizontal coordinate of the point
+            y: vertical coordinate of the point
+            k: number of fields to return
+
+        Returns:
+            Closest fields first
+        """
+        grid = self._pages.get(page)
+        if grid is None or k <= 0:
+            return []
+        return [grid.refs[i] for i in grid.nearest(x, y, k)]
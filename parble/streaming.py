@@ -0,0 +1,271 @@
+import codecs
+import enum
+import json
+import re
+import typing as t
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRUCTURE = re.compile(r'[{}\[\]"]')
+_STRING = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r"[,}\]\s]")
+
+_INCOMPLETE = object()
+_decoder = json.JSONDecoder()
+
+
+class _Stage(enum.Enum):
+    OBJECT = "object"  # before the opening brace
+    KEY = "key"  # before a member name or the closing brace
+    COLON = "colon"  # after a member name
+    MEMBER = "member"  # before a member value
+    AFTER_MEMBER = "after_member"  # before a comma or the closing brace
+    ITEM = "item"  # inside the streamed array, before an item or the closing bracket
+    AFTER_ITEM = "after_item"  # inside the streamed array, before a comma or the closing bracket
+    DONE = "done"
+
+
+class JSONArrayStream:
+    """
+    Incremental parser of a JSON object, streaming the items of one of its array members
+
+    The bytes of the object are fed as they arrive; each item of the ``key`` array is decoded as soon as it is
+    complete, and the text already parsed is released. The memory held is then bounded by the largest single item
+    rather than the whole payload. The other members of the object are decoded into :py:attr:`attributes`.
+
+    Args:
+        key: name of the array member to stream
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.attributes: t.Dict[str, t.Any] = {}
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._stage = _Stage.OBJECT
+        self._member: t.Optional[str] = None
+        self._buf = ""
+        self._pos = 0
+        # state of the value being scanned, possibly across several chunks
+        self._scanning = False
+        self._parts: t.List[str] = []
+        self._start = 0
+        self._scan = 0
+        self._depth = 0
+        self._in_string = False
+        self._scalar = False
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether the whole object has been parsed
+        """
+        return self._stage == _Stage.DONE
+
+    def feed(self, data: bytes) -> t.List[t.Any]:
+        """
+        Parse the next chunk of the payload
+
+        Args:
+            data: next bytes of the payload
+
+        Returns:
+            Items of the streamed array completed by this chunk
+
+        Raises:
+            json.JSONDecodeError: on a malformed payload
+        """
+        text = self._decoder.decode(data)
+        if self._scanning:
+            # keep the scanned part of the value aside, only the new text is scanned
+            self._parts.append(self._buf[self._start :])
+            self._scan -= len(self._buf)
+            self._buf, self._start, self._pos = text, 0, 0
+        else:
+            self._buf = self._buf[self._pos :] + text
+            self._pos = 0
+
+        items: t.List[t.Any] = []
+        while self._step(items):
+            pass
+        return items
+
+    def close(self):
+        """
+        Check the payload was complete
+
+        Raises:
+            json.JSONDecodeError: when the payload ended before the end of the object
+        """
+        self._decoder.decode(b"", final=True)
+        if not self.done:
+            raise json.JSONDecodeError("Unexpected end of the payload", self._buf, self._pos)
+
+    def _error(self, message: str):
+        raise json.JSONDecodeError(message, self._buf, self._pos)
+
+    def _step(self, items: t.List[t.Any]) -> bool:
+        """
+        Make some progress in the buffer
+
+        Returns:
+            False when more data is needed
+        """
+        char = None
+        if not self._scanning:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos >= len(self._buf):
+                return False
+            char = self._buf[self._pos]
+
+        stage = self._stage
+        if stage == _Stage.OBJECT:
+            if char != "{":
+                self._error("Expecting an object")
+            self._pos += 1
+            self._stage = _Stage.KEY
+        elif stage == _Stage.KEY:
+            if char == "}":
+                self._pos += 1
+                self._stage = _Stage.DONE
+                return True
+            if char is not None and char != '"':
+                self._error("Expecting a member name")
+            member = self._value()
+            if member is _INCOMPLETE:
+                return False
+            self._member = member
+            self._stage = _Stage.COLON
+        elif stage == _Stage.COLON:
+            if char != ":":
+                self._error("Expecting ':' delimiter")
+            self._pos += 1
+            self._stage = _Stage.MEMBER
+        elif stage == _Stage.MEMBER:
+            if char == "[" and self._member == self.key:
+                self._pos += 1
+                self._stage = _Stage.ITEM
+                return True
+            value = self._value()
+            if value is _INCOMPLETE:
+                return False
+            self.attributes[self._member] = value
+            self._stage = _Stage.AFTER_MEMBER
+        elif stage == _Stage.AFTER_MEMBER:
+            if char not in ",}":
+                self._error("Expecting ',' delimiter")
+            self._pos += 1
+            self._stage = _Stage.KEY if char == "," else _Stage.DONE
+        elif stage == _Stage.ITEM:
+            if char == "]":
+                self._pos += 1
+                self._stage = _Stage.AFTER_MEMBER
+                return True
+            item = self._value()
+            if item is _INCOMPLETE:
+                return False
+            items.append(item)
+            self._stage = _Stage.AFTER_ITEM
+        elif stage == _Stage.AFTER_ITEM:
+            if char not in ",]":
+                self._error("Expecting ',' delimiter")
+            self._pos += 1
+            self._stage = _Stage.ITEM if char == "," else _Stage.AFTER_MEMBER
+        else:
+            self._error("Extra data")
+        return True
+
+    def _value(self) -> t.Any:
+        """
+        Scan the value starting at the current position and decode it once complete
+        """
+        if not self._scanning:
+            if self._buf[self._pos] in '{["':
+                # fast path: the value is usually complete in the buffer already
+                try:
+                    value, self._pos = _decoder.raw_decode(self._buf, self._pos)
+                    return value
+                except json.JSONDecodeError:
+                    pass
+            self._scanning = True
+            self._start = self._scan = self._pos
+            self._depth = 0
+            self._in_string = False
+            self._scalar = self._buf[self._pos] not in '{["'
+
+        end = self._scan_end()
+        if end is None:
+            return _INCOMPLETE
+
+        text = "".join(self._parts) + self._buf[self._start : end]
+        self._parts = []
+        self._scanning = False
+        self._pos = end
+        return json.loads(text)
+
+    def _scan_end(self) -> t.Optional[int]:
+        """
+        Resume the scan of the current value
+
+        Returns:
+            The end index of the value in the buffer, None when it continues in the next chunks
+        """
+        buf = self._buf
+        i = self._scan
+        if self._scalar:
+            match = _SCALAR_END.search(buf, i)
+            if match is None:
+                self._scan = len(buf)
+                return None
+            return match.start()
+
+        while True:
+            if self._in_string:
+                match = _STRING.search(buf, i)
+                if match is None:
+                    # an escaped character may be in the next chunk
+                    self._scan = max(i, len(buf))
+                    return None
+                if match.group() == "\\":
+                    i = match.end() + 1
+                    continue
+                i = match.end()
+                self._in_string = False
+                if self._depth == 0:
+                    return i
+                continue
+
+            match = _STRUCTURE.search(buf, i)
+            if match is None:
+                self._scan = len(buf)
+                return None
+            char = match.group()
+            i = match.end()
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    return i
+
+
+def iter_array(
+    chunks: t.Iterable[bytes], key: str, attributes: t.Optional[t.Dict[str, t.Any]] = None
+) -> t.Iterator[t.Any]:
+    """
+    Incrementally parse a JSON object from chunks of bytes, yielding the items of its ``key`` array one by one
+
+    Args:
+        chunks: bytes of the JSON object
+        key: name of the array member to stream
+        attributes: optional dict updated with the other members of the object
+
+    Yields:
+        Decoded items of the array
+    """
+    stream = JSONArrayStream(key)
+    for chunk in chunks:
+        yield from stream.feed(chunk)
+        if attributes is not None:
+            attributes.update(stream.attributes)
+    stream.close()
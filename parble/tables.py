@@ -0,0 +1,212 @@
+"""
+Typed, columnar tables of documents
+
+The tables of a :py:class:`parble.models.Document` are raw JSON: a list of rows, each row mapping the column names to
+their cell, a predicted field (value, text, confidence, page and coordinates) or a plain value.
+:py:class:`Table` parses the rows once, on first access, into one :py:class:`Column` per column name, holding each
+attribute of the cells as an array, so line items are read column-wise without walking the JSON again.
+
+NumPy and Arrow export are optional: ``pip install 'parble[numpy]'`` or ``pip install 'parble[arrow]'``.
+"""
+import math
+import typing as t
+from array import array
+
+from parble.export import _arrow, _numpy
+
+_MISSING_BOX = (-1, -1, -1, -1)
+
+
+class Column:
+    """
+    The cells of a table column, one array per attribute
+
+    Missing cells have a None value and text, a NaN confidence and -1 page and coordinates.
+
+    Args:
+        name: column name
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.values: t.List[t.Any] = []
+        self.texts: t.List[t.Optional[str]] = []
+        self.confidences = array("d")
+        self.pages = array("q")
+        self.automated = array("b")
+        # bounding boxes [x0, y0, x1, y1], flattened
+        self.coordinates = array("q")
+
+    def _append(self, cell: t.Any):
+        if not isinstance(cell, dict):
+            cell = {"value": cell}
+        self.values.append(cell.get("value"))
+        self.texts.append(cell.get("text"))
+        confidence = cell.get("confidence")
+        self.confidences.append(math.nan if confidence is None else confidence)
+        page = cell.get("page")
+        self.pages.append(-1 if page is None else page)
+        self.automated.append(1 if cell.get("automated") else 0)
+        coordinates = cell.get("coordinates")
+        self.coordinates.extend(coordinates if coordinates and len(coordinates) == 4 else _MISSING_BOX)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> t.Iterator[t.Any]:
+        return iter(self.values)
+
+    def __getitem__(self, item: t.Union[int, slice]) -> t.Any:
+        """
+        Return the value of a row, or a column of the sliced rows
+        """
+        if isinstance(item, slice):
+            column = Column(self.name)
+            column.values = self.values[item]
+            column.texts = self.texts[item]
+            column.confidences = self.confidences[item]
+            column.pages = self.pages[item]
+            column.automated = self.automated[item]
+            start, stop, step = item.indices(len(self))
+            for row in range(start, stop, step):
+                column.coordinates.extend(self.coordinates[row * 4 : row * 4 + 4])
+            return column
+        return self.values[item]
+
+    def box(self, row: int) -> t.Optional[t.Tuple[int, int, int, int]]:
+        """
+        Return the bounding box ``(x0, y0, x1, y1)`` of the cell of a row, None when missing
+        """
+        if row < 0:
+            row += len(self)
+        box = tuple(self.coordinates[row * 4 : row * 4 + 4])
+        return None if box == _MISSING_BOX else box
+
+    def to_numpy(self) -> t.Dict[str, t.Any]:
+        """
+        Return the attributes of the cells as NumPy arrays
+
+        Returns:
+            Mapping of value, text, confidence, page, automated and coordinates, the latter of shape (rows, 4)
+        """
+        np = _numpy()
+        return {
+            "value": np.array(self.values, dtype=object),
+            "text": np.array(self.texts, dtype=object),
+            "confidence": np.frombuffer(self.confidences, dtype=np.float64).copy(),
+            "page": np.frombuffer(self.pages, dtype=np.int64).copy(),
+            "automated": np.frombuffer(self.automated, dtype=np.int8).astype(bool),
+            "coordinates": np.frombuffer(self.coordinates, dtype=np.int64).reshape(-1, 4).copy(),
+        }
+
+
+class Table:
+    """
+    A table of a document, parsed column-wise on first access
+
+    Indexing the table with a row number returns the values of the row, with a slice a table of the sliced rows and
+    with a column name its :py:class:`Column`.
+
+    Args:
+        rows: raw rows of the table, each mapping the column names to their cell
+    """
+
+    def __init__(self, rows: t.Sequence[t.Dict[str, t.Any]]):
+        if not isinstance(rows, (list, tuple)):
+            raise ValueError(f"Expecting a table as a list of rows, got {type(rows).__name__}")
+        self._rows: t.Optional[t.Sequence[t.Dict[str, t.Any]]] = rows
+        self._length = len(rows)
+        self._columns: t.Optional[t.Dict[str, Column]] = None
+
+    @classmethod
+    def _from_columns(cls, columns: t.Dict[str, Column], length: int) -> "Table":
+        table = cls.__new__(cls)
+        table._rows = None
+        table._length = length
+        table._columns = columns
+        return table
+
+    @property
+    def parsed(self) -> bool:
+        """
+        Whether the rows were parsed into columns
+        """
+        return self._columns is not None
+
+    def _parse(self) -> t.Dict[str, Column]:
+        if self._columns is None:
+            columns: t.Dict[str, Column] = {}
+            for index, row in enumerate(self._rows):
+                for name, cell in row.items():
+                    column = columns.get(name)
+                    if column is None:
+                        # pad a column first seen after some rows
+                        column = columns[name] = Column(name)
+                        for _ in range(index):
+                            column._append(None)
+                    column._append(cell)
+                for column in columns.values():
+                    if len(column) == index:
+                        column._append(None)
+            self._columns = columns
+            self._rows = None
+        return self._columns
+
+    @property
+    def columns(self) -> t.List[str]:
+        """
+        Column names, in order of appearance
+        """
+        return list(self._parse())
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> t.Iterator[t.Dict[str, t.Any]]:
+        columns = self._parse()
+        for row in range(self._length):
+            yield {name: column.values[row] for name, column in columns.items()}
+
+    def __getitem__(self, item: t.Union[int, slice, str]) -> t.Any:
+        columns = self._parse()
+        if isinstance(item, str):
+            return columns[item]
+        if isinstance(item, slice):
+            return Table._from_columns(
+                {name: column[item] for name, column in columns.items()}, len(range(*item.indices(self._length)))
+            )
+        return {name: column.values[item] for name, column in columns.items()}
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._parse()
+
+    def select(self, names: t.Iterable[str]) -> "Table":
+        """
+        Return a table of the given columns
+
+        Args:
+            names: names of the columns to keep, in order
+
+        Raises:
+            KeyError: when a column doesn't exist
+        """
+        columns = self._parse()
+        return Table._from_columns({name: columns[name] for name in names}, self._length)
+
+    def to_records(self):
+        """
+        Return the values of the table as a NumPy record array, one object column per table column
+        """
+        np = _numpy()
+        columns = self._parse()
+        records = np.recarray(self._length, dtype=[(name, object) for name in columns])
+        for name, column in columns.items():
+            records[name] = column.values
+        return records
+
+    def to_table(self):
+        """
+        Return the values of the table as an Arrow table, the types of the columns being inferred
+        """
+        pa = _arrow()
+        return pa.table({name: pa.array(column.values) for name, column in self._parse().items()})
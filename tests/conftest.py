@@ -2,6 +2,16 @@ import pytest
 
 from parble import ParbleAPIClient, ParbleSDK, Settings
 from parble.models import File
+from parble.pdfcache import pdf_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_pdf_cache():
+    """
+    The PDF cache is process-wide, don't leak contents between tests
+    """
+    yield
+    pdf_cache().clear()
 
 
 @pytest.fixture
@@ -0,0 +1,91 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from parble import Settings
+from parble.adapters import ParbleHTTPAdapter, PoolStats
+from parble.session import BaseSession
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_settings_pool_defaults(settings):
+    assert settings.pool_connections == 10
+    assert settings.pool_maxsize == 10
+    assert settings.pool_block is False
+    assert settings.keep_alive_timeout is None
+
+
+def test_session_mounts_adapter(settings):
+    sess = BaseSession(settings)
+
+    assert isinstance(sess.get_adapter("https://api.parble.com/v1/"), ParbleHTTPAdapter)
+    assert isinstance(sess.get_adapter("http://localhost/"), ParbleHTTPAdapter)
+    assert sess.pool_stats() == PoolStats(opened=0, reused=0, idle=0)
+
+
+def test_adapter_pool_settings(url, api_key):
+    sess = BaseSession(Settings(url=url, api_key=api_key, pool_connections=3, pool_maxsize=42, pool_block=True))
+    pm = sess.get_adapter(url).poolmanager
+
+    assert pm.connection_pool_kw["maxsize"] == 42
+    assert pm.connection_pool_kw["block"] is True
+    assert pm.pools._maxsize == 3
+
+
+def test_pool_stats_reuse(local_url, api_key):
+    sess = BaseSession(Settings(url=local_url, api_key=api_key))
+
+    for _ in range(3):
+        sess.get("files/foo")
+
+    assert sess.pool_stats() == PoolStats(opened=1, reused=2, idle=1)
+
+
+def test_keep_alive_recycles_idle_connections(local_url, api_key):
+    sess = BaseSession(Settings(url=local_url, api_key=api_key, keep_alive_timeout=0.01))
+
+    sess.get("files/foo")
+    time.sleep(0.05)
+    sess.get("files/foo")
+
+    stats = sess.pool_stats()
+    assert stats.opened == 2
+    assert stats.reused == 0
+
+
+def test_pool_stats_keeps_pools_order():
+    adapter = ParbleHTTPAdapter(pool_connections=2)
+    for host in ("a.example.com", "b.example.com"):
+        adapter.poolmanager.connection_from_url(f"https://{host}/")
+
+    assert adapter.stats().idle == 0
+    assert len(adapter.poolmanager.tracked_pools()) == 2
+    # reading the pools doesn't change which one is evicted next
+    adapter.poolmanager.connection_from_url("https://c.example.com/")
+    assert {key.key_host for key in adapter.poolmanager.pools.keys()} == {"b.example.com", "c.example.com"}
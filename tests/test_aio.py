@@ -0,0 +1,225 @@
+import asyncio
+from io import BytesIO
+
+import httpx
+import pytest
+
+from parble import __version__, exceptions
+from parble.aio import AsyncParbleAPIClient, AsyncParbleSDK
+from parble.models import File
+
+
+class Recorder:
+    """
+    httpx mock transport handler replaying a list of responses and recording requests
+    """
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, request: httpx.Request):
+        request.read()
+        self.requests.append(request)
+        resp = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(resp, Exception):
+            raise resp
+        return resp
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def make_sdk(url, api_key, handler, **settings):
+    return AsyncParbleSDK(url, api_key, transport=httpx.MockTransport(handler), **settings)
+
+
+def test_client_headers(url, api_key):
+    handler = Recorder(httpx.Response(200, json={}))
+
+    async def go():
+        async with AsyncParbleAPIClient(url, api_key, transport=httpx.MockTransport(handler)) as cl:
+            await cl.get("files/foobar")
+
+    run(go())
+    req = handler.requests[0]
+    assert str(req.url) == "https://api.parble.com/v1/files/foobar"
+    assert req.headers["X-API-Key"] == api_key
+    assert req.headers["User-Agent"] == f"parble-python/{__version__}"
+
+
+def test_get_file(url, api_key, dummy_file_attributes):
+    handler = Recorder(httpx.Response(200, json=dummy_file_attributes))
+
+    async def go():
+        async with make_sdk(url, api_key, handler) as sdk:
+            return sdk, await sdk.files.get(dummy_file_attributes["id"])
+
+    sdk, file = run(go())
+    assert isinstance(file, File)
+    assert file.id == dummy_file_attributes["id"]
+    assert file._sdk is sdk
+
+
+def test_get_pdf(url, api_key):
+    b = b"%PDF-1.3\n3 0 %%EOF\n"
+    handler = Recorder(httpx.Response(200, content=b, headers={"Content-Type": "application/pdf"}))
+
+    async def go():
+        async with make_sdk(url, api_key, handler) as sdk:
+            return await sdk.files.get_pdf("636baf52b9753d4ce1e210d0")
+
+    rv = run(go())
+    assert isinstance(rv, BytesIO)
+    assert rv.read() == b
+    assert handler.requests[0].headers["Accept"] == "application/pdf"
+
+
+def test_post_path(url, api_key, tmp_path, text, dummy_file_attributes):
+    path = tmp_path / "test_upload.txt"
+    path.write_text(text)
+    handler = Recorder(httpx.Response(200, json=dummy_file_attributes))
+
+    async def go():
+        async with make_sdk(url, api_key, handler) as sdk:
+            return await sdk.files.post(path, inbox_id="636baf52b9753d4ce1e210d0")
+
+    file = run(go())
+    assert file.id == dummy_file_attributes["id"]
+    body = handler.requests[0].content
+    assert b'filename="test_upload.txt"' in body
+    assert b"Content-Type: text/plain" in body
+    assert b"636baf52b9753d4ce1e210d0" in body
+    assert text.encode() in body
+
+
+def test_post_file_see_other(url, api_key, text, dummy_file_attributes):
+    pk = dummy_file_attributes["id"]
+    handler = Recorder(
+        httpx.Response(303, headers={"Location": f"{url}files/{pk}"}),
+        httpx.Response(200, json=dummy_file_attributes),
+    )
+
+    async def go():
+        async with make_sdk(url, api_key, handler) as sdk:
+            return await sdk.files.post_file(BytesIO(text.encode()), "foo.txt")
+
+    file = run(go())
+    assert file.id == pk
+    assert [r.method for r in handler.requests] == ["POST", "GET"]
+
+
+def test_delete(url, api_key):
+    handler = Recorder(httpx.Response(204))
+
+    async def go():
+        async with make_sdk(url, api_key, handler) as sdk:
+            return await sdk.files.delete("636baf52b9753d4ce1e210d0")
+
+    assert run(go()) is None
+    assert handler.requests[0].method == "DELETE"
+
+
+@pytest.mark.parametrize(
+    "status, exc",
+    ((404, exceptions.NotFoundError), (401, exceptions.UnAuthorizedError), (502, exceptions.APICallError)),
+)
+def test_error_mapping(url, api_key, status, exc):
+    handler = Recorder(httpx.Response(status))
+
+    async def go():
+        async with make_sdk(url, api_key, handler) as sdk:
+            await sdk.files.get("636baf52b9753d4ce1e210d0")
+
+    with pytest.raises(exc):
+        run(go())
+
+
+def test_timeout(url, api_key):
+    handler = Recorder(httpx.ReadTimeout("Boom"))
+
+    async def go():
+        async with make_sdk(url, api_key, handler) as sdk:
+            await sdk.files.get("636baf52b9753d4ce1e210d0")
+
+    with pytest.raises(exceptions.CallTimeoutError):
+        run(go())
+
+
+def test_retries(url, api_key, monkeypatch, dummy_file_attributes):
+    async def no_sleep(_):
+        pass
+
+    monkeypatch.setattr("parble.aio.session.asyncio.sleep", no_sleep)
+    handler = Recorder(
+        httpx.ConnectError("refused"), httpx.Response(502), httpx.Response(200, json=dummy_file_attributes)
+    )
+
+    async def go():
+        async with make_sdk(url, api_key, handler, max_retries=3) as sdk:
+            return await sdk.files.get(dummy_file_attributes["id"])
+
+    assert run(go()).id == dummy_file_attributes["id"]
+    assert len(handler.requests) == 3
+
+
+def test_post_not_retried_after_send(url, api_key, text):
+    handler = Recorder(httpx.Response(502), httpx.Response(200, json={}))
+
+    async def go():
+        async with make_sdk(url, api_key, handler, max_retries=3) as sdk:
+            await sdk.files.post_file(BytesIO(text.encode()), "foo.txt")
+
+    with pytest.raises(exceptions.APICallError):
+        run(go())
+    assert len(handler.requests) == 1
+
+
+def test_get_result_cache(url, api_key, tmp_path, dummy_file_attributes):
+    handler = Recorder(httpx.Response(200, json=dummy_file_attributes))
+
+    async def go():
+        async with make_sdk(url, api_key, handler, result_cache=tmp_path / "results.db") as sdk:
+            first = await sdk.files.get(dummy_file_attributes["id"])
+            second = await sdk.files.get(dummy_file_attributes["id"])
+            return first, second, sdk.files.cache_stats()
+
+    first, second, stats = run(go())
+    assert second == first
+    assert len(handler.requests) == 1
+    assert stats.hits == 1
+
+
+def test_post_dedup(url, api_key, tmp_path, text, dummy_file_attributes):
+    handler = Recorder(httpx.Response(200, json=dummy_file_attributes))
+
+    async def go():
+        async with make_sdk(url, api_key, handler, upload_index=tmp_path / "uploads.db") as sdk:
+            first = await sdk.files.post_file(BytesIO(text.encode()), "a.txt")
+            second = await sdk.files.post_file(BytesIO(text.encode()), "a.txt")
+            return first, second
+
+    first, second = run(go())
+    assert second.id == first.id
+    assert [r.method for r in handler.requests] == ["POST", "GET"]
+
+
+def test_post_dedup_read_only(url, api_key, tmp_path, text, dummy_file_attributes):
+    handler = Recorder(httpx.Response(200, json=dummy_file_attributes))
+
+    class ReadOnly:
+        def __init__(self):
+            self._data = BytesIO(text.encode())
+
+        def read(self, size=-1):
+            return self._data.read(size)
+
+    async def go():
+        async with make_sdk(url, api_key, handler, upload_index=tmp_path / "uploads.db") as sdk:
+            return await sdk.files.post_file(ReadOnly(), "a.txt"), len(sdk.files.uploads)
+
+    file, indexed = run(go())
+    assert file.id == dummy_file_attributes["id"]
+    assert indexed == 0
+    assert text.encode() in handler.requests[0].content
@@ -0,0 +1,69 @@
+import pickle
+
+import pytest
+
+from parble.models import File
+
+np = pytest.importorskip("numpy")
+analytics = pytest.importorskip("parble.analytics")
+
+
+def _field(page, confidence):
+    return dict(page=page, coordinates=[0, 0, 1, 1], text="", value="", confidence=confidence, automated=True)
+
+
+@pytest.fixture
+def files(sdk, dummy_file_attributes):
+    invoice = dummy_file_attributes["documents"][0]
+    invoice["header_fields"] = {"total": _field(0, 95), "date": _field(1, 40)}
+    receipt = dict(invoice, automated=True, classification=dict(invoice["classification"], document_type="receipt"))
+    receipt["header_fields"] = {"total": _field(0, 100)}
+    return [
+        File(sdk=sdk, **dict(dummy_file_attributes, number_of_pages=2)),
+        File(sdk=sdk, **dict(dummy_file_attributes, number_of_pages=1, documents=[receipt, invoice])),
+    ]
+
+
+def test_corpus_stats(files):
+    stats = analytics.corpus_stats(files)
+
+    assert (stats.files, stats.documents, stats.fields) == (2, 3, 5)
+    assert stats.automation_rates() == {"invoice": 0, "receipt": 1}
+    assert stats.document_confidence() == {"invoice": 94, "receipt": 94}
+
+    histograms = stats.confidence_histograms()
+    assert list(histograms) == ["date", "total"]
+    assert histograms["date"].tolist() == [0, 0, 0, 0, 2, 0, 0, 0, 0, 0]
+    assert histograms["total"].tolist() == [0] * 9 + [3]
+
+    # page 0: 3 fields over 2 files, page 1: 2 fields over the single 2 pages file
+    assert stats.field_density().tolist() == [1.5, 2]
+
+
+def test_merge_shards(files):
+    whole = analytics.corpus_stats(files, bins=5)
+    shard = pickle.loads(pickle.dumps(analytics.corpus_stats(files[1:], bins=5)))
+
+    merged = analytics.corpus_stats(files[:1], bins=5) + shard
+    assert merged.automation_rates() == whole.automation_rates()
+    assert merged.field_density().tolist() == whole.field_density().tolist()
+    assert {k: v.tolist() for k, v in merged.confidence_histograms().items()} == {
+        k: v.tolist() for k, v in whole.confidence_histograms().items()
+    }
+
+    incremental = analytics.CorpusStats(bins=5)
+    incremental += analytics.corpus_stats(files[:1], bins=5)
+    incremental.add(files[1:])
+    assert incremental.field_density().tolist() == whole.field_density().tolist()
+
+
+def test_merge_different_bins(files):
+    with pytest.raises(ValueError):
+        analytics.corpus_stats(files, bins=5).merge(analytics.corpus_stats(files))
+
+
+def test_empty():
+    stats = analytics.corpus_stats([])
+
+    assert stats.automation_rates() == {}
+    assert stats.field_density().tolist() == []
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+
+import pytest
+
+from parble import binary
+from parble.models import File
+
+
+@pytest.fixture
+def rich_file(sdk, dummy_file_attributes):
+    doc = dummy_file_attributes["documents"][0]
+    doc["header_fields"] = {
+        name: dict(page=0, coordinates=[-5, 0, 300, 1 << 40], text=name, value="€ 12", confidence=87, automated=False)
+        for name in ("total", "currency")
+    }
+    doc["tables"] = {"items": [{"qty": 2, "price": 9.99, "note": None, "flags": [True, False]}]}
+    dummy_file_attributes["documents"].append(doc)
+    return File(sdk=sdk, **dummy_file_attributes)
+
+
+def test_round_trip(sdk, rich_file):
+    data = rich_file.to_bytes()
+    file = File.from_bytes(data, sdk=sdk)
+
+    assert file == rich_file
+    assert file._sdk is sdk
+    assert file[0].header_fields["total"].coordinates == [-5, 0, 300, 1 << 40]
+
+
+def test_strings_stored_once(rich_file):
+    data = rich_file.to_bytes()
+
+    assert data.startswith(binary.MAGIC + bytes([binary.VERSION]))
+    assert data.count(b"invoice") == 1
+    assert data.count("€ 12".encode()) == 1
+    assert len(data) < len(rich_file.to_json_bytes()) / 2
+
+
+def test_datetimes(rich_file):
+    rich_file.timings.upload = datetime(2022, 11, 19, 9, 42, 51, 123, tzinfo=timezone(timedelta(hours=-3)))
+    rich_file.timings.done = None
+
+    assert File.from_bytes(rich_file.to_bytes()).timings == rich_file.timings
+
+
+def test_unsupported_version(rich_file):
+    data = bytearray(rich_file.to_bytes())
+    data[3] = binary.VERSION + 1
+    with pytest.raises(ValueError):
+        File.from_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        File.from_bytes(b"{}")
+
+
+@pytest.mark.parametrize("size", (0, 2, 3, 4, 10, -20, -1))
+def test_truncated_record(rich_file, size):
+    with pytest.raises(ValueError):
+        File.from_bytes(rich_file.to_bytes()[:size])
+
+
+def test_container(sdk, rich_file, dummy_file):
+    buf = BytesIO()
+    assert binary.dump_records(iter([rich_file, dummy_file]), buf) == 2
+    buf.seek(0)
+
+    assert list(binary.load_records(buf, sdk=sdk)) == [rich_file, dummy_file]
+
+
+def test_truncated_container(rich_file):
+    buf = BytesIO()
+    binary.dump_records([rich_file], buf)
+
+    with pytest.raises(ValueError):
+        list(binary.load_records(BytesIO(buf.getvalue()[:-10])))
+    with pytest.raises(ValueError):
+        list(binary.load_records(BytesIO(b"nope")))
@@ -0,0 +1,118 @@
+import multiprocessing
+
+import pytest
+
+from parble.cache import ResultCache
+from parble.settings import Settings
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResultCache(tmp_path / "results.db")
+    yield cache
+    cache.close()
+
+
+def _payload(file_id, done="2022-11-19 09:42:59", size=0):
+    return {"id": file_id, "timings": {"upload": "2022-11-19 09:42:51", "done": done}, "filename": "x" * size}
+
+
+def test_from_settings(url, api_key, tmp_path):
+    assert ResultCache.from_settings(Settings(url=url, api_key=api_key)) is None
+
+    settings = Settings(
+        url=url, api_key=api_key, result_cache=tmp_path / "cache" / "results.db", result_cache_max_age=60
+    )
+    cache = ResultCache.from_settings(settings)
+    assert cache.path == tmp_path / "cache" / "results.db"
+    assert cache.max_age == 60
+    assert cache.max_size == 1024 * 1024 * 1024
+    cache.close()
+
+
+def test_get_put(cache):
+    assert cache.get("tenant", "a") is None
+    assert cache.put("tenant", "a", _payload("a"))
+    assert cache.get("tenant", "a") == _payload("a")
+    assert cache.get("other", "a") is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.stores, stats.entries) == (1, 2, 1, 1)
+    assert stats.size > 0
+
+
+def test_not_done_not_cached(cache):
+    assert not cache.put("tenant", "a", _payload("a", done=None))
+    assert not cache.put("tenant", "b", {"id": "b"})
+    assert cache.stats().entries == 0
+
+
+def test_delete_clear(cache):
+    cache.put("tenant", "a", _payload("a"))
+    cache.put("tenant", "b", _payload("b"))
+    cache.delete("tenant", "a")
+    assert cache.get("tenant", "a") is None
+    assert cache.get("tenant", "b") is not None
+    cache.clear()
+    assert cache.stats().entries == 0
+
+
+def test_lru_eviction(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ResultCache, "_now", staticmethod(lambda: now[0]))
+    cache = ResultCache(tmp_path / "results.db", max_size=2500)
+
+    for file_id in "abc":
+        now[0] += 1
+        cache.put("tenant", file_id, _payload(file_id, size=1000))
+    # only two entries fit, the oldest is evicted
+    assert cache.get("tenant", "a") is None
+    now[0] += 1
+    assert cache.get("tenant", "b") is not None
+
+    now[0] += 1
+    cache.put("tenant", "d", _payload("d", size=1000))
+    # c is now the least recently used
+    assert cache.get("tenant", "c") is None
+    assert cache.get("tenant", "b") is not None
+    assert cache.stats().evictions == 2
+
+    assert not cache.put("tenant", "e", _payload("e", size=5000))
+    cache.close()
+
+
+def test_max_age(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ResultCache, "_now", staticmethod(lambda: now[0]))
+    cache = ResultCache(tmp_path / "results.db", max_age=60)
+
+    cache.put("tenant", "a", _payload("a"))
+    now[0] += 30
+    assert cache.get("tenant", "a") is not None
+    now[0] += 31
+    assert cache.get("tenant", "a") is None
+    assert cache.stats().evictions == 1
+    cache.close()
+
+
+def _fill(path, prefix):
+    cache = ResultCache(path)
+    for i in range(20):
+        cache.put("tenant", f"{prefix}{i}", _payload(f"{prefix}{i}"))
+    cache.close()
+
+
+def test_shared_between_processes(tmp_path):
+    path = tmp_path / "results.db"
+    ResultCache(path).close()
+    processes = [multiprocessing.Process(target=_fill, args=(path, prefix)) for prefix in "ab"]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    cache = ResultCache(path)
+    assert cache.stats().entries == 40
+    assert cache.get("tenant", "b7") == _payload("b7")
+    cache.close()
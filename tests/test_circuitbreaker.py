@@ -0,0 +1,186 @@
+import asyncio
+
+import httpx
+import pytest
+from requests import exceptions
+
+from parble import ParbleAPIClient, Settings
+from parble.aio import AsyncParbleAPIClient
+from parble.circuitbreaker import CircuitBreaker, CircuitState
+from parble.exceptions import APICallError, CallTimeoutError, CircuitOpenError, NotFoundError
+from parble.session import BaseSession
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def breaker(clock):
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=4, window=10, consecutive_timeouts=2, reset_timeout=5)
+    breaker._now = clock
+    return breaker
+
+
+def test_opens_on_failure_rate(breaker):
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_needs_min_calls(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.stats().failure_rate == 1
+
+
+def test_window_slides(breaker, clock):
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now = 11
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.stats().calls == 3
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_opens_on_consecutive_timeouts(breaker):
+    breaker.record_failure(timeout=True)
+    breaker.record_success()
+    breaker.record_failure(timeout=True)
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record_failure(timeout=True)
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_half_open_trial(breaker, clock):
+    breaker.record_failure(timeout=True)
+    breaker.record_failure(timeout=True)
+    assert breaker.stats().retry_in == 5
+
+    clock.now = 5
+    assert breaker.state == CircuitState.HALF_OPEN
+    breaker.before_call()
+    # a single trial call at once
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.stats().calls == 1
+    breaker.before_call()
+
+
+def test_half_open_trial_fails(breaker, clock):
+    breaker.record_failure(timeout=True)
+    breaker.record_failure(timeout=True)
+    clock.now = 5
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    clock.now = 9
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    clock.now = 10
+    breaker.before_call()
+
+
+def test_lost_trial_call(breaker, clock):
+    breaker.record_failure(timeout=True)
+    breaker.record_failure(timeout=True)
+    clock.now = 5
+    breaker.before_call()
+    # the trial call never reported back
+    clock.now = 10
+    breaker.before_call()
+
+
+def test_disabled_by_default(settings):
+    sess = BaseSession(settings)
+    assert sess.circuit_breaker is None
+    assert sess.circuit_stats() is None
+
+
+@pytest.fixture
+def client(url, api_key):
+    return ParbleAPIClient(url, api_key, circuit_breaker=True, circuit_min_calls=2, circuit_consecutive_timeouts=2)
+
+
+def test_client_fails_fast(client, requests_mock, url):
+    mock = requests_mock.get(f"{url}files/foobar", exc=exceptions.ReadTimeout)
+    for _ in range(2):
+        with pytest.raises(CallTimeoutError):
+            client.get("files/foobar")
+
+    assert client.circuit_stats().state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        client.get("files/foobar")
+    assert mock.call_count == 2
+
+
+def test_client_server_errors(client, requests_mock, url):
+    requests_mock.get(f"{url}files/foobar", status_code=500)
+    for _ in range(2):
+        with pytest.raises(APICallError):
+            client.get("files/foobar")
+
+    assert client.circuit_stats().state == CircuitState.OPEN
+
+
+def test_client_errors_are_successes(client, requests_mock, url):
+    requests_mock.get(f"{url}files/foobar", status_code=404)
+    for _ in range(4):
+        with pytest.raises(NotFoundError):
+            client.get("files/foobar")
+
+    stats = client.circuit_stats()
+    assert stats.state == CircuitState.CLOSED
+    assert stats.calls == 4
+    assert stats.failure_rate == 0
+
+
+def test_async_client_fails_fast(url, api_key):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    async def run():
+        settings = dict(circuit_breaker=True, circuit_min_calls=2)
+        async with AsyncParbleAPIClient(url, api_key, transport=httpx.MockTransport(handler), **settings) as client:
+            for _ in range(2):
+                with pytest.raises(APICallError):
+                    await client.get("files/foobar")
+            with pytest.raises(CircuitOpenError):
+                await client.get("files/foobar")
+            return client.circuit_stats()
+
+    assert asyncio.run(run()).state == CircuitState.OPEN
+    assert len(calls) == 2
+
+
+def test_from_settings(url, api_key):
+    settings = Settings(url=url, api_key=api_key, circuit_breaker=True, circuit_reset_timeout=60)
+    assert CircuitBreaker.from_settings(settings).reset_timeout == 60
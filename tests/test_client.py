@@ -44,3 +44,10 @@ def test_timeout_override_default(api_client, method, kwargs):
         m.assert_called_once_with(method.upper(), "files/foobar", timeout=42, **kwargs)
 
         assert 42 != api_client.settings.default_timeout
+
+
+def test_client_settings_kwargs(url, api_key):
+    cl = ParbleAPIClient(url, api_key, pool_maxsize=32)
+
+    assert cl.settings.pool_maxsize == 32
+    assert cl.pool_stats().opened == 0
@@ -134,6 +134,16 @@ def test_get_file(runner, config_envvars, dummy_file):
     assert len(docs) == 1
 
 
+def test_get_file_lazy(runner, config_envvars, monkeypatch, requests_mock, url, dummy_file, dummy_file_attributes):
+    monkeypatch.setenv("PARBLE_LAZY_DOCUMENTS", "1")
+    requests_mock.get(f"{url}files/{dummy_file.id}", json=dummy_file_attributes)
+
+    res = runner.invoke(get, [dummy_file.id])
+
+    assert res.exit_code == 0
+    assert json.loads(res.output) == json.loads(dummy_file.json())
+
+
 def test_get_file_pdf(runner, config_envvars, dummy_file):
     b = b"%PDF-1.3\n3 0 %%EOF\n"
 
@@ -179,3 +189,26 @@ def test_verbose(runner, verbose, command_foo):
         if l == level:
             continue
         assert l not in res.stderr
+
+
+def test_get_file_pdf_output(runner, config_envvars, dummy_file, tmp_path):
+    b = b"%PDF-1.3\n3 0 %%EOF\n"
+    dest = tmp_path / "out.pdf"
+
+    def _download(pk, f, chunk_size=None, offset=0):
+        f.write(b)
+        return len(b)
+
+    with patch("parble.sdk.ParbleSDK.Files.get") as m, patch(
+        "parble.resources.files.FilesResource.download"
+    ) as d, patch("parble.models.File.pdf", new_callable=PropertyMock) as f:
+        m.return_value = dummy_file
+        d.side_effect = _download
+        res = runner.invoke(get, [dummy_file.id, "--format", "pdf", "-o", str(dest)])
+
+        d.assert_called_once()
+        f.assert_not_called()
+
+    assert res.exit_code == 0, res.output
+    assert dest.read_bytes() == b
+    assert res.stdout == f"Result saved in {dest}\n"
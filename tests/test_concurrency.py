@@ -0,0 +1,158 @@
+import threading
+import time
+
+import pytest
+from requests import exceptions
+
+from parble import ParbleSDK, Settings
+from parble.concurrency import AdaptiveLimiter
+from parble.exceptions import APICallError, CallTimeoutError, NotFoundError
+from parble.session import BaseSession
+
+
+@pytest.fixture
+def session(url, api_key):
+    return BaseSession(Settings(url=url, api_key=api_key, adaptive_concurrency=True, concurrency_initial=4))
+
+
+def test_additive_increase():
+    limiter = AdaptiveLimiter(initial=2, max_limit=4)
+    for _ in range(4):
+        limiter.on_success("GET", 0.1)
+    assert limiter.limit == 3
+
+    for _ in range(100):
+        limiter.on_success("GET", 0.1)
+    assert limiter.limit == 4
+
+
+def test_no_increase_while_latency_degrades():
+    limiter = AdaptiveLimiter(initial=2)
+    for _ in range(10):
+        limiter.on_success("POST", 1)
+    limit = limiter._limit
+    for _ in range(5):
+        limiter.on_success("POST", 20)
+
+    assert limiter._limit == limit
+    # other kinds of calls are tracked independently
+    limiter.on_success("GET", 0.01)
+    assert limiter._limit > limit
+
+
+def test_no_increase_while_processing_degrades():
+    limiter = AdaptiveLimiter(initial=2)
+    for _ in range(10):
+        limiter.observe_processing(5)
+    for _ in range(5):
+        limiter.observe_processing(200)
+    limiter.on_success("POST", 1)
+
+    assert limiter._limit == 2
+    assert limiter.stats().processing > 100
+
+
+def test_multiplicative_decrease():
+    limiter = AdaptiveLimiter(initial=16, min_limit=2)
+    limiter.on_overload()
+    assert limiter.limit == 8
+    limiter.on_overload()
+    limiter.on_overload()
+    limiter.on_overload()
+    assert limiter.limit == 2
+
+
+def test_decrease_once_per_round_trip():
+    limiter = AdaptiveLimiter(initial=16)
+    limiter.on_success("GET", 10)
+    limiter.on_overload("GET")
+    limiter.on_overload("GET")
+    assert limiter.limit == 8
+
+
+def test_slots_block_at_limit():
+    limiter = AdaptiveLimiter(initial=1, max_limit=1)
+    entered = threading.Event()
+
+    def call():
+        with limiter.slot():
+            entered.set()
+
+    with limiter.slot():
+        th = threading.Thread(target=call)
+        th.start()
+        assert not entered.wait(0.05)
+        assert limiter.stats().in_flight == 1
+    th.join()
+    assert entered.is_set()
+    assert limiter.stats().in_flight == 0
+
+
+def test_disabled_by_default(settings):
+    sess = BaseSession(settings)
+    assert sess.concurrency is None
+    assert sess.concurrency_stats() is None
+
+
+def test_session_success(session, requests_mock, url):
+    requests_mock.get(f"{url}files/foobar", json={})
+    for _ in range(6):
+        session.get("files/foobar")
+
+    stats = session.concurrency_stats()
+    assert stats.limit == 5
+    assert stats.in_flight == 0
+    assert "GET" in stats.latency
+
+
+@pytest.mark.parametrize(
+    "kwargs, exc",
+    (
+        (dict(status_code=503), APICallError),
+        (dict(status_code=429), APICallError),
+        (dict(exc=exceptions.ReadTimeout), CallTimeoutError),
+        (dict(exc=exceptions.ConnectionError), APICallError),
+    ),
+)
+def test_session_overload(session, requests_mock, url, kwargs, exc):
+    requests_mock.get(f"{url}files/foobar", **kwargs)
+    with pytest.raises(exc):
+        session.get("files/foobar")
+
+    assert session.concurrency_stats().limit == 2
+
+
+def test_session_client_error_is_not_overload(session, requests_mock, url):
+    requests_mock.get(f"{url}files/foobar", status_code=404)
+    with pytest.raises(NotFoundError):
+        session.get("files/foobar")
+
+    # nor a success: no latency is recorded
+    stats = session.concurrency_stats()
+    assert stats.limit == 4
+    assert "GET" not in stats.latency
+    assert stats.in_flight == 0
+
+
+def test_failed_call_leaves_limit():
+    limiter = AdaptiveLimiter(initial=2, max_limit=4)
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            with limiter.slot():
+                raise ValueError("local error")
+
+    stats = limiter.stats()
+    assert stats.limit == 2
+    assert stats.latency == {}
+    assert stats.in_flight == 0
+
+
+def test_upload_reports_processing_time(url, api_key, requests_mock, dummy_file_attributes, text, tmp_path):
+    sdk = ParbleSDK(url, api_key, adaptive_concurrency=True)
+    path = tmp_path / "foo.txt"
+    path.write_text(text)
+    requests_mock.post(f"{url}files", json=dummy_file_attributes)
+
+    sdk.files.post(path)
+
+    assert sdk.client.concurrency_stats().processing == 8
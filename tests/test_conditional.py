@@ -0,0 +1,138 @@
+import pytest
+
+from parble import ParbleAPIClient, ParbleSDK, Settings
+from parble.conditional import RepresentationCache
+from parble.exceptions import NotFoundError
+from parble.session import BaseSession
+
+FILE_URL = "https://api.parble.com/v1/files/foobar"
+
+
+@pytest.fixture
+def session(url, api_key):
+    return BaseSession(Settings(url=url, api_key=api_key, conditional_requests=True))
+
+
+def test_from_settings(settings):
+    assert RepresentationCache.from_settings(settings) is None
+    assert BaseSession(settings).conditional_stats() is None
+
+
+def test_revalidated(session, requests_mock):
+    m = requests_mock.get(
+        FILE_URL,
+        [
+            {"json": {"id": "foobar"}, "headers": {"ETag": '"v1"', "Last-Modified": "Sat, 19 Nov 2022 09:42:59 GMT"}},
+            {"status_code": 304, "headers": {"ETag": '"v1"'}},
+        ],
+    )
+    first = session.request("GET", "files/foobar")
+    assert not first.revalidated
+    assert "If-None-Match" not in m.request_history[0].headers
+
+    second = session.request("GET", "files/foobar")
+    assert m.request_history[1].headers["If-None-Match"] == '"v1"'
+    assert m.request_history[1].headers["If-Modified-Since"] == "Sat, 19 Nov 2022 09:42:59 GMT"
+    assert second.status_code == 200
+    assert second.revalidated
+    assert second.json() == {"id": "foobar"}
+    assert second.representation is first.representation
+
+    stats = session.conditional_stats()
+    assert (stats.entries, stats.revalidated, stats.fetched) == (1, 1, 1)
+
+
+def test_changed(session, requests_mock):
+    m = requests_mock.get(
+        FILE_URL,
+        [
+            {"json": {"version": 1}, "headers": {"ETag": '"v1"'}},
+            {"json": {"version": 2}, "headers": {"ETag": '"v2"'}},
+            {"status_code": 304},
+        ],
+    )
+    session.request("GET", "files/foobar")
+    assert session.request("GET", "files/foobar").json() == {"version": 2}
+    assert session.request("GET", "files/foobar").json() == {"version": 2}
+    assert m.request_history[2].headers["If-None-Match"] == '"v2"'
+
+
+def test_not_conditional(session, requests_mock):
+    m = requests_mock.get(FILE_URL, json={}, headers={"ETag": '"v1"'})
+    session.request("GET", "files/foobar")
+
+    # other content types, streamed and range requests are not revalidated, nor stored
+    session.request("GET", "files/foobar", headers={"Accept": "application/pdf"})
+    session.request("GET", "files/foobar", headers={"Accept": "application/pdf"})
+    session.request("GET", "files/foobar", stream=True)
+    session.request("GET", "files/foobar", headers={"Range": "bytes=10-"})
+    assert all("If-None-Match" not in req.headers for req in m.request_history)
+    assert session.conditional_stats().entries == 1
+
+    # responses without validators are not stored
+    requests_mock.get("https://api.parble.com/v1/files/other", json={})
+    session.request("GET", "files/other")
+    session.request("GET", "files/other")
+    assert session.conditional_stats().entries == 1
+
+
+def test_deleted(session, requests_mock):
+    requests_mock.get(FILE_URL, [{"json": {}, "headers": {"ETag": '"v1"'}}, {"status_code": 404}])
+    session.request("GET", "files/foobar")
+    with pytest.raises(NotFoundError):
+        session.request("GET", "files/foobar")
+    assert session.conditional_stats().entries == 0
+
+
+def test_lru():
+    cache = RepresentationCache(max_entries=2)
+    for key in "abc":
+        assert cache.get(key) is None
+    from requests import Response
+
+    for key in "abc":
+        resp = Response()
+        resp.status_code = 200
+        resp.headers["ETag"] = key
+        resp._content = b"{}"
+        cache.update(key, None, resp)
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.stats().entries == 2
+
+
+def test_files_fetch(url, api_key, requests_mock, dummy_file_attributes):
+    client = ParbleAPIClient(url, api_key, conditional_requests=True)
+    pk = dummy_file_attributes["id"]
+    requests_mock.get(
+        f"{url}files/{pk}", [{"json": dummy_file_attributes, "headers": {"ETag": '"v1"'}}, {"status_code": 304}]
+    )
+    first, fresh = client.files.fetch(pk)
+    assert fresh
+    second, fresh = client.files.fetch(pk)
+    assert not fresh
+    assert second is first
+    assert client.conditional_stats().revalidated == 1
+
+
+def test_files_fetch_without_conditional_requests(api_client, url, requests_mock):
+    requests_mock.get(f"{url}files/foobar", json={"id": "foobar"}, headers={"ETag": '"v1"'})
+    assert api_client.files.fetch("foobar") == ({"id": "foobar"}, True)
+    assert api_client.files.fetch("foobar") == ({"id": "foobar"}, True)
+
+
+def test_sdk_get_unchanged(url, api_key, requests_mock, dummy_file_attributes):
+    sdk = ParbleSDK(url, api_key, conditional_requests=True)
+    pk = dummy_file_attributes["id"]
+    changed = dict(dummy_file_attributes, filename="Changed.pdf")
+    requests_mock.get(
+        f"{url}files/{pk}",
+        [
+            {"json": dummy_file_attributes, "headers": {"ETag": '"v1"'}},
+            {"status_code": 304},
+            {"json": changed, "headers": {"ETag": '"v2"'}},
+        ],
+    )
+    first = sdk.files.get(pk)
+    assert sdk.files.get(pk) is first
+    assert sdk.files.get(pk).filename == "Changed.pdf"
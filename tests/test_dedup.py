@@ -0,0 +1,66 @@
+import hashlib
+from io import BytesIO
+
+import pytest
+
+from parble.dedup import Upload, UploadIndex, content_hash
+from parble.settings import Settings
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = UploadIndex(tmp_path / "uploads.db")
+    yield index
+    index.close()
+
+
+def test_content_hash():
+    data = b"x" * 3000
+    fp = BytesIO(data)
+    fp.seek(10)
+    assert content_hash(fp, chunk_size=1024) == hashlib.sha256(data[10:]).hexdigest()
+    assert fp.tell() == 10
+
+
+def test_content_hash_read_only():
+    class ReadOnly:
+        def __init__(self):
+            self._data = BytesIO(b"x" * 100)
+
+        def read(self, size=-1):
+            return self._data.read(size)
+
+    assert content_hash(ReadOnly(), chunk_size=16) == hashlib.sha256(b"x" * 100).hexdigest()
+
+
+def test_from_settings(url, api_key, tmp_path):
+    assert UploadIndex.from_settings(Settings(url=url, api_key=api_key)) is None
+    index = UploadIndex.from_settings(Settings(url=url, api_key=api_key, upload_index=tmp_path / "uploads.db"))
+    assert index.path == tmp_path / "uploads.db"
+    index.close()
+
+
+def test_key(url):
+    assert UploadIndex.key(url) != UploadIndex.key(url, "636baf52b9753d4ce1e210d0")
+    assert UploadIndex.key(url) == UploadIndex.key(url, None)
+
+
+def test_lookup_record(index):
+    assert index.lookup("tenant", "abc") is None
+    index.record("tenant", "abc", "file1", False)
+    assert index.lookup("tenant", "abc") == Upload(file_id="file1", done=False)
+    assert index.lookup("other", "abc") is None
+
+    index.record("tenant", "abc", "file1", True)
+    assert index.lookup("tenant", "abc").done
+    assert len(index) == 1
+
+
+def test_forget(index):
+    index.record("tenant", "abc", "file1", True)
+    index.record("other", "abc", "file1", True)
+    index.record("tenant", "def", "file2", True)
+    index.forget("file1")
+    assert index.lookup("tenant", "abc") is None
+    assert index.lookup("other", "abc") is None
+    assert index.lookup("tenant", "def") is not None
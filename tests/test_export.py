@@ -0,0 +1,70 @@
+import pytest
+
+from parble import export
+from parble.models import File
+
+
+@pytest.fixture
+def files(sdk, dummy_file_attributes):
+    doc = dummy_file_attributes["documents"][0]
+    doc["header_fields"] = {
+        "total": dict(page=0, coordinates=[10, 20, 110, 40], text="12.00", value="12", confidence=80, automated=True),
+        "date": dict(page=1, coordinates=[], text="1/1", value="2022-01-01", confidence=60, automated=False),
+    }
+    first = File(sdk=sdk, **dummy_file_attributes)
+    second = File(sdk=sdk, **dict(dummy_file_attributes, id="second", documents=[doc, doc]))
+    return [first, second]
+
+
+def test_to_columns_fields(files):
+    columns = export.to_columns(iter(files))
+
+    assert list(columns) == [name for name, _ in export.FIELD_COLUMNS]
+    assert columns["file_id"] == [files[0].id] * 2 + ["second"] * 4
+    assert columns["document_index"] == [0, 0, 0, 0, 1, 1]
+    assert columns["name"][:2] == ["total", "date"]
+    assert columns["x1"][:2] == [110, -1]
+
+
+def test_to_columns_documents(files):
+    columns = export.to_columns(files, level="documents")
+
+    assert columns["document_type"] == ["invoice"] * 3
+    assert columns["field_count"] == [2, 2, 2]
+    assert columns["confidence"] == [94.0] * 3
+
+
+def test_unknown_level(files):
+    with pytest.raises(ValueError):
+        export.to_columns(files, level="pages")
+
+
+def test_to_records(files):
+    np = pytest.importorskip("numpy")
+
+    records = export.to_records(files)
+
+    assert len(records) == 6
+    assert records.dtype["confidence"] == np.int32
+    assert records.confidence[records.name == "total"].mean() == 80
+    assert records.automated.sum() == 3
+    assert records[0].y1 == 40
+
+
+def test_to_records_empty():
+    pytest.importorskip("numpy")
+
+    assert len(export.to_records([], level="documents")) == 0
+
+
+def test_to_table(files, tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    table = export.to_table(files)
+    assert table.num_rows == 6
+    assert table.schema.field("page").type == pa.int32()
+
+    path = tmp_path / "fields.parquet"
+    export.to_parquet(files, path, level="documents")
+    assert pq.read_table(path).num_rows == 3
@@ -0,0 +1,159 @@
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from parble import ParbleSDK
+from parble.exceptions import APICallError, NotFoundError
+from parble.futures import FilePoller, ProcessingFuture
+from parble.models import File
+
+
+@pytest.fixture
+def pending_attributes(dummy_file_attributes):
+    return dict(dummy_file_attributes, timings=dict(upload="2022-11-19 09:42:51", done=None))
+
+
+@pytest.fixture
+def fast_sdk(url, api_key):
+    sdk = ParbleSDK(url, api_key, poll_interval=0.01, poll_max_interval=0.02)
+    yield sdk
+    sdk.close()
+
+
+def make_poller(sdk, responses):
+    sdk.files.get = Mock(side_effect=responses)
+    return FilePoller(sdk, interval=0.01, max_interval=0.02, max_errors=3)
+
+
+def test_poller_resolves_done_file(sdk, pending_attributes, dummy_file_attributes):
+    pending = File(sdk=sdk, **pending_attributes)
+    done = File(sdk=sdk, **dummy_file_attributes)
+    poller = make_poller(sdk, [pending, pending, done])
+    fut1, fut2 = ProcessingFuture(), ProcessingFuture()
+
+    poller.watch(done.id, fut1)
+    poller.watch(done.id, fut2)
+
+    assert fut1.result(timeout=5) is done
+    assert fut2.result(timeout=5) is done
+    assert sdk.files.get.call_count == 3
+    assert poller.pending == 0
+    poller.close()
+
+
+def test_poller_transient_errors(sdk, dummy_file_attributes):
+    done = File(sdk=sdk, **dummy_file_attributes)
+    poller = make_poller(sdk, [APICallError("502"), APICallError("502"), done])
+    fut = ProcessingFuture()
+
+    poller.watch(done.id, fut)
+
+    assert fut.result(timeout=5) is done
+    poller.close()
+
+
+@pytest.mark.parametrize(
+    "errors, expected",
+    (
+        ([NotFoundError("404")], NotFoundError),
+        ([APICallError("502")] * 3, APICallError),
+    ),
+)
+def test_poller_fails(sdk, errors, expected):
+    poller = make_poller(sdk, errors)
+    fut = ProcessingFuture()
+
+    poller.watch("636baf52b9753d4ce1e210d0", fut)
+
+    with pytest.raises(expected):
+        fut.result(timeout=5)
+    assert sdk.files.get.call_count == len(errors)
+    poller.close()
+
+
+def test_poller_close_cancels(sdk, pending_attributes):
+    pending = File(sdk=sdk, **pending_attributes)
+    sdk.files.get = Mock(return_value=pending)
+    poller = FilePoller(sdk, interval=0.01)
+    fut = ProcessingFuture()
+    poller.watch(pending.id, fut)
+
+    poller.close()
+
+    assert fut.cancelled()
+    with pytest.raises(RuntimeError):
+        poller.watch(pending.id, ProcessingFuture())
+
+
+def test_submit_polls_until_done(
+    fast_sdk, requests_mock, url, tmp_path, text, pending_attributes, dummy_file_attributes
+):
+    pk = dummy_file_attributes["id"]
+    path = tmp_path / "test_upload.txt"
+    path.write_text(text)
+    post = requests_mock.post(f"{url}files", status_code=303, headers={"Location": f"{url}files/{pk}"})
+    get = requests_mock.get(f"{url}files/{pk}", [{"json": pending_attributes}, {"json": dummy_file_attributes}])
+
+    fut = fast_sdk.files.submit(path)
+    file = fut.result(timeout=5)
+
+    assert fut.file_id == pk
+    assert file.id == pk
+    assert file.is_done
+    assert post.call_count == 1
+    assert get.call_count == 2
+
+
+def test_submit_done_synchronously(fast_sdk, requests_mock, url, tmp_path, text, dummy_file_attributes):
+    path = tmp_path / "test_upload.txt"
+    path.write_text(text)
+    requests_mock.post(f"{url}files", json=dummy_file_attributes)
+
+    file = fast_sdk.files.submit(path).result(timeout=5)
+
+    assert file.id == dummy_file_attributes["id"]
+    assert requests_mock.call_count == 1
+
+
+def test_submit_upload_error(fast_sdk, requests_mock, url, tmp_path, text):
+    path = tmp_path / "test_upload.txt"
+    path.write_text(text)
+    requests_mock.post(f"{url}files", status_code=401)
+
+    with pytest.raises(APICallError):
+        fast_sdk.files.submit(path).result(timeout=5)
+
+
+def test_close_cancels_submitted(url, api_key, requests_mock, tmp_path, text, pending_attributes):
+    sdk = ParbleSDK(url, api_key, submit_workers=1, poll_interval=0.01)
+    path = tmp_path / "test_upload.txt"
+    path.write_text(text)
+    started, release = threading.Event(), threading.Event()
+
+    def upload(request, context):
+        started.set()
+        release.wait(5)
+        return pending_attributes
+
+    post = requests_mock.post(f"{url}files", json=upload)
+    threads = set(threading.enumerate())
+    futures = [sdk.files.submit(path) for _ in range(3)]
+    assert started.wait(5)
+
+    closing = threading.Thread(target=sdk.close)
+    closing.start()
+    deadline = time.monotonic() + 5
+    while not all(fut.cancelled() for fut in futures):
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+    release.set()
+    closing.join(5)
+
+    # the running upload completed, the queued ones were skipped and nothing is left polling
+    assert not closing.is_alive()
+    assert post.call_count == 1
+    assert not any(thread.name == "parble-poller" for thread in set(threading.enumerate()) - threads)
+    with pytest.raises(RuntimeError):
+        sdk.files.submit(path)
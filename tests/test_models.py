@@ -1,6 +1,9 @@
-from unittest.mock import patch
+from unittest.mock import ANY, patch
+
+import pytest
 
 from parble.models import File
+from parble.pdfcache import pdf_cache
 
 
 def test_file_create_not_done(sdk, dummy_file_attributes):
@@ -15,11 +18,27 @@ def test_file_create(sdk, dummy_file_attributes):
     assert file.id == dummy_file_attributes["id"]
 
 
+def _write_pdf(data):
+    def get_pdf(file_id, dest=None, chunk_size=None):
+        dest.write(data)
+        return dest
+
+    return get_pdf
+
+
 def test_file_pdf(dummy_file):
+    b = b"%PDF-1.3\n3 0 %%EOF\n"
     with patch("parble.sdk.ParbleSDK.Files.get_pdf") as m:
-        pdf = dummy_file.pdf
-        m.assert_called_once_with(dummy_file.id)
-        assert pdf == m.return_value
+        m.side_effect = _write_pdf(b)
+        assert dummy_file.pdf.read() == b
+        m.assert_called_once_with(dummy_file.id, dest=ANY)
+        # cached, and a new file-like on each access
+        assert dummy_file.pdf.read() == b
+        assert m.call_count == 1
+
+        del dummy_file.pdf
+        assert dummy_file.pdf.read() == b
+        assert m.call_count == 2
 
 
 def test_file_name(dummy_file):
@@ -55,3 +74,147 @@ def test_json_from_file(dummy_file, dummy_file_attributes):
 
     a = json.dumps(dummy_file_attributes)
     assert a == dummy_file.to_json()
+
+
+def test_file_save_pdf_streams(dummy_file, tmp_path):
+    dest = tmp_path / "out.pdf"
+    with patch("parble.sdk.ParbleSDK.Files.get_pdf") as m:
+        dummy_file.save_pdf(dest)
+        m.assert_called_once_with(dummy_file.id, dest=dest, chunk_size=ANY)
+    assert dummy_file._pdf_key not in pdf_cache()
+
+
+def test_file_save_pdf_cached(dummy_file, tmp_path):
+    b = b"%PDF-1.3\n3 0 %%EOF\n"
+    dest = tmp_path / "out.pdf"
+    with patch("parble.sdk.ParbleSDK.Files.get_pdf") as m:
+        m.side_effect = _write_pdf(b)
+        dummy_file.pdf.read()
+        dummy_file.save_pdf(dest)
+        m.assert_called_once_with(dummy_file.id, dest=ANY)
+    assert dest.read_bytes() == b
+
+
+def test_file_is_done(sdk, dummy_file_attributes):
+    assert File(sdk=sdk, **dummy_file_attributes).is_done
+    dummy_file_attributes["timings"]["done"] = None
+    assert not File(sdk=sdk, **dummy_file_attributes).is_done
+
+
+def _field(i):
+    return dict(
+        page=0, coordinates=[i, i, i + 10, i + 10], text=f"text {i}", value=f"{i}", confidence=90, automated=True
+    )
+
+
+def test_construct_trusted(sdk, dummy_file_attributes):
+    dummy_file_attributes["documents"][0]["header_fields"] = {f"field_{i}": _field(i) for i in range(3)}
+    dummy_file_attributes["unknown"] = "ignored"
+
+    file = File.construct_trusted(dummy_file_attributes, sdk=sdk)
+
+    assert file == File(sdk=sdk, **dummy_file_attributes)
+    assert file.timings.processing_time == 8
+    assert file.documents[0].header_fields["field_1"].coordinates == [1, 1, 11, 11]
+    assert file._sdk is sdk
+
+
+def test_construct_trusted_skips_validation(sdk, dummy_file_attributes):
+    dummy_file_attributes["documents"][0]["classification"]["confidence"] = 150
+
+    file = File.construct_trusted(dummy_file_attributes, sdk=sdk)
+
+    assert file.documents[0].classification.confidence == 150
+
+
+def test_construct_trusted_datetimes(sdk, dummy_file_attributes):
+    dummy_file_attributes["timings"] = dict(upload="2022-11-19T09:42:51Z", done=None)
+
+    file = File.construct_trusted(dummy_file_attributes, sdk=sdk)
+
+    assert file.timings == File(sdk=sdk, **dummy_file_attributes).timings
+    assert not file.is_done
+
+
+def test_construct_lazy(sdk, dummy_file_attributes):
+    dummy_file_attributes["documents"] *= 3
+
+    file = File.construct_lazy(dummy_file_attributes, sdk=sdk)
+
+    assert len(file.documents) == 3
+    assert file.documents.materialized == 0
+    assert file[1].type == "invoice"
+    assert file.documents.materialized == 1
+    assert file[1] is file[-2]
+    assert file == File(sdk=sdk, **dummy_file_attributes)
+    assert list(file) == file.documents
+    assert file.documents.materialized == 3
+
+
+def test_construct_lazy_trusted_fields(sdk, dummy_file_attributes):
+    dummy_file_attributes["documents"][0]["header_fields"] = {f"field_{i}": _field(i) for i in range(3)}
+
+    file = File.construct_lazy(dummy_file_attributes, sdk=sdk, validate=False)
+    fields = file[0].header_fields
+
+    assert len(fields) == 3
+    assert fields["field_2"].coordinates == [2, 2, 12, 12]
+    assert fields["field_2"] is fields["field_2"]
+    assert fields == File(sdk=sdk, **dummy_file_attributes)[0].header_fields
+    assert file.to_json() == File(sdk=sdk, **dummy_file_attributes).to_json()
+
+
+@pytest.mark.parametrize("validate", (True, False))
+def test_construct_lazy_export(sdk, dummy_file_attributes, validate):
+    dummy_file_attributes["documents"][0]["header_fields"] = {f"field_{i}": _field(i) for i in range(3)}
+    eager = File(sdk=sdk, **dummy_file_attributes)
+
+    file = File.construct_lazy(dummy_file_attributes, sdk=sdk, validate=validate)
+    assert file.dict() == eager.dict()
+    assert isinstance(file.dict()["documents"], list)
+    assert isinstance(file.dict()["documents"][0]["header_fields"], dict)
+    assert file.json() == eager.json()
+    assert file.dict(include={"documents": {0: {"classification"}}}) == eager.dict(
+        include={"documents": {0: {"classification"}}}
+    )
+
+
+@pytest.fixture
+def bundle(sdk, dummy_file_attributes):
+    invoice = dummy_file_attributes["documents"][0]
+    invoice["header_fields"] = {"total_amount": _field(1)}
+    receipt = dict(invoice, classification=dict(invoice["classification"], document_type="receipt", start_page=1))
+    receipt["header_fields"] = {"total_amount": _field(2), "vat": _field(3)}
+    receipt["classification"]["end_page"] = 3
+    single = dict(invoice, classification=dict(invoice["classification"], start_page=3, end_page=3))
+    return dict(dummy_file_attributes, number_of_pages=4, documents=[invoice, receipt, single])
+
+
+@pytest.mark.parametrize("lazy", (False, True))
+def test_indexes(sdk, bundle, lazy):
+    file = File.construct_lazy(bundle, sdk=sdk, validate=False) if lazy else File(sdk=sdk, **bundle)
+
+    assert file.documents_of_type("invoice") == [file[0], file[2]]
+    assert file.documents_of_type("receipt") == [file[1]]
+    assert file.documents_of_type("other") == []
+
+    assert [f.coordinates[0] for f in file.fields_named("total_amount")] == [1, 2, 1]
+    assert file.fields_named("vat") == [file[1].header_fields["vat"]]
+    assert file.fields_named("missing") == []
+
+    assert file.documents_on_page(0) == [file[0]]
+    assert file.documents_on_page(2) == [file[1]]
+    assert file.documents_on_page(3) == [file[2]]
+    assert file.documents_on_page(4) == []
+
+
+def test_indexes_cached(sdk, bundle):
+    file = File(sdk=sdk, **bundle)
+    file.documents_of_type("invoice")
+    index = file._indexes["types"]
+
+    file.documents_of_type("receipt")
+    assert file._indexes["types"] is index
+
+    file.documents = file.documents[:1]
+    assert file.documents_of_type("receipt") == []
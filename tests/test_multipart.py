@@ -0,0 +1,98 @@
+import asyncio
+import io
+from email.parser import BytesParser
+
+import pytest
+
+from parble.multipart import MultipartEncoder
+
+
+class NonSeekable(io.RawIOBase):
+    def __init__(self, data: bytes):
+        self._buf = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return self._buf.read(size)
+
+    def tell(self):
+        raise OSError("not seekable")
+
+
+def parse(encoder, body):
+    msg = BytesParser().parsebytes(b"Content-Type: " + encoder.content_type.encode() + b"\r\n\r\n" + body)
+    return {p.get_param("name", header="Content-Disposition"): p for p in msg.get_payload()}
+
+
+@pytest.fixture
+def data(text):
+    return text.encode() * 100
+
+
+@pytest.mark.parametrize("chunk_size", (1, 7, 4096, 1 << 20))
+def test_encode(data, chunk_size):
+    enc = MultipartEncoder({"inbox_id": "636baf52b9753d4ce1e210d0"}, "file", "foo.txt", io.BytesIO(data), "text/plain")
+    enc.chunk_size = chunk_size
+    body = b"".join(enc)
+
+    assert len(body) == enc.len
+    parts = parse(enc, body)
+    assert parts["inbox_id"].get_payload() == "636baf52b9753d4ce1e210d0"
+    assert parts["file"].get_filename() == "foo.txt"
+    assert parts["file"].get_content_type() == "text/plain"
+    assert parts["file"].get_payload(decode=True) == data
+
+
+def test_read_sizes(data):
+    enc = MultipartEncoder({}, "file", "foo.txt", io.BytesIO(data))
+    chunks = []
+    while True:
+        chunk = enc.read(100)
+        if not chunk:
+            break
+        assert len(chunk) <= 100
+        chunks.append(chunk)
+
+    assert enc.tell() == enc.len
+    assert parse(enc, b"".join(chunks))["file"].get_payload(decode=True) == data
+
+
+def test_file_read_from_current_position(data):
+    buf = io.BytesIO(data)
+    buf.seek(10)
+    enc = MultipartEncoder({}, "file", "foo.txt", buf)
+
+    body = enc.read()
+    assert len(body) == enc.len
+    assert parse(enc, body)["file"].get_payload(decode=True) == data[10:]
+
+    enc.seek(0)
+    assert enc.read() == body
+
+
+def test_seek_only_to_start(data):
+    enc = MultipartEncoder({}, "file", "foo.txt", io.BytesIO(data))
+    with pytest.raises(io.UnsupportedOperation):
+        enc.seek(10)
+
+
+def test_non_seekable(data):
+    enc = MultipartEncoder({}, "file", "foo.txt", NonSeekable(data))
+
+    assert enc.len is None
+    assert parse(enc, b"".join(enc))["file"].get_payload(decode=True) == data
+    with pytest.raises(io.UnsupportedOperation):
+        enc.seek(0)
+
+
+def test_async_body_replayable(data):
+    enc = MultipartEncoder({}, "file", "foo.txt", io.BytesIO(data))
+
+    async def collect():
+        return b"".join([chunk async for chunk in enc.aiter()])
+
+    first = asyncio.run(collect())
+    assert first == asyncio.run(collect())
+    assert len(first) == enc.len
@@ -0,0 +1,142 @@
+import io
+import threading
+
+import pytest
+
+from parble.pdfcache import MappedFile, PDFCache, configure_pdf_cache, pdf_cache
+
+
+def _download(data, chunk_size=100):
+    def download(dest):
+        for i in range(0, len(data), chunk_size):
+            dest.write(data[i : i + chunk_size])
+
+    return download
+
+
+def _content(i, size):
+    return bytes([i % 256]) * size
+
+
+def test_fetch_in_memory():
+    cache = PDFCache(max_memory=1000, spill_size=500)
+    calls = []
+
+    def download(dest):
+        calls.append(1)
+        dest.write(b"%PDF")
+
+    first = cache.fetch("a", download)
+    second = cache.fetch("a", download)
+    assert isinstance(first, io.BytesIO)
+    assert first.read() == second.read() == b"%PDF"
+    assert len(calls) == 1
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries, stats.memory, stats.disk) == (1, 1, 1, 4, 0)
+
+
+def test_large_content_spilled():
+    cache = PDFCache(max_memory=1000, spill_size=500)
+    data = _content(1, 2000)
+
+    pdf = cache.fetch("a", _download(data))
+    assert isinstance(pdf, MappedFile)
+    assert pdf.read() == data
+    assert cache.stats().memory == 0
+    assert cache.stats().disk == 2000
+
+    again = cache.open("a")
+    assert again.read(10) == data[:10]
+    again.seek(-5, io.SEEK_END)
+    assert again.read() == data[-5:]
+    again.close()
+    with pytest.raises(ValueError):
+        again.read()
+
+
+def test_memory_lru_spills_to_disk():
+    cache = PDFCache(max_memory=1000, spill_size=500)
+    for i in range(4):
+        cache.fetch(i, _download(_content(i, 400)))
+    stats = cache.stats()
+    assert stats.memory <= 1000
+    assert stats.disk == 1600 - stats.memory
+    assert stats.entries == 4
+
+    # the least recently used contents were spilled, and are still served
+    assert isinstance(cache.open(0), MappedFile)
+    assert cache.open(0).read() == _content(0, 400)
+    assert isinstance(cache.open(3), io.BytesIO)
+
+
+def test_disk_lru_evicts():
+    cache = PDFCache(max_memory=100, max_disk=1000, spill_size=100)
+    readers = [cache.fetch(i, _download(_content(i, 400))) for i in range(3)]
+    assert 0 not in cache
+    assert 1 in cache and 2 in cache
+    assert cache.stats().disk == 800
+
+    # evicted contents stay readable by the file-likes already handed out
+    assert readers[0].read() == _content(0, 400)
+
+
+def test_content_larger_than_budgets():
+    cache = PDFCache(max_memory=100, max_disk=100, spill_size=100)
+    assert cache.fetch("a", _download(_content(1, 400))).read() == _content(1, 400)
+    assert "a" not in cache
+    assert cache.stats().disk == 0
+
+
+def test_download_error_not_cached():
+    cache = PDFCache(max_memory=1000, spill_size=10)
+
+    def download(dest):
+        dest.write(b"x" * 100)
+        raise IOError("connection lost")
+
+    with pytest.raises(IOError):
+        cache.fetch("a", download)
+    assert "a" not in cache
+    assert cache.stats().disk == 0
+
+
+def test_discard_clear():
+    cache = PDFCache(max_memory=1000, spill_size=500)
+    cache.fetch("a", _download(b"small"))
+    cache.fetch("b", _download(_content(1, 600)))
+    cache.discard("a")
+    assert "a" not in cache
+    cache.clear()
+    stats = cache.stats()
+    assert (stats.entries, stats.memory, stats.disk) == (0, 0, 0)
+
+
+def test_concurrent_readers():
+    cache = PDFCache(max_memory=1000, spill_size=500)
+    data = _content(7, 5000)
+    cache.fetch("a", _download(data))
+    results = []
+
+    def read():
+        with cache.open("a") as f:
+            results.append(f.read())
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [data] * 8
+
+
+def test_configure_pdf_cache():
+    previous = pdf_cache()
+    previous.fetch("a", _download(b"%PDF"))
+    try:
+        cache = configure_pdf_cache(max_memory=10)
+        assert pdf_cache() is cache
+        assert cache.max_memory == 10
+        assert "a" not in previous
+    finally:
+        configure_pdf_cache()
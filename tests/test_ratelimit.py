@@ -0,0 +1,113 @@
+import multiprocessing
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from parble import Settings
+from parble.exceptions import ConfigurationError
+from parble.ratelimit import FileTokenBucket, TokenBucket, rate_limiter_from_settings
+from parble.session import BaseSession
+
+
+def test_bucket_burst_then_rate():
+    bucket = TokenBucket(rate=10, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    delays = [bucket.reserve() for _ in range(3)]
+    assert delays == sorted(delays)
+    assert delays[0] == pytest.approx(0.1, abs=0.01)
+    assert delays[2] == pytest.approx(0.3, abs=0.01)
+
+
+def test_bucket_refills():
+    bucket = TokenBucket(rate=100, burst=1)
+    bucket.reserve()
+    time.sleep(0.02)
+    assert bucket.reserve() == 0
+
+
+def test_bucket_invalid_rate():
+    with pytest.raises(ConfigurationError):
+        TokenBucket(rate=0)
+
+
+def test_bucket_threads():
+    bucket = TokenBucket(rate=200, burst=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(11)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    # 1 token available right away, then 10 more at 200/s
+    assert time.monotonic() - start >= 0.045
+
+
+def test_file_bucket_shared(tmp_path):
+    path = tmp_path / "bucket"
+    a = FileTokenBucket(path, rate=10, burst=2)
+    b = FileTokenBucket(path, rate=10, burst=2)
+
+    assert a.reserve() == 0
+    assert b.reserve() == 0
+    assert a.reserve() == pytest.approx(0.1, abs=0.01)
+    assert b.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def _reserve(path, queue):
+    queue.put(FileTokenBucket(path, rate=10, burst=1).reserve())
+
+
+def test_file_bucket_processes(tmp_path):
+    path = tmp_path / "bucket"
+    queue = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=_reserve, args=(path, queue)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+    delays = sorted(queue.get() for _ in procs)
+    assert delays[0] == 0
+    assert delays[2] > 0.1
+
+
+def test_rate_limiter_from_settings(url, api_key, tmp_path):
+    assert rate_limiter_from_settings(Settings(url=url, api_key=api_key)) is None
+    bucket = rate_limiter_from_settings(Settings(url=url, api_key=api_key, rate_limit=5))
+    assert type(bucket) is TokenBucket
+    assert bucket.burst == 5
+    bucket = rate_limiter_from_settings(
+        Settings(url=url, api_key=api_key, rate_limit=5, rate_limit_burst=2, rate_limit_file=tmp_path / "b")
+    )
+    assert isinstance(bucket, FileTokenBucket)
+    assert bucket.burst == 2
+
+
+def test_session_rate_limited(url, api_key, requests_mock):
+    sess = BaseSession(Settings(url=url, api_key=api_key, rate_limit=10))
+    requests_mock.get(f"{url}files/foobar", json={})
+
+    with patch.object(sess.rate_limiter, "acquire") as m:
+        sess.get("files/foobar")
+        sess.get("files/foobar")
+
+    assert m.call_count == 2
+
+
+def test_upload_slots(url, api_key):
+    sess = BaseSession(Settings(url=url, api_key=api_key, max_concurrent_uploads=1))
+    entered = threading.Event()
+
+    def upload():
+        with sess.upload_slot():
+            entered.set()
+
+    with sess.upload_slot():
+        th = threading.Thread(target=upload)
+        th.start()
+        assert not entered.wait(0.05)
+    th.join()
+    assert entered.is_set()
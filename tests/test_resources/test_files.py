@@ -1,9 +1,12 @@
 from io import BytesIO
+from unittest.mock import Mock
 
 import pytest
 import requests
+from urllib3.exceptions import ProtocolError
 
-from parble import exceptions
+from parble import ParbleAPIClient, exceptions
+from parble.multipart import MultipartEncoder
 from parble.resources.files import FilesResource
 
 
@@ -81,3 +84,159 @@ def test_post_see_other(files_resource, requests_mock, url, text):
 
     rv = files_resource.post(buf, "lorem.txt", content_type="text/plain")
     assert rv == dict(id=pk)
+
+
+def test_post_streams_body(files_resource, requests_mock, url, text):
+    pk = "636baf52b9753d4ce1e210d0"
+    buf = BytesIO(text.encode())
+    m = requests_mock.post(f"{url}files", json=dict(id=pk))
+
+    files_resource.post(buf, "lorem.txt", inbox_id=pk, content_type="text/plain")
+
+    req = m.last_request
+    assert isinstance(req.body, MultipartEncoder)
+    assert req.headers["Content-Type"] == req.body.content_type
+    assert int(req.headers["Content-Length"]) == req.body.len
+    req.body.seek(0)
+    body = req.body.read()
+    assert text.encode() in body
+    assert b'filename="lorem.txt"' in body
+    assert pk.encode() in body
+
+
+def test_post_retry_resends_body(api_key, url, requests_mock, text):
+    client = ParbleAPIClient(url, api_key, max_retries=1)
+    client._client.retry_policy.sleep = Mock()
+    bodies = []
+
+    def record(request, context):
+        bodies.append(request.body.read())
+        context.status_code = 429 if len(bodies) == 1 else 200
+        return {}
+
+    requests_mock.post(f"{url}files", json=record)
+    client.files.post(BytesIO(text.encode()), "lorem.txt", content_type="text/plain")
+
+    assert len(bodies) == 2
+    assert bodies[0] == bodies[1]
+    assert text.encode() in bodies[0]
+
+
+class FlakyBody(BytesIO):
+    """
+    Response body failing after the first `fail_after` bytes
+    """
+
+    def __init__(self, data, fail_after):
+        super().__init__(data)
+        self.fail_after = fail_after
+
+    def read(self, size=-1, **kwargs):
+        if self.tell() >= self.fail_after:
+            raise ProtocolError("Connection broken")
+        return super().read(min(size, self.fail_after - self.tell()) if size and size > 0 else self.fail_after)
+
+
+@pytest.fixture
+def pdf():
+    return b"%PDF-1.3\n" + b"0" * 1000 + b"\n%%EOF\n"
+
+
+def test_download(files_resource, requests_mock, url, pdf):
+    pk = "636baf52b9753d4ce1e210d0"
+    m = requests_mock.get(f"{url}files/{pk}", content=pdf, headers={"Content-Type": "application/pdf"})
+    dest = BytesIO()
+
+    assert files_resource.download(pk, dest, chunk_size=100) == len(pdf)
+    assert dest.getvalue() == pdf
+    assert m.last_request.headers["Accept"] == "application/pdf"
+    assert "Range" not in m.last_request.headers
+
+
+def test_download_resume(files_resource, requests_mock, url, pdf):
+    pk = "636baf52b9753d4ce1e210d0"
+    m = requests_mock.get(
+        f"{url}files/{pk}",
+        [
+            {"body": FlakyBody(pdf, 300), "headers": {"Content-Type": "application/pdf"}},
+            {"content": pdf[300:], "status_code": 206, "headers": {"Content-Type": "application/pdf"}},
+        ],
+    )
+    dest = BytesIO()
+
+    assert files_resource.download(pk, dest, chunk_size=100) == len(pdf)
+    assert dest.getvalue() == pdf
+    assert m.call_count == 2
+    assert m.last_request.headers["Range"] == "bytes=300-"
+
+
+def test_download_resume_range_ignored(files_resource, requests_mock, url, pdf):
+    pk = "636baf52b9753d4ce1e210d0"
+    requests_mock.get(
+        f"{url}files/{pk}",
+        [
+            {"body": FlakyBody(pdf, 250), "headers": {"Content-Type": "application/pdf"}},
+            {"content": pdf, "status_code": 200, "headers": {"Content-Type": "application/pdf"}},
+        ],
+    )
+    dest = BytesIO()
+
+    files_resource.download(pk, dest, chunk_size=100)
+    assert dest.getvalue() == pdf
+
+
+def test_download_resume_complete(files_resource, requests_mock, url, pdf):
+    pk = "636baf52b9753d4ce1e210d0"
+    m = requests_mock.get(f"{url}files/{pk}", status_code=416)
+    dest = BytesIO()
+
+    assert files_resource.download(pk, dest, offset=len(pdf)) == 0
+    assert dest.getvalue() == b""
+    assert m.last_request.headers["Range"] == f"bytes={len(pdf)}-"
+
+    # without a range, the error is raised
+    with pytest.raises(exceptions.APICallError):
+        files_resource.download(pk, dest)
+
+
+def test_download_gives_up(files_resource, requests_mock, url, pdf):
+    pk = "636baf52b9753d4ce1e210d0"
+    m = requests_mock.get(f"{url}files/{pk}", body=lambda request, context: FlakyBody(pdf, 0))
+
+    with pytest.raises(exceptions.APICallError):
+        files_resource.download(pk, BytesIO(), max_resumes=2)
+    assert m.call_count == 3
+
+
+def test_post_see_other_no_redirect(files_resource, requests_mock, url, text):
+    pk = "636baf52b9753d4ce1e217d8"
+    requests_mock.post(f"{url}files", status_code=303, headers={"Location": f"{url}files/{pk}"})
+
+    rv = files_resource.post(BytesIO(text.encode()), "lorem.txt", allow_redirects=False)
+    assert rv == dict(id=pk)
+    assert requests_mock.call_count == 1
+
+
+def test_iter_documents(files_resource, requests_mock, url, dummy_file_attributes):
+    import json
+
+    pk = dummy_file_attributes["id"]
+    dummy_file_attributes["documents"] *= 3
+    requests_mock.get(f"{url}files/{pk}", content=json.dumps(dummy_file_attributes).encode())
+    attributes = {}
+
+    docs = list(files_resource.iter_documents(pk, attributes=attributes, chunk_size=10))
+
+    assert docs == dummy_file_attributes.pop("documents")
+    assert attributes == dummy_file_attributes
+
+
+def test_iter_documents_interrupted(files_resource, requests_mock, url, dummy_file_attributes):
+    import json
+
+    pk = dummy_file_attributes["id"]
+    body = json.dumps(dummy_file_attributes).encode()
+    requests_mock.get(f"{url}files/{pk}", body=FlakyBody(body, 100))
+
+    with pytest.raises(exceptions.APICallError):
+        list(files_resource.iter_documents(pk, chunk_size=10))
@@ -0,0 +1,173 @@
+from datetime import datetime, timezone
+from io import BytesIO, RawIOBase
+from unittest.mock import Mock
+
+import pytest
+from requests import Response, exceptions
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from parble import ParbleAPIClient, Settings
+from parble.exceptions import APICallError, CallTimeoutError
+from parble.retry import RetryPolicy, is_connect_error, parse_retry_after
+from parble.session import BaseSession
+
+
+@pytest.fixture
+def session(url, api_key):
+    sess = BaseSession(Settings(url=url, api_key=api_key, max_retries=3))
+    sess.retry_policy.sleep = Mock()
+    return sess
+
+
+def _response(status, headers=None):
+    resp = Response()
+    resp.status_code = status
+    resp.headers.update(headers or {})
+    return resp
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    (
+        (None, None),
+        ("", None),
+        ("120", 120.0),
+        ("foo", None),
+        ("Sat, 19 Nov 2022 09:43:01 GMT", 10.0),
+        ("Sat, 19 Nov 2022 09:42:41 GMT", 0.0),
+    ),
+)
+def test_parse_retry_after(value, expected):
+    now = datetime(2022, 11, 19, 9, 42, 51, tzinfo=timezone.utc)
+    assert parse_retry_after(value, now=now) == expected
+
+
+def test_is_connect_error():
+    new_conn = NewConnectionError(None, "refused")
+    assert is_connect_error(exceptions.ConnectTimeout())
+    assert is_connect_error(exceptions.ConnectionError(MaxRetryError(None, "/", new_conn)))
+    assert not is_connect_error(exceptions.ConnectionError("Connection aborted"))
+    assert not is_connect_error(exceptions.ReadTimeout())
+
+
+@pytest.mark.parametrize("attempt", (1, 2, 3, 10))
+def test_backoff_full_jitter(attempt):
+    policy = RetryPolicy(backoff_factor=0.5, backoff_max=2)
+    for _ in range(50):
+        assert 0 <= policy.backoff(attempt) <= min(2, 0.5 * 2 ** (attempt - 1))
+
+
+def test_retry_state_limits():
+    state = RetryPolicy(max_retries=2).start()
+    assert state.next_delay("GET", response=_response(502)) is not None
+    assert state.next_delay("GET", response=_response(502)) is not None
+    assert state.next_delay("GET", response=_response(502)) is None
+
+
+def test_retry_state_retry_after():
+    state = RetryPolicy(max_retries=1).start()
+    assert state.next_delay("GET", response=_response(503, {"Retry-After": "7"})) == 7
+
+
+@pytest.mark.parametrize("value", ("86400", "Fri, 31 Dec 9999 23:59:59 GMT"))
+def test_retry_state_retry_after_capped(value):
+    state = RetryPolicy(max_retries=1, backoff_max=30).start()
+    assert state.next_delay("GET", response=_response(503, {"Retry-After": value})) == 30
+
+
+def test_retry_state_budget():
+    state = RetryPolicy(max_retries=5, budget=1).start()
+    assert state.next_delay("GET", response=_response(503, {"Retry-After": "7"})) is None
+
+
+@pytest.mark.parametrize("method", ("POST", "PATCH"))
+def test_retry_state_not_idempotent(method):
+    policy = RetryPolicy(max_retries=3)
+    assert policy.start().next_delay(method, response=_response(502)) is None
+    assert policy.start().next_delay(method, error=exceptions.ReadTimeout()) is None
+    assert policy.start().next_delay(method, response=_response(429)) is not None
+    assert policy.start().next_delay(method, error=exceptions.ConnectTimeout()) is not None
+
+
+def test_retries_disabled_by_default(settings):
+    assert BaseSession(settings).retry_policy.max_retries == 0
+
+
+@pytest.mark.parametrize("method", ("GET", "DELETE"))
+def test_request_retries_transient_status(session, requests_mock, method):
+    m = requests_mock.register_uri(
+        method, "https://api.parble.com/v1/files/foobar", [{"status_code": 502}, {"status_code": 200, "json": {}}]
+    )
+    resp = session.request(method, "files/foobar")
+
+    assert resp.status_code == 200
+    assert m.call_count == 2
+    session.retry_policy.sleep.assert_called_once()
+
+
+def test_request_retries_exhausted(session, requests_mock):
+    m = requests_mock.get("https://api.parble.com/v1/files/foobar", status_code=503)
+    with pytest.raises(APICallError):
+        session.request("GET", "files/foobar")
+
+    assert m.call_count == 4
+
+
+def test_request_retries_timeout(session, requests_mock):
+    m = requests_mock.get("https://api.parble.com/v1/files/foobar", exc=exceptions.ReadTimeout)
+    with pytest.raises(CallTimeoutError):
+        session.request("GET", "files/foobar")
+
+    assert m.call_count == 4
+
+
+def test_post_not_retried_after_send(session, requests_mock):
+    m = requests_mock.post("https://api.parble.com/v1/files", status_code=502)
+    with pytest.raises(APICallError):
+        session.request("POST", "files", files={"file": ("foo.txt", b"foo")})
+
+    assert m.call_count == 1
+
+
+def test_post_retried_on_too_many_requests(session, requests_mock):
+    # the upload was rejected before being processed, sending it again can't process the file twice
+    m = requests_mock.post("https://api.parble.com/v1/files", [{"status_code": 429}, {"status_code": 200, "json": {}}])
+    resp = session.request("POST", "files", files={"file": ("foo.txt", b"foo")})
+
+    assert resp.status_code == 200
+    assert m.call_count == 2
+    assert m.request_history[0].body == m.request_history[1].body
+
+
+def test_post_retried_on_connect_error(session, requests_mock):
+    m = requests_mock.post(
+        "https://api.parble.com/v1/files", [{"exc": exceptions.ConnectTimeout}, {"status_code": 200, "json": {}}]
+    )
+    resp = session.request("POST", "files", files={"file": ("foo.txt", b"foo")})
+
+    assert resp.status_code == 200
+    assert m.call_count == 2
+    assert m.request_history[0].body == m.request_history[1].body
+
+
+class _NonSeekable(RawIOBase):
+    def __init__(self, data):
+        self._data = BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self._data.readinto(buffer)
+
+
+def test_non_seekable_upload_not_retried(url, api_key, requests_mock):
+    client = ParbleAPIClient(url, api_key, max_retries=1)
+    client._client.retry_policy.sleep = Mock()
+    m = requests_mock.post(f"{url}files", [{"status_code": 429}, {"status_code": 200, "json": {}}])
+
+    # the one-shot body was consumed by the first attempt, it can't be sent again
+    with pytest.raises(APICallError):
+        client.files.post(_NonSeekable(b"foo"), "foo.txt")
+    assert m.call_count == 1
+    client._client.retry_policy.sleep.assert_not_called()
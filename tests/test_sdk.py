@@ -2,6 +2,7 @@ from io import BytesIO
 from unittest.mock import ANY, patch
 
 from parble import ParbleSDK
+from parble.exceptions import APICallError
 from parble.models import File
 
 
@@ -95,3 +96,301 @@ def test_create_file(sdk, dummy_file_attributes):
 
     assert f.id == dummy_file_attributes["id"]
     assert f._sdk == sdk
+
+
+def test_delete_file(sdk):
+    pk = "636baf52b9753d4ce1e210d0"
+    with patch("parble.resources.files.FilesResource.delete") as m:
+        m.return_value = None
+        assert sdk.files.delete(pk) is None
+        m.assert_called_once_with(pk)
+
+
+def _fake_post(dummy_file_attributes, delays=None):
+    import time
+
+    def post(self, path, inbox_id=None, validate=None):
+        time.sleep((delays or {}).get(path, 0))
+        if "fail" in str(path):
+            raise APICallError(path)
+        return self.create(**dict(dummy_file_attributes, filename=str(path)))
+
+    return post
+
+
+def test_post_many(sdk, dummy_file_attributes):
+    paths = ["a.pdf", "fail.pdf", "c.pdf"]
+    with patch("parble.sdk.ParbleSDK.Files.post", autospec=True) as m:
+        m.side_effect = _fake_post(dummy_file_attributes)
+        results = dict(sdk.files.post_many(paths, max_workers=2))
+
+    assert set(results) == set(paths)
+    assert results["a.pdf"].filename == "a.pdf"
+    assert results["c.pdf"].filename == "c.pdf"
+    assert isinstance(results["fail.pdf"], APICallError)
+    assert m.call_count == 3
+
+
+def test_post_many_ordered(sdk, dummy_file_attributes):
+    paths = ["a.pdf", "b.pdf", "c.pdf", "d.pdf"]
+    with patch("parble.sdk.ParbleSDK.Files.post", autospec=True) as m:
+        m.side_effect = _fake_post(dummy_file_attributes, delays={"a.pdf": 0.05})
+        results = list(sdk.files.post_many(paths, max_workers=4, ordered=True))
+
+    assert [p for p, _ in results] == paths
+    assert [f.filename for _, f in results] == paths
+
+
+def test_post_many_unordered_yields_completed_first(sdk, dummy_file_attributes):
+    with patch("parble.sdk.ParbleSDK.Files.post", autospec=True) as m:
+        m.side_effect = _fake_post(dummy_file_attributes, delays={"slow.pdf": 0.1})
+        results = list(sdk.files.post_many(["slow.pdf", "fast.pdf"], max_workers=2))
+
+    assert [p for p, _ in results] == ["fast.pdf", "slow.pdf"]
+
+
+def test_post_many_close_drains(sdk, dummy_file_attributes):
+    paths = [f"{i}.pdf" for i in range(20)]
+    with patch("parble.sdk.ParbleSDK.Files.post", autospec=True) as m:
+        m.side_effect = _fake_post(dummy_file_attributes)
+        gen = sdk.files.post_many(paths, max_workers=2)
+        next(gen)
+        gen.close()
+
+    # only the bounded window of uploads was ever started
+    assert m.call_count <= 3
+
+
+def _fake_download(data):
+    def download(pk, dest, chunk_size=None, offset=0):
+        dest.write(data[offset:])
+        return len(data) - offset
+
+    return download
+
+
+def test_get_file_pdf_to_path(sdk, tmp_path):
+    pk = "636baf52b9753d4ce1e210d0"
+    b = b"%PDF-1.3\n3 0 %%EOF\n"
+    dest = tmp_path / "out.pdf"
+    with patch("parble.resources.files.FilesResource.download") as m:
+        m.side_effect = _fake_download(b)
+        rv = sdk.files.get_pdf(pk, dest=str(dest), chunk_size=42)
+        m.assert_called_once_with(pk, ANY, chunk_size=42, offset=0)
+
+    assert rv == dest
+    assert dest.read_bytes() == b
+
+
+def test_get_file_pdf_resume(sdk, tmp_path):
+    pk = "636baf52b9753d4ce1e210d0"
+    b = b"%PDF-1.3\n3 0 %%EOF\n"
+    dest = tmp_path / "out.pdf"
+    dest.write_bytes(b[:5])
+    with patch("parble.resources.files.FilesResource.download") as m:
+        m.side_effect = _fake_download(b)
+        sdk.files.get_pdf(pk, dest=dest, resume=True)
+        m.assert_called_once_with(pk, ANY, chunk_size=ANY, offset=5)
+
+    assert dest.read_bytes() == b
+
+
+def test_get_file_pdf_resume_complete(sdk, tmp_path, requests_mock, url):
+    pk = "636baf52b9753d4ce1e210d0"
+    b = b"%PDF-1.3\n3 0 %%EOF\n"
+    dest = tmp_path / "out.pdf"
+    dest.write_bytes(b)
+    requests_mock.get(f"{url}files/{pk}", status_code=416)
+
+    assert sdk.files.get_pdf(pk, dest=dest, resume=True) == dest
+    assert dest.read_bytes() == b
+
+
+def test_get_file_pdf_to_file_like(sdk):
+    pk = "636baf52b9753d4ce1e210d0"
+    b = b"%PDF-1.3\n3 0 %%EOF\n"
+    buf = BytesIO()
+    with patch("parble.resources.files.FilesResource.download") as m:
+        m.side_effect = _fake_download(b)
+        assert sdk.files.get_pdf(pk, dest=buf) is buf
+
+    assert buf.getvalue() == b
+
+
+def test_get_trusted(url, api_key, dummy_file_attributes):
+    sdk = ParbleSDK(url, api_key, validate=False)
+    dummy_file_attributes["documents"][0]["classification"]["confidence"] = 150
+    with patch("parble.resources.files.FilesResource.get") as m:
+        m.return_value = dummy_file_attributes
+        file = sdk.files.get(dummy_file_attributes["id"])
+
+    assert file.documents[0].classification.confidence == 150
+    assert file._sdk is sdk
+
+
+def test_get_validate_per_call(url, api_key, dummy_file_attributes):
+    sdk = ParbleSDK(url, api_key, validate=False)
+    with patch("parble.resources.files.FilesResource.get") as m, patch.object(File, "construct_trusted") as trusted:
+        m.return_value = dummy_file_attributes
+        file = sdk.files.get(dummy_file_attributes["id"], validate=True)
+
+    trusted.assert_not_called()
+    assert file.id == dummy_file_attributes["id"]
+
+
+def test_validation_sampling(url, api_key):
+    sdk = ParbleSDK(url, api_key, validate=False, validation_sample_rate=1)
+    assert sdk.files.validates()
+    assert not sdk.files.validates(False)
+
+    sdk = ParbleSDK(url, api_key, validate=False)
+    assert not sdk.files.validates()
+    assert ParbleSDK(url, api_key).files.validates()
+
+
+def test_get_lazy(url, api_key, dummy_file_attributes):
+    sdk = ParbleSDK(url, api_key, lazy_documents=True)
+    with patch("parble.resources.files.FilesResource.get") as m:
+        m.return_value = dummy_file_attributes
+        file = sdk.files.get(dummy_file_attributes["id"])
+        eager = sdk.files.get(dummy_file_attributes["id"], lazy=False)
+
+    assert file.documents.materialized == 0
+    assert file == eager
+    assert isinstance(eager.documents, list)
+
+
+def test_iter_documents(sdk, requests_mock, url, dummy_file_attributes):
+    import json
+
+    pk = dummy_file_attributes["id"]
+    requests_mock.get(f"{url}files/{pk}", content=json.dumps(dummy_file_attributes).encode())
+    attributes = {}
+
+    docs = list(sdk.files.iter_documents(pk, attributes=attributes))
+
+    assert docs == File(sdk=sdk, **dummy_file_attributes).documents
+    assert attributes["filename"] == "Example.pdf"
+    assert list(sdk.files.iter_documents(pk, validate=False)) == docs
+
+
+def test_get_result_cache(url, api_key, tmp_path, dummy_file_attributes):
+    sdk = ParbleSDK(url, api_key, result_cache=tmp_path / "results.db")
+    file_id = dummy_file_attributes["id"]
+
+    with patch("parble.resources.files.FilesResource.get") as m:
+        m.return_value = dummy_file_attributes
+        first = sdk.files.get(file_id)
+        second = sdk.files.get(file_id)
+        m.assert_called_once_with(file_id)
+    assert second == first
+    assert second._sdk is sdk
+    stats = sdk.files.cache_stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+    with patch("parble.resources.files.FilesResource.delete"):
+        sdk.files.delete(file_id)
+    assert sdk.files.cache_stats().entries == 0
+    sdk.close()
+
+
+def test_get_result_cache_not_done(url, api_key, tmp_path, dummy_file_attributes):
+    sdk = ParbleSDK(url, api_key, result_cache=tmp_path / "results.db")
+    dummy_file_attributes["timings"]["done"] = None
+
+    with patch("parble.resources.files.FilesResource.get") as m:
+        m.return_value = dummy_file_attributes
+        sdk.files.get(dummy_file_attributes["id"])
+        sdk.files.get(dummy_file_attributes["id"])
+        assert m.call_count == 2
+    assert sdk.files.cache_stats().entries == 0
+    assert ParbleSDK(url, api_key).files.cache_stats() is None
+    sdk.close()
+
+
+def test_post_dedup(url, api_key, requests_mock, tmp_path, text, dummy_file_attributes):
+    pk = dummy_file_attributes["id"]
+    sdk = ParbleSDK(url, api_key, upload_index=tmp_path / "uploads.db")
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_text(text)
+    post = requests_mock.post(f"{url}files", json=dummy_file_attributes)
+    get = requests_mock.get(f"{url}files/{pk}", json=dummy_file_attributes)
+
+    first = sdk.files.post(tmp_path / "a.txt")
+    second = sdk.files.post(tmp_path / "b.txt")
+    assert second.id == first.id
+    assert post.call_count == 1
+    assert get.call_count == 1
+
+    # same content to another inbox, or other content, is uploaded
+    sdk.files.post(tmp_path / "a.txt", inbox_id="636baf52b9753d4ce1e210d0")
+    sdk.files.post_file(BytesIO(b"other"), "c.txt")
+    assert post.call_count == 3
+    sdk.close()
+
+
+class _ReadOnly:
+    """
+    Minimal file-like only providing read
+    """
+
+    def __init__(self, data):
+        self._data = BytesIO(data)
+
+    def read(self, size=-1):
+        return self._data.read(size)
+
+
+def test_post_dedup_read_only(url, api_key, requests_mock, tmp_path, text, dummy_file_attributes):
+    sdk = ParbleSDK(url, api_key, upload_index=tmp_path / "uploads.db")
+    post = requests_mock.post(f"{url}files", json=dummy_file_attributes)
+
+    # the content can't be read twice: it skips the index
+    assert sdk.files.post_file(_ReadOnly(text.encode()), "a.txt").id == dummy_file_attributes["id"]
+    assert text.encode() in b"".join(post.last_request.body)
+    assert len(sdk.files.uploads) == 0
+    sdk.close()
+
+
+def test_post_dedup_deleted_file(url, api_key, requests_mock, tmp_path, text, dummy_file_attributes):
+    pk = dummy_file_attributes["id"]
+    sdk = ParbleSDK(url, api_key, upload_index=tmp_path / "uploads.db")
+    post = requests_mock.post(f"{url}files", json=dummy_file_attributes)
+    requests_mock.get(f"{url}files/{pk}", status_code=404)
+
+    sdk.files.post_file(BytesIO(text.encode()), "a.txt")
+    sdk.files.post_file(BytesIO(text.encode()), "a.txt")
+    assert post.call_count == 2
+
+    requests_mock.delete(f"{url}files/{pk}", status_code=204)
+    sdk.files.delete(pk)
+    assert len(sdk.files.uploads) == 0
+    sdk.close()
+
+
+def test_post_dedup_with_result_cache(url, api_key, requests_mock, tmp_path, text, dummy_file_attributes):
+    sdk = ParbleSDK(url, api_key, upload_index=tmp_path / "uploads.db", result_cache=tmp_path / "results.db")
+    post = requests_mock.post(f"{url}files", json=dummy_file_attributes)
+
+    first = sdk.files.post_file(BytesIO(text.encode()), "a.txt")
+    second = sdk.files.post_file(BytesIO(text.encode()), "a.txt")
+    assert second == first
+    assert post.call_count == 1
+    assert requests_mock.call_count == 1
+    sdk.close()
+
+
+def test_submit_dedup(url, api_key, requests_mock, tmp_path, text, dummy_file_attributes):
+    pk = dummy_file_attributes["id"]
+    sdk = ParbleSDK(url, api_key, upload_index=tmp_path / "uploads.db")
+    path = tmp_path / "a.txt"
+    path.write_text(text)
+    post = requests_mock.post(f"{url}files", json=dummy_file_attributes)
+    requests_mock.get(f"{url}files/{pk}", json=dummy_file_attributes)
+
+    assert sdk.files.submit(path).result(timeout=5).id == pk
+    future = sdk.files.submit(path)
+    assert future.result(timeout=5).id == pk
+    assert future.file_id == pk
+    assert post.call_count == 1
+    sdk.close()
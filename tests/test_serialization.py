@@ -0,0 +1,64 @@
+from io import BytesIO
+
+import pytest
+
+from parble import serialization
+from parble.models import File
+
+
+@pytest.fixture(params=("orjson", "json"))
+def backend(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:  # no cov
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+def test_round_trip(backend, sdk, dummy_file):
+    data = dummy_file.to_json_bytes()
+
+    assert isinstance(data, bytes)
+    assert b'"upload":"2022-11-19T09:42:51"' in data
+    assert b"sdk" not in data
+
+    file = File.from_json_bytes(data, sdk=sdk)
+    assert file == dummy_file
+    assert file._sdk is sdk
+    assert file.timings.processing_time == 8
+
+
+def test_backends_agree(monkeypatch, dummy_file):
+    data = serialization.file_to_json(dummy_file)
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert serialization.file_to_json(dummy_file) == data
+
+
+def test_validate(backend, sdk, dummy_file):
+    data = dummy_file.to_json_bytes().replace(b'"confidence":94.0', b'"confidence":"high"')
+
+    assert File.from_json_bytes(data).documents[0].classification.confidence == "high"
+    with pytest.raises(ValueError):
+        File.from_json_bytes(data, validate=True)
+
+
+def test_lazy_file(backend, sdk, dummy_file_attributes, dummy_file):
+    file = File.construct_lazy(dummy_file_attributes, sdk=sdk, validate=False)
+
+    assert File.from_json_bytes(file.to_json_bytes()) == dummy_file
+
+
+def test_json_lines(backend, sdk, dummy_file):
+    buf = BytesIO()
+    assert serialization.dump_json_lines([dummy_file, dummy_file], buf) == 2
+    buf.seek(0)
+
+    files = list(serialization.load_json_lines(buf, sdk=sdk))
+
+    assert files == [dummy_file, dummy_file]
+    assert all(file._sdk is sdk for file in files)
+
+
+def test_not_serializable(backend):
+    with pytest.raises(TypeError):
+        serialization.dumps({"a": object()})
@@ -0,0 +1,242 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from parble import ParbleAPIClient, ParbleSDK, Settings
+from parble.aio import AsyncParbleSDK
+from parble.exceptions import NotFoundError
+from parble.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def _in_threads(target, n):
+    results = [None] * n
+
+    def run(i):
+        try:
+            results[i] = target()
+        except Exception as exc:
+            results[i] = exc
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_from_settings(url, api_key, settings):
+    assert SingleFlight.from_settings(settings) is None
+    assert AsyncSingleFlight.from_settings(settings) is None
+    assert isinstance(
+        SingleFlight.from_settings(Settings(url=url, api_key=api_key, coalesce_requests=True)), SingleFlight
+    )
+    assert ParbleAPIClient(url, api_key).flight_stats() is None
+
+
+def test_concurrent_calls_coalesced():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def call():
+        calls.append(1)
+        release.wait(5)
+        return object()
+
+    threads, results = _in_threads(lambda: flights.do("key", call), 8)
+    _wait_for(lambda: flights.stats().coalesced == 7)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    stats = flights.stats()
+    assert (stats.calls, stats.coalesced, stats.in_flight) == (1, 7, 0)
+
+
+def test_error_propagated():
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def call():
+        release.wait(5)
+        raise NotFoundError("gone")
+
+    threads, results = _in_threads(lambda: flights.do("key", call), 4)
+    _wait_for(lambda: flights.stats().coalesced == 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert all(isinstance(result, NotFoundError) for result in results)
+
+    # the failure isn't kept, the next call is made again
+    assert flights.do("key", lambda: "ok") == "ok"
+
+
+def test_sequential_and_distinct_calls_not_coalesced():
+    flights = SingleFlight()
+    assert flights.do("a", lambda: 1) == 1
+    assert flights.do("a", lambda: 2) == 2
+    assert flights.do("b", lambda: 3) == 3
+    assert flights.stats().calls == 3
+    assert flights.stats().coalesced == 0
+
+
+def test_async_calls_coalesced():
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    async def go():
+        return await asyncio.gather(*(flights.do("key", call) for _ in range(5)))
+
+    results = asyncio.run(go())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    stats = flights.stats()
+    assert (stats.calls, stats.coalesced, stats.in_flight) == (1, 4, 0)
+
+
+def test_async_error_propagated():
+    flights = AsyncSingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.01)
+        raise NotFoundError("gone")
+
+    async def go():
+        return await asyncio.gather(*(flights.do("key", call) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(go())
+    assert all(isinstance(result, NotFoundError) for result in results)
+
+
+def test_async_cancelled_waiter():
+    flights = AsyncSingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    async def go():
+        first = asyncio.ensure_future(flights.do("key", call))
+        second = asyncio.ensure_future(flights.do("key", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    # the call shared with the other waiters goes on
+    assert asyncio.run(go()) == "ok"
+
+
+def test_sdk_get_coalesced(url, api_key, requests_mock, dummy_file_attributes):
+    sdk = ParbleSDK(url, api_key, coalesce_requests=True)
+    pk = dummy_file_attributes["id"]
+    release = threading.Event()
+
+    def respond(request, context):
+        release.wait(5)
+        return dummy_file_attributes
+
+    m = requests_mock.get(f"{url}files/{pk}", json=respond)
+    threads, files = _in_threads(lambda: sdk.files.get(pk), 6)
+    _wait_for(lambda: sdk.client.flight_stats().coalesced == 5)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert m.call_count == 1
+    assert files[0].id == pk
+    assert all(file is files[0] for file in files)
+    stats = sdk.client.flight_stats()
+    assert (stats.calls, stats.coalesced, stats.in_flight) == (1, 5, 0)
+
+
+def test_sdk_get_pdf_coalesced(url, api_key, requests_mock):
+    sdk = ParbleSDK(url, api_key, coalesce_requests=True)
+    release = threading.Event()
+
+    def respond(request, context):
+        release.wait(5)
+        return b"%PDF"
+
+    m = requests_mock.get(f"{url}files/foobar", content=respond, headers={"Content-Type": "application/pdf"})
+    threads, pdfs = _in_threads(lambda: sdk.files.get_pdf("foobar"), 4)
+    _wait_for(lambda: sdk.client.flight_stats().coalesced == 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert m.call_count == 1
+    # each caller reads its own file-like
+    assert len({id(pdf) for pdf in pdfs}) == 4
+    assert [pdf.read() for pdf in pdfs] == [b"%PDF"] * 4
+    stats = sdk.client.flight_stats()
+    assert (stats.calls, stats.coalesced, stats.in_flight) == (1, 3, 0)
+
+
+def test_sdk_get_error_propagated(url, api_key, requests_mock):
+    sdk = ParbleSDK(url, api_key, coalesce_requests=True)
+    release = threading.Event()
+
+    def respond(request, context):
+        release.wait(5)
+        context.status_code = 404
+        return {}
+
+    m = requests_mock.get(f"{url}files/foobar", json=respond)
+    threads, results = _in_threads(lambda: sdk.files.get("foobar"), 3)
+    _wait_for(lambda: sdk.client.flight_stats().coalesced == 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert m.call_count == 1
+    assert all(isinstance(result, NotFoundError) for result in results)
+    stats = sdk.client.flight_stats()
+    assert (stats.calls, stats.coalesced, stats.in_flight) == (1, 2, 0)
+
+
+def test_async_sdk_get_coalesced(url, api_key, dummy_file_attributes):
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=dummy_file_attributes)
+
+    async def go():
+        async with AsyncParbleSDK(url, api_key, transport=httpx.MockTransport(handler), coalesce_requests=True) as sdk:
+            pk = dummy_file_attributes["id"]
+            files = await asyncio.gather(*(sdk.files.get(pk) for _ in range(5)))
+            others = await asyncio.gather(sdk.files.get(pk, validate=False), sdk.files.get(pk, validate=False))
+            return files, others, sdk.client.flight_stats()
+
+    files, others, stats = asyncio.run(go())
+    assert all(file is files[0] for file in files)
+    assert others[0] is others[1] and others[0] is not files[0]
+    assert len(requests) == 2
+    assert (stats.calls, stats.coalesced, stats.in_flight) == (2, 5, 0)
+
+
+@pytest.mark.parametrize("coalesce", [False, True])
+def test_sequential_gets_not_shared(url, api_key, requests_mock, dummy_file_attributes, coalesce):
+    sdk = ParbleSDK(url, api_key, coalesce_requests=coalesce)
+    pk = dummy_file_attributes["id"]
+    m = requests_mock.get(f"{url}files/{pk}", json=dummy_file_attributes)
+    assert sdk.files.get(pk) is not sdk.files.get(pk)
+    assert m.call_count == 2
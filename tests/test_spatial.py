@@ -0,0 +1,129 @@
+import random
+
+import pytest
+
+from parble.models import Document, File
+from parble.spatial import SpatialIndex, _box, _distance
+
+
+def _field(x0, y0, x1, y1, page=0):
+    return dict(page=page, coordinates=[x0, y0, x1, y1], text="", value="", confidence=90, automated=True)
+
+
+@pytest.fixture
+def document():
+    return Document(
+        automated=True,
+        classification=dict(automated=True, document_type="invoice", confidence=90, start_page=0, end_page=2),
+        header_fields={
+            "title": _field(100, 50, 500, 80),
+            "date": _field(400, 70, 500, 120),
+            "total_label": _field(300, 700, 380, 720),
+            "total_amount": _field(390, 700, 480, 720),
+            "signature": _field(100, 800, 300, 900, page=1),
+            "unplaced": dict(_field(0, 0, 0, 0), coordinates=[]),
+        },
+        tables={},
+    )
+
+
+def _names(refs):
+    return [ref.name for ref in refs]
+
+
+def test_pages(document):
+    index = SpatialIndex.from_document(document)
+    assert index.pages == [0, 1]
+    assert sorted(_names(index.fields_on_page(0))) == ["date", "title", "total_amount", "total_label"]
+    assert index.fields_on_page(5) == []
+
+
+def test_intersecting(document):
+    index = SpatialIndex.from_document(document)
+    assert sorted(_names(index.intersecting(0, (350, 0, 600, 110)))) == ["date", "title"]
+    assert _names(index.intersecting(1, (0, 0, 1000, 1000))) == ["signature"]
+    assert index.intersecting(0, (0, 300, 50, 400)) == []
+    assert index.intersecting(3, (0, 0, 1000, 1000)) == []
+
+
+def test_within(document):
+    index = SpatialIndex.from_document(document)
+    assert sorted(_names(index.within(0, (290, 690, 490, 730)))) == ["total_amount", "total_label"]
+    assert _names(index.within(0, (350, 690, 490, 730))) == ["total_amount"]
+
+
+def test_containing(document):
+    index = SpatialIndex.from_document(document)
+    assert _names(index.containing(0, 450, 110)) == ["date"]
+    assert index.containing(0, 10, 10) == []
+
+
+def test_overlapping(document):
+    index = SpatialIndex.from_document(document)
+    assert _names(index.overlapping(document.header_fields["title"])) == ["date"]
+    assert index.overlapping(document.header_fields["signature"]) == []
+
+
+def test_nearest(document):
+    index = SpatialIndex.from_document(document)
+    nearest = index.nearest(0, 385, 710, k=2)
+    assert sorted(_names(nearest)) == ["total_amount", "total_label"]
+    assert nearest[0].document is document
+    assert _names(index.nearest(0, 0, 0)) == ["title"]
+    assert len(index.nearest(0, 0, 0, k=10)) == 4
+    assert index.nearest(0, 0, 0, k=0) == []
+    assert index.nearest(3, 0, 0) == []
+
+
+def test_reversed_coordinates():
+    document = Document.construct_trusted(
+        dict(
+            automated=True,
+            classification=dict(automated=True, document_type="invoice", confidence=90, start_page=0, end_page=1),
+            header_fields={"total": _field(200, 200, 100, 100)},
+            tables={},
+        )
+    )
+    index = SpatialIndex.from_document(document)
+    assert _names(index.containing(0, 150, 150)) == ["total"]
+
+
+def test_queries_match_brute_force():
+    rng = random.Random(42)
+    fields = {}
+    for i in range(500):
+        x, y = rng.randint(0, 2000), rng.randint(0, 3000)
+        fields[f"field_{i}"] = _field(x, y, x + rng.randint(1, 300), y + rng.randint(1, 40), page=rng.randint(0, 1))
+    document = Document.construct_trusted(
+        dict(
+            automated=True,
+            classification=dict(automated=True, document_type="invoice", confidence=90, start_page=0, end_page=2),
+            header_fields=fields,
+            tables={},
+        )
+    )
+    index = SpatialIndex.from_document(document, cell_size=100)
+    every = {page: index.fields_on_page(page) for page in index.pages}
+    for _ in range(100):
+        page = rng.randint(0, 1)
+        x0, y0 = rng.randint(-100, 2200), rng.randint(-100, 3200)
+        box = (x0, y0, x0 + rng.randint(0, 800), y0 + rng.randint(0, 800))
+        expected = [ref for ref in every[page] if _box(ref.field)[0] <= box[2] and box[0] <= _box(ref.field)[2]]
+        expected = [ref for ref in expected if _box(ref.field)[1] <= box[3] and box[1] <= _box(ref.field)[3]]
+        assert sorted(_names(index.intersecting(page, box))) == sorted(_names(expected))
+
+        x, y, k = rng.uniform(-1000, 3000), rng.uniform(-1000, 4000), rng.randint(1, 8)
+        distances = sorted(_distance(ref.box, x, y) for ref in every[page])[:k]
+        assert [_distance(ref.box, x, y) for ref in index.nearest(page, x, y, k)] == distances
+
+
+def test_file_spatial_index(sdk, dummy_file_attributes):
+    dummy_file_attributes["documents"][0]["header_fields"] = {"total": _field(10, 10, 20, 20)}
+    file = File(sdk=sdk, **dummy_file_attributes)
+
+    index = file.spatial_index()
+    assert _names(index.containing(0, 15, 15)) == ["total"]
+    assert file.spatial_index() is index
+
+    file.documents = []
+    assert file.spatial_index().pages == []
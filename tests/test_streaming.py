@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from parble.streaming import JSONArrayStream, iter_array
+
+
+def chunked(data: bytes, size: int):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", (1, 3, 7, 1024))
+def test_iter_array(size):
+    payload = {
+        "id": "a",
+        "documents": [{"text": 'quoted "} ] \\ é 😀', "values": [1, 2.5, None, True]}, [], "x", 0, {}],
+        "nested": {"documents": [1]},
+        "count": -12,
+    }
+    attributes = {}
+
+    items = list(iter_array(chunked(json.dumps(payload, ensure_ascii=False).encode(), size), "documents", attributes))
+
+    assert items == payload.pop("documents")
+    assert attributes == payload
+
+
+def test_items_yielded_as_soon_as_complete():
+    stream = JSONArrayStream("documents")
+
+    assert stream.feed(b'{"documents": [{"a": 1}, {"b"') == [{"a": 1}]
+    assert stream.feed(b": 2}") == [{"b": 2}]
+    assert stream.feed(b'], "id": "x"}') == []
+    assert stream.done
+    assert stream.attributes == {"id": "x"}
+
+
+def test_parsed_text_released():
+    stream = JSONArrayStream("documents")
+    stream.feed(b'{"documents": [')
+    for i in range(100):
+        stream.feed(json.dumps({"value": "x" * 1000}).encode() + b",")
+
+    # only the last chunk is held
+    assert len(stream._buf) < 2000
+    assert not stream._parts
+    stream.feed(b"1]}")
+    stream.close()
+
+
+@pytest.mark.parametrize(
+    "payload",
+    (b'{"documents": [1, 2', b'[{"documents": []}]', b'{"documents" [1]}', b'{"documents": [1 2]}', b"{} {}"),
+)
+def test_malformed(payload):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_array([payload], "documents"))
@@ -0,0 +1,118 @@
+import math
+
+import pytest
+
+from parble.models import Document
+from parble.tables import Table
+
+
+def _cell(value, row, confidence=90):
+    return dict(
+        value=value,
+        text=value,
+        confidence=confidence,
+        page=0,
+        coordinates=[0, row * 10, 50, row * 10 + 8],
+        automated=True,
+    )
+
+
+@pytest.fixture
+def rows():
+    return [
+        {"description": _cell("Apples", 0), "amount": _cell("3.20", 0, 80)},
+        {"description": _cell("Pears", 1), "amount": _cell("1.10", 1)},
+        {"description": _cell("Plums", 2), "amount": _cell("4.00", 2), "vat": "20%"},
+    ]
+
+
+def test_lazy_parse(rows):
+    table = Table(rows)
+    assert len(table) == 3
+    assert not table.parsed
+    assert table.columns == ["description", "amount", "vat"]
+    assert table.parsed
+
+
+def test_columns(rows):
+    table = Table(rows)
+    amount = table["amount"]
+    assert list(amount) == ["3.20", "1.10", "4.00"]
+    assert list(amount.confidences) == [80, 90, 90]
+    assert list(amount.pages) == [0, 0, 0]
+    assert amount.box(1) == (0, 10, 50, 18)
+    assert amount.box(-1) == (0, 20, 50, 28)
+    assert "vat" in table
+    assert "total" not in table
+
+
+def test_missing_cells(rows):
+    vat = Table(rows)["vat"]
+    assert list(vat) == [None, None, "20%"]
+    assert vat.texts == [None, None, None]
+    assert math.isnan(vat.confidences[0])
+    assert list(vat.pages) == [-1, -1, -1]
+    assert vat.box(2) is None
+
+
+def test_rows(rows):
+    table = Table(rows)
+    assert table[0] == {"description": "Apples", "amount": "3.20", "vat": None}
+    assert [row["description"] for row in table] == ["Apples", "Pears", "Plums"]
+
+
+def test_slicing(rows):
+    table = Table(rows)
+    sliced = table[1:]
+    assert len(sliced) == 2
+    assert list(sliced["description"]) == ["Pears", "Plums"]
+    assert sliced["amount"].box(0) == (0, 10, 50, 18)
+    assert list(table[::2]["amount"]) == ["3.20", "4.00"]
+    assert table[::2]["amount"].box(1) == (0, 20, 50, 28)
+
+    selected = table.select(["amount", "description"])
+    assert selected.columns == ["amount", "description"]
+    assert len(selected) == 3
+    with pytest.raises(KeyError):
+        table.select(["total"])
+
+
+def test_not_a_table():
+    with pytest.raises(ValueError):
+        Table({"rows": []})
+
+
+def test_document_table(dummy_file_attributes, rows):
+    attrs = dict(dummy_file_attributes["documents"][0], tables={"line_items": rows})
+    for document in (Document(**attrs), Document.construct_trusted(attrs)):
+        table = document.table("line_items")
+        assert list(table["description"]) == ["Apples", "Pears", "Plums"]
+        assert document.table("line_items") is table
+        with pytest.raises(KeyError):
+            document.table("missing")
+
+        document.tables = {"line_items": rows[:1]}
+        assert len(document.table("line_items")) == 1
+
+
+def test_to_numpy(rows):
+    np = pytest.importorskip("numpy")
+    table = Table(rows)
+
+    records = table.to_records()
+    assert records.dtype.names == ("description", "amount", "vat")
+    assert list(records.amount) == ["3.20", "1.10", "4.00"]
+    assert list(table[:0].to_records()) == []
+
+    amount = table["amount"].to_numpy()
+    assert amount["confidence"].dtype == np.float64
+    assert amount["coordinates"].shape == (3, 4)
+    assert amount["coordinates"][2].tolist() == [0, 20, 50, 28]
+    assert amount["automated"].all()
+
+
+def test_to_table(rows):
+    pytest.importorskip("pyarrow")
+    arrow = Table(rows).to_table()
+    assert arrow.column_names == ["description", "amount", "vat"]
+    assert arrow.column("vat").to_pylist() == [None, None, "20%"]